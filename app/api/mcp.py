@@ -14,11 +14,10 @@ from fastapi import APIRouter
 from pydantic import BaseModel, Field, model_validator
 
 from app.services.rag_lexical import (
-    build_index,
     build_pattern_recommendations,
     build_snippet,
     extract_query_terms,
-    load_documents,
+    load_index,
     search,
 )
 from app.services.safe_sql import summarize_sql
@@ -1828,15 +1827,16 @@ def standardize_spec_with_evidence(
     if not docs_path.exists():
         evidence_errors.append(f"DOCS_DIR_NOT_FOUND: {request.options.docs_dir}")
     else:
-        chunks = load_documents(request.options.docs_dir)
-        if not chunks:
+        index = load_index(
+            request.options.docs_dir, case_insensitive=request.options.case_insensitive
+        )
+        if not index.chunks:
             evidence_errors.append(f"DOCS_EMPTY: {request.options.docs_dir}")
         else:
             logger.info(
                 "standardize_spec_with_evidence: indexed_chunks=%s",
-                len(chunks),
+                len(index.chunks),
             )
-            index = build_index(chunks, case_insensitive=request.options.case_insensitive)
             query = " ".join(query_terms)
             hits = search(index, query, request.options.top_k)
             for hit in hits:
@@ -1888,7 +1888,7 @@ def standardize_spec_with_evidence(
 # - 결정론: 리스트 결과는 정렬/캡 정책을 통해 안정적으로 반환되도록 한다.
 # - 보안: 원문 SQL은 로그에 요약 정보로만 기록한다.
 @router.post("/callers", response_model=CallersResponse)
-def callers(request: CallersRequest) -> CallersResponse:
+def callers(request: CallersRequest) -> dict[str, object]:
     target_type = _infer_target_type(request.target, request.target_type)
     service_objects = [
         ServiceSqlObject(name=obj.name, type=obj.type, sql=obj.sql) for obj in request.objects
@@ -1899,7 +1899,8 @@ def callers(request: CallersRequest) -> CallersResponse:
         include_self=request.options.include_self,
     )
     result = find_callers(request.target, target_type, service_objects, service_options)
-    return CallersResponse(**result)
+    # response_model 검증은 FastAPI가 한 번만 수행하므로 모델을 미리 생성하지 않는다.
+    return result
 
 
 # [함수 설명]
@@ -1910,7 +1911,7 @@ def callers(request: CallersRequest) -> CallersResponse:
 # - 결정론: 리스트 결과는 정렬/캡 정책을 통해 안정적으로 반환되도록 한다.
 # - 보안: 원문 SQL은 로그에 요약 정보로만 기록한다.
 @router.post("/external-deps", response_model=ExternalDepsResponse)
-def external_deps(request: ExternalDepsRequest) -> ExternalDepsResponse:
+def external_deps(request: ExternalDepsRequest) -> dict[str, object]:
     result = analyze_external_dependencies(
         request.sql,
         options={
@@ -1920,7 +1921,8 @@ def external_deps(request: ExternalDepsRequest) -> ExternalDepsResponse:
             "type": request.type,
         },
     )
-    return ExternalDepsResponse(**result)
+    # response_model 검증은 FastAPI가 한 번만 수행하므로 모델을 미리 생성하지 않는다.
+    return result
 
 
 # [함수 설명]
@@ -1984,7 +1986,7 @@ def common_rules_template(request: BusinessRulesRequest) -> BusinessRulesRespons
 # - 결정론: 리스트 결과는 정렬/캡 정책을 통해 안정적으로 반환되도록 한다.
 # - 보안: 원문 SQL은 로그에 요약 정보로만 기록한다.
 @router.post("/common/call-graph", response_model=CallGraphResponse)
-def common_call_graph(request: CallGraphRequest) -> CallGraphResponse:
+def common_call_graph(request: CallGraphRequest) -> dict[str, object]:
     service_objects = [
         ServiceCallGraphObject(name=obj.name, type=obj.type, sql=obj.sql) for obj in request.objects
     ]
@@ -1998,7 +2000,8 @@ def common_call_graph(request: CallGraphRequest) -> CallGraphResponse:
         max_edges=request.options.max_edges,
     )
     result = build_call_graph(service_objects, service_options)
-    return CallGraphResponse(**result)
+    # response_model 검증은 FastAPI가 한 번만 수행하므로 모델을 미리 생성하지 않는다.
+    return result
 
 
 # [함수 설명]
@@ -215,8 +215,19 @@ def _tool_registry() -> list[dict[str, Any]]:
     ]
 
 
+# [함수 설명]
+# - 목적: tools/list 응답에 노출되는 도구 정의 목록을 반환한다.
+# - 입력: 없음
+# - 출력: 도구 정의 딕셔너리 리스트(호출마다 새 리스트)
+# - 에러 처리: 예외 없이 정적 레지스트리를 반환한다.
+# - 결정론: 항상 같은 순서와 내용으로 반환한다.
+# - 보안: 도구 메타데이터만 노출한다.
+def list_tools() -> list[dict[str, Any]]:
+    return _tool_registry()
+
+
 def _handle_tools_list() -> dict[str, Any]:
-    return {"tools": _tool_registry()}
+    return {"tools": list_tools()}
 
 
 # [함수 설명]
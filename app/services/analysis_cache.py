@@ -0,0 +1,97 @@
+# [파일 설명]
+# - 목적: 순수 분석 함수 결과를 입력 단위로 재사용하는 LRU 캐시 데코레이터를 제공한다.
+# - 제공 기능: cached_analysis 데코레이터와 전체 캐시 비우기 함수를 포함한다.
+# - 입력/출력: 해시 가능한 인자만 받는 함수를 감싸 결과 dict의 깊은 복사본을 반환한다.
+# - 주의 사항: SCAN_CACHE_MAX_SQL_LEN을 넘는 SQL은 캐시하지 않으며,
+#   메모리 압박이 있는 환경에서는 TSQL_ANALYSIS_CACHE=0 으로 비활성화할 수 있다.
+# - 연관 모듈: app.services.tsql_analyzer 및 이를 조합하는 추천/평가 서비스에서 사용된다.
+from __future__ import annotations
+
+import contextvars
+import copy
+import functools
+import logging
+from collections.abc import Callable
+
+from app.services.safe_sql import SCAN_CACHE_MAX_SQL_LEN, analysis_cache_enabled, summarize_sql
+
+ANALYSIS_CACHE_MAXSIZE = 256
+
+# cached_analysis로 감싼 함수의 캐시 비우기 함수 목록이다(clear_analysis_caches에서 사용).
+_CACHE_CLEARERS: list[Callable[[], None]] = []
+
+# 캐시된 분석 함수 안에서 다시 캐시된 분석 함수를 호출하는 중첩 깊이다.
+# 바깥 호출만 깊은 복사본을 반환하고, 안쪽 호출은 캐시 객체를 그대로 넘겨 복사를 한 번으로 줄인다.
+_ANALYSIS_DEPTH: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "analysis_depth",
+    default=0,
+)
+
+
+# [함수 설명]
+# - 목적: 분석 함수 호출마다 SQL 요약(길이/해시) 로그를 남긴다.
+# - 입력: func: 분석 함수, sql: str, 나머지 인자는 무시한다.
+# - 출력: 없음
+# - 에러 처리: 예외 없이 로그만 기록한다.
+# - 결정론: 동일 입력에 대해 동일한 로그 내용을 남긴다.
+# - 보안: 원문 SQL 대신 길이와 해시 앞 8자리만 기록한다.
+def _log_sql_summary(func: Callable[..., object], sql: str, *_: object, **__: object) -> None:
+    summary = summarize_sql(sql)
+    logging.getLogger(func.__module__).info(
+        "%s: sql_len=%s sql_hash=%s",
+        func.__name__,
+        summary["len"],
+        summary["sha256_8"],
+    )
+
+
+# [함수 설명]
+# - 목적: 분석 함수 결과를 입력 단위로 캐시하는 데코레이터를 제공한다.
+# - 입력: func: Callable[..., dict[str, object]], log_call: 호출 로그 함수(기본은 SQL 요약 로그)
+# - 출력: 캐시를 거쳐 결과 사본을 반환하는 래퍼 함수를 반환한다.
+# - 에러 처리: 예외는 캐시하지 않고 그대로 전파한다.
+# - 결정론: 가장 바깥 호출에는 깊은 복사본을 반환해 호출자가 결과를 변경해도 캐시가 오염되지 않는다.
+#   안쪽(캐시된 분석 함수 내부) 호출은 캐시 객체를 공유하므로 읽기 전용으로만 사용해야 한다.
+# - 보안: 캐시 키는 프로세스 메모리에만 존재하며 로그에는 캐시 적중 여부와 무관하게 요약만 남긴다.
+#   SCAN_CACHE_MAX_SQL_LEN을 넘는 SQL은 캐시를 거치지 않아 큰 원문을 메모리에 보관하지 않는다.
+def cached_analysis(
+    func: Callable[..., dict[str, object]] | None = None,
+    *,
+    log_call: Callable[..., None] | None = None,
+) -> Callable[..., dict[str, object]]:
+    if func is None:
+        return functools.partial(cached_analysis, log_call=log_call)  # type: ignore[return-value]
+
+    cached = functools.lru_cache(maxsize=ANALYSIS_CACHE_MAXSIZE)(func)
+    log = log_call or functools.partial(_log_sql_summary, func)
+
+    @functools.wraps(func)
+    def wrapper(*args: object, **kwargs: object) -> dict[str, object]:
+        log(*args, **kwargs)
+        sql = args[0] if args else kwargs.get("sql", "")
+        if len(sql) > SCAN_CACHE_MAX_SQL_LEN or not analysis_cache_enabled():  # type: ignore[arg-type]
+            return func(*args, **kwargs)
+        depth = _ANALYSIS_DEPTH.get()
+        token = _ANALYSIS_DEPTH.set(depth + 1)
+        try:
+            result = cached(*args, **kwargs)
+        finally:
+            _ANALYSIS_DEPTH.reset(token)
+        return copy.deepcopy(result) if depth == 0 else result
+
+    wrapper.cache_clear = cached.cache_clear  # type: ignore[attr-defined]
+    wrapper.cache_info = cached.cache_info  # type: ignore[attr-defined]
+    _CACHE_CLEARERS.append(cached.cache_clear)
+    return wrapper
+
+
+# [함수 설명]
+# - 목적: cached_analysis로 감싼 모든 분석 함수의 캐시를 비운다.
+# - 입력: 없음
+# - 출력: 없음
+# - 에러 처리: 예외 없이 등록된 캐시를 모두 비운다.
+# - 결정론: 이후 호출은 모두 새로 계산된다.
+# - 보안: 캐시에 남아 있던 원문 SQL 키를 메모리에서 해제한다.
+def clear_analysis_caches() -> None:
+    for cache_clear in _CACHE_CLEARERS:
+        cache_clear()
@@ -6,6 +6,7 @@
 # - 연관 모듈: 표준화 명세 생성(app.services.tsql_standardization_spec)에서 사용된다.
 from __future__ import annotations
 
+import functools
 import math
 import re
 from collections import Counter
@@ -14,8 +15,13 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from app.services.safe_sql import analysis_cache_enabled
+
 TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
 SUPPORTED_EXTENSIONS = {".md", ".txt"}
+# 문서 디렉터리별 인덱스 캐시 크기. 키에 파일 mtime/크기가 포함되어 내용이 바뀌면 다시 만든다.
+# TSQL_ANALYSIS_CACHE=0 이면 분석 캐시와 함께 인덱스 캐시도 건너뛴다.
+INDEX_CACHE_MAXSIZE = 8
 
 
 # [클래스 설명]
@@ -72,9 +78,7 @@ def load_documents(docs_dir: str) -> list[DocChunk]:
     if not root.exists() or not root.is_dir():
         return []
 
-    files = sorted(
-        {path for path in root.rglob("*") if path.suffix.lower() in SUPPORTED_EXTENSIONS}
-    )
+    files = _list_document_files(root)
     chunks: list[DocChunk] = []
     for doc_index, path in enumerate(files, start=1):
         text = path.read_text(encoding="utf-8", errors="replace")
@@ -129,6 +133,43 @@ def build_index(chunks: list[DocChunk], *, case_insensitive: bool = True) -> Ind
     )
 
 
+# [함수 설명]
+# - 목적: 문서 디렉터리를 읽어 인덱스를 만들되, 파일 목록/mtime/크기가 같으면 캐시를 재사용한다.
+# - 입력: docs_dir: str, *, case_insensitive: bool = True
+# - 출력: Index를 반환한다. 디렉터리가 없으면 빈 Index를 반환한다.
+# - 에러 처리: 디렉터리가 없으면 파일 목록을 만들지 않고 빈 Index로 단락한다.
+# - 결정론: 파일 추가/삭제/수정 시 지문이 바뀌어 새 인덱스를 만든다.
+# - 보안: 로컬 파일 메타데이터만 키로 사용하며 내용은 로그에 남기지 않는다.
+def load_index(docs_dir: str, *, case_insensitive: bool = True) -> Index:
+    root = Path(docs_dir)
+    if not root.is_dir():
+        return build_index([], case_insensitive=case_insensitive)
+    if not analysis_cache_enabled():
+        return build_index(load_documents(docs_dir), case_insensitive=case_insensitive)
+    fingerprint = tuple(
+        (str(path), stat.st_mtime_ns, stat.st_size)
+        for path in _list_document_files(root)
+        for stat in (path.stat(),)
+    )
+    return _load_index_cached(docs_dir, case_insensitive, fingerprint)
+
+
+# [함수 설명]
+# - 목적: (docs_dir, case_insensitive, 파일 지문) 단위로 문서 로딩과 인덱스 구축 결과를 캐시한다.
+# - 입력: docs_dir: str, case_insensitive: bool, fingerprint: 파일 경로/mtime/크기 튜플
+# - 출력: Index를 반환한다.
+# - 에러 처리: 예외는 캐시하지 않고 그대로 전파한다.
+# - 결정론: 검색은 Index를 읽기만 하므로 캐시된 인스턴스를 공유해도 결과가 같다.
+# - 보안: 캐시는 프로세스 메모리에만 존재한다.
+@functools.lru_cache(maxsize=INDEX_CACHE_MAXSIZE)
+def _load_index_cached(
+    docs_dir: str,
+    case_insensitive: bool,
+    fingerprint: tuple[tuple[str, int, int], ...],
+) -> Index:
+    return build_index(load_documents(docs_dir), case_insensitive=case_insensitive)
+
+
 # [함수 설명]
 # - 목적: search 처리 로직을 수행한다.
 # - 입력: index: Index, query: str, top_k: int
@@ -334,6 +375,17 @@ def _best_doc_for_keywords(hits: list[Hit], keywords: Iterable[str]) -> str | No
     return best_doc_id
 
 
+# [함수 설명]
+# - 목적: 디렉터리 아래 지원 확장자 문서 파일을 정렬된 목록으로 반환한다.
+# - 입력: root: Path
+# - 출력: 경로 순으로 정렬된 파일 목록을 반환한다.
+# - 에러 처리: 존재 여부 확인은 호출자가 수행한다.
+# - 결정론: 경로 정렬로 doc_id 부여 순서를 고정한다.
+# - 보안: 파일 내용은 읽지 않는다.
+def _list_document_files(root: Path) -> list[Path]:
+    return sorted({path for path in root.rglob("*") if path.suffix.lower() in SUPPORTED_EXTENSIONS})
+
+
 # [함수 설명]
 # - 목적: _tokenize 처리 로직을 수행한다.
 # - 입력: text: str, *, case_insensitive: bool
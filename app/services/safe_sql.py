@@ -1,17 +1,44 @@
 # [파일 설명]
 # - 목적: SQL 요약 정보를 계산해 안전한 로그 출력에 활용한다.
-# - 제공 기능: 길이/해시 등의 요약 데이터를 생성한다.
+# - 제공 기능: 길이/해시 등의 요약 데이터와 주석/문자열 제거 스캔(크기 제한 캐시 포함)을 제공한다.
 # - 입력/출력: 원문 SQL을 입력으로 받아 요약 dict를 반환한다.
-# - 주의 사항: 원문 SQL 자체는 반환하거나 로그에 남기지 않는다.
+# - 주의 사항: 원문 SQL 자체는 로그에 남기지 않으며, 스캔 캐시는 길이 제한 이하 SQL만 메모리에 보관한다.
 # - 연관 모듈: 분석 서비스(app.services.*)에서 로그 요약에 사용된다.
 from __future__ import annotations
 
+import functools
 import hashlib
+import os
 import re
+import string
+from collections.abc import Callable
+from typing import TypeVar
 
-BLOCK_COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.DOTALL)
-LINE_COMMENT_PATTERN = re.compile(r"--.*?$", re.MULTILINE)
-STRING_LITERAL_PATTERN = re.compile(r"N'(?:''|[^'])*'|'(?:''|[^'])*'", re.DOTALL)
+ScanResult = TypeVar("ScanResult")
+
+# 분석/스캔 캐시 공통 스위치다. "0"이면 모든 캐시를 건너뛴다.
+ANALYSIS_CACHE_ENV = "TSQL_ANALYSIS_CACHE"
+# 스캔 캐시는 원문 SQL을 키로 보관하므로 항목 수와 항목 길이를 함께 제한한다.
+# ASCII 기준 캐시 하나당 최대 약 512 * (16 KiB 키 + 16 KiB 결과) = 16 MiB이다.
+SCAN_CACHE_MAXSIZE = 512
+SCAN_CACHE_MAX_SQL_LEN = 16_384
+
+# cached_scan으로 감싼 함수의 캐시 비우기 함수 목록이다(clear_scan_caches에서 사용).
+_SCAN_CACHE_CLEARERS: list[Callable[[], None]] = []
+
+# ASCII 대문자만 소문자로 바꾸는 변환표다. 길이가 보존되어 원문과 오프셋이 일치한다.
+ASCII_LOWER_TABLE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# 주석/문자열/대괄호·따옴표 식별자를 왼쪽부터 한 번에 토큰화한다.
+# 문자열 내부의 "--", "/*" 나 식별자 내부의 따옴표를 주석/문자열로 오인하지 않는다.
+# 닫히지 않은 "/*" 나 "'" 는 토큰으로 보지 않고 원문에 남겨, 그 뒤 SQL도 계속 탐지 대상이 된다.
+SQL_TOKEN_PATTERN = re.compile(
+    r"(?P<block_comment>/\*.*?\*/)"
+    r"|(?P<line_comment>--[^\n]*)"
+    r"|(?P<string>N?'(?:''|[^'])*')"
+    r"|(?P<identifier>\[[^\]]*\]|\"[^\"]*\")",
+    re.DOTALL,
+)
 
 
 # [함수 설명]
@@ -27,14 +54,110 @@ def summarize_sql(sql: str) -> dict[str, int | str]:
 
 
 # [함수 설명]
-# - 목적: strip_comments_and_strings 처리 로직을 수행한다.
+# - 목적: 분석/스캔 캐시 사용 여부를 환경 변수에서 읽는다.
+# - 입력: 없음(TSQL_ANALYSIS_CACHE 환경 변수)
+# - 출력: "0"이 아니면 True를 반환한다.
+# - 에러 처리: 값이 없으면 기본값 "1"(사용)로 간주한다.
+# - 결정론: 호출 시점마다 읽으므로 테스트/운영 중 설정 변경이 즉시 반영된다.
+# - 보안: 환경 변수 값 외의 정보는 다루지 않는다.
+def analysis_cache_enabled() -> bool:
+    return os.getenv(ANALYSIS_CACHE_ENV, "1").strip() != "0"
+
+
+# [함수 설명]
+# - 목적: SQL 한 건을 받아 불변 결과를 돌려주는 스캔 함수에 크기 제한 LRU 캐시를 씌운다.
+# - 입력: func: 첫 인자가 sql: str이고 나머지 인자가 해시 가능한 함수
+# - 출력: 캐시를 거쳐 결과를 반환하는 래퍼 함수를 반환한다.
+# - 에러 처리: 예외는 캐시하지 않고 그대로 전파한다.
+# - 결정론: 결과가 불변(str/tuple)이어야 하며 캐시 사용 여부와 무관하게 같은 값을 반환한다.
+# - 보안: SCAN_CACHE_MAX_SQL_LEN을 넘는 SQL과 TSQL_ANALYSIS_CACHE=0 설정에서는 원문을 보관하지 않는다.
+def cached_scan(func: Callable[..., ScanResult]) -> Callable[..., ScanResult]:
+    cached = functools.lru_cache(maxsize=SCAN_CACHE_MAXSIZE)(func)
+
+    @functools.wraps(func)
+    def wrapper(sql: str, *args: object) -> ScanResult:
+        if len(sql) > SCAN_CACHE_MAX_SQL_LEN or not analysis_cache_enabled():
+            return func(sql, *args)
+        return cached(sql, *args)
+
+    wrapper.cache_clear = cached.cache_clear  # type: ignore[attr-defined]
+    wrapper.cache_info = cached.cache_info  # type: ignore[attr-defined]
+    _SCAN_CACHE_CLEARERS.append(cached.cache_clear)
+    return wrapper
+
+
+# [함수 설명]
+# - 목적: cached_scan으로 감싼 모든 스캔 함수의 캐시를 비운다.
+# - 입력: 없음
+# - 출력: 없음
+# - 에러 처리: 예외 없이 등록된 캐시를 모두 비운다.
+# - 결정론: 이후 호출은 모두 새로 계산된다.
+# - 보안: 캐시에 남아 있던 원문 SQL 키를 메모리에서 해제한다.
+def clear_scan_caches() -> None:
+    for cache_clear in _SCAN_CACHE_CLEARERS:
+        cache_clear()
+
+
+# [함수 설명]
+# - 목적: ascii_lower 처리 로직을 수행한다.
 # - 입력: sql: str
-# - 출력: 구조화된 dict 결과를 반환한다.
+# - 출력: ASCII 대문자만 소문자로 바꾼, 원문과 길이가 같은 문자열을 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+def ascii_lower(sql: str) -> str:
+    return sql.translate(ASCII_LOWER_TABLE)
+
+
+# [함수 설명]
+# - 목적: strip_comments_and_strings 처리 로직을 수행한다.
+# - 입력: sql: str
+# - 출력: 주석은 공백, 문자열 리터럴은 빈 리터럴('')로 치환한 SQL을 반환한다.
+# - 에러 처리: 닫히지 않은 "/*" 나 "'" 는 치환하지 않고 남기며 그 뒤 SQL을 계속 처리한다.
+# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
+# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+# - 캐시: 반환값이 불변 str이므로 동일 SQL 재요청 시 크기 제한 LRU 캐시 결과를 그대로 재사용한다.
+@cached_scan
 def strip_comments_and_strings(sql: str) -> str:
-    sql = BLOCK_COMMENT_PATTERN.sub(" ", sql)
-    sql = LINE_COMMENT_PATTERN.sub(" ", sql)
-    sql = STRING_LITERAL_PATTERN.sub("''", sql)
-    return sql
+    return SQL_TOKEN_PATTERN.sub(_strip_token, sql)
+
+
+# [함수 설명]
+# - 목적: strip_comments 처리 로직을 수행한다.
+# - 입력: sql: str
+# - 출력: 주석만 공백으로 치환하고 문자열 리터럴은 보존한 SQL을 반환한다.
+# - 에러 처리: 닫히지 않은 "/*" 나 "'" 는 치환하지 않고 남기며 그 뒤 SQL을 계속 처리한다.
+# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
+# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+@cached_scan
+def strip_comments(sql: str) -> str:
+    return SQL_TOKEN_PATTERN.sub(_strip_comment_token, sql)
+
+
+# [함수 설명]
+# - 목적: _strip_token 처리 로직을 수행한다.
+# - 입력: match: re.Match[str]
+# - 출력: 주석은 공백, 문자열은 빈 리터럴, 식별자는 원문으로 치환한 값을 반환한다.
+# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
+# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
+# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+def _strip_token(match: re.Match[str]) -> str:
+    kind = match.lastgroup
+    if kind == "string":
+        return "''"
+    if kind == "identifier":
+        return match.group()
+    return " "
+
+
+# [함수 설명]
+# - 목적: _strip_comment_token 처리 로직을 수행한다.
+# - 입력: match: re.Match[str]
+# - 출력: 주석은 공백, 문자열/식별자는 원문으로 치환한 값을 반환한다.
+# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
+# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
+# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+def _strip_comment_token(match: re.Match[str]) -> str:
+    if match.lastgroup in ("block_comment", "line_comment"):
+        return " "
+    return match.group()
@@ -6,21 +6,19 @@
 # - 연관 모듈: app.api.mcp 라우터에서 호출된다.
 from __future__ import annotations
 
-import logging
 import re
 from collections.abc import Iterable
 
 from sqlglot import exp, parse
 
-from app.services.safe_sql import summarize_sql
-
-logger = logging.getLogger(__name__)
+from app.services.analysis_cache import cached_analysis
 
 TABLE_PATTERN = re.compile(
     r"\b(?:FROM|JOIN|UPDATE|INTO)\s+([A-Za-z_][\w]*(?:\.[A-Za-z_][\w]*)?)",
     re.IGNORECASE,
 )
 FUNCTION_PATTERN = re.compile(r"\b([A-Za-z_][\w]*)\s*\(", re.IGNORECASE)
+NAME_PART_SEPARATOR_PATTERN = re.compile(r"\s*\.\s*")
 FUNCTION_EXCLUDE = {
     "SELECT",
     "FROM",
@@ -97,6 +95,10 @@ TEMP_TABLE_CREATE_PATTERN = re.compile(r"\bCREATE\s+TABLE\s+##?[A-Za-z_][\w]*\b"
 TEMP_TABLE_INSERT_PATTERN = re.compile(r"\bINSERT\s+INTO\s+##?[A-Za-z_][\w]*\b", re.IGNORECASE)
 TEMP_TABLE_DROP_PATTERN = re.compile(r"\bDROP\s+TABLE\s+##?[A-Za-z_][\w]*\b", re.IGNORECASE)
 
+BLOCK_COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.DOTALL)
+LINE_COMMENT_PATTERN = re.compile(r"--[^\n]*")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
 TABLE_VARIABLE_PATTERN = re.compile(r"\bDECLARE\s+@\w+\s+TABLE\b", re.IGNORECASE)
 MERGE_PATTERN = re.compile(r"\bMERGE\b", re.IGNORECASE)
 OUTPUT_CLAUSE_PATTERN = re.compile(r"\bOUTPUT\b\s+(?:INSERTED|DELETED)\b", re.IGNORECASE)
@@ -174,14 +176,8 @@ SELECT_INTO_PATTERN = re.compile(
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+@cached_analysis
 def analyze_references(sql: str, dialect: str = "tsql") -> dict[str, object]:
-    summary = summarize_sql(sql)
-    logger.info(
-        "analyze_references: sql_len=%s sql_hash=%s",
-        summary["len"],
-        summary["sha256_8"],
-    )
-
     references = {"tables": [], "functions": []}
     errors: list[str] = []
 
@@ -206,14 +202,8 @@ def analyze_references(sql: str, dialect: str = "tsql") -> dict[str, object]:
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+@cached_analysis
 def analyze_transactions(sql: str) -> dict[str, object]:
-    summary = summarize_sql(sql)
-    logger.info(
-        "analyze_transactions: sql_len=%s sql_hash=%s",
-        summary["len"],
-        summary["sha256_8"],
-    )
-
     begin_count = len(BEGIN_TRAN_PATTERN.findall(sql))
     commit_count = len(COMMIT_TRAN_PATTERN.findall(sql))
     rollback_count = len(ROLLBACK_TRAN_PATTERN.findall(sql))
@@ -291,15 +281,9 @@ def analyze_transactions(sql: str) -> dict[str, object]:
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+@cached_analysis
 def analyze_migration_impacts(sql: str) -> dict[str, object]:
-    summary = summarize_sql(sql)
-    logger.info(
-        "analyze_migration_impacts: sql_len=%s sql_hash=%s",
-        summary["len"],
-        summary["sha256_8"],
-    )
-
-    normalized = re.sub(r"\s+", " ", sql).strip()
+    normalized = WHITESPACE_PATTERN.sub(" ", sql).strip()
     items: dict[str, dict[str, object]] = {}
     signal_sets: dict[str, set[str]] = {}
 
@@ -556,14 +540,8 @@ def analyze_migration_impacts(sql: str) -> dict[str, object]:
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+@cached_analysis
 def analyze_control_flow(sql: str, dialect: str = "tsql") -> dict[str, object]:
-    summary = summarize_sql(sql)
-    logger.info(
-        "analyze_control_flow: sql_len=%s sql_hash=%s",
-        summary["len"],
-        summary["sha256_8"],
-    )
-
     errors: list[str] = []
     ast_counts = {"if": 0, "try": 0, "return": 0}
     try:
@@ -637,14 +615,8 @@ def analyze_control_flow(sql: str, dialect: str = "tsql") -> dict[str, object]:
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+@cached_analysis
 def analyze_data_changes(sql: str, dialect: str = "tsql") -> dict[str, object]:
-    summary = summarize_sql(sql)
-    logger.info(
-        "analyze_data_changes: sql_len=%s sql_hash=%s",
-        summary["len"],
-        summary["sha256_8"],
-    )
-
     operations = {
         "insert": {"count": 0, "tables": []},
         "update": {"count": 0, "tables": []},
@@ -746,14 +718,8 @@ def analyze_data_changes(sql: str, dialect: str = "tsql") -> dict[str, object]:
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+@cached_analysis
 def analyze_error_handling(sql: str) -> dict[str, object]:
-    summary = summarize_sql(sql)
-    logger.info(
-        "analyze_error_handling: sql_len=%s sql_hash=%s",
-        summary["len"],
-        summary["sha256_8"],
-    )
-
     stripped = _strip_sql_comments(sql)
 
     try_count = len(TRY_PATTERN.findall(stripped))
@@ -998,8 +964,8 @@ def _sorted_unique(values: Iterable[str]) -> list[str]:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _strip_sql_comments(sql: str) -> str:
-    no_block = re.sub(r"/\*.*?\*/", " ", sql, flags=re.DOTALL)
-    return re.sub(r"--[^\n]*", " ", no_block)
+    no_block = BLOCK_COMMENT_PATTERN.sub(" ", sql)
+    return LINE_COMMENT_PATTERN.sub(" ", no_block)
 
 
 # [함수 설명]
@@ -1033,7 +999,7 @@ def _normalize_table_name(raw: str) -> str | None:
     raw = raw.strip().strip(";")
     raw = raw.strip("()")
     parts = []
-    for part in re.split(r"\s*\.\s*", raw):
+    for part in NAME_PART_SEPARATOR_PATTERN.split(raw):
         normalized = _normalize_identifier(part)
         if normalized:
             parts.append(normalized)
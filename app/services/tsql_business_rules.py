@@ -10,13 +10,19 @@ import logging
 import re
 from dataclasses import dataclass
 
-from app.services.safe_sql import summarize_sql
+from app.services.safe_sql import SQL_TOKEN_PATTERN, summarize_sql
 
 logger = logging.getLogger(__name__)
 
 MAX_SIGNAL_ITEMS = 15
 MAX_CONDITION_LENGTH = 160
 
+STRING_LITERAL_PATTERN = re.compile(r"'(?:''|[^'])*'")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+EMPTY_STRING_PATTERN = re.compile(r"=\s*'\\?'|=\s*''")
+NUMBER_LITERAL_PATTERN = re.compile(r"\b-?\d+(?:\.\d+)?\b")
+SELECT_TAIL_PATTERN = re.compile(r"\bSELECT\b.*", re.IGNORECASE)
+
 
 # [클래스 설명]
 # - 역할: Rule 데이터 모델/구성 요소을 정의한다.
@@ -58,6 +64,81 @@ TEMPLATE_REGISTRY: dict[str, str] = {
 }
 
 
+# [클래스 설명]
+# - 역할: RulePatterns 컴파일된 규칙 탐지 패턴 묶음을 정의한다.
+# - 사용 위치: analyze_business_rules 및 내부 탐지 헬퍼에서 사용된다.
+# - 핵심 동작: case_insensitive 값별로 모듈 로드 시 한 번만 컴파일된다.
+# - 제약/주의: 요청마다 re.compile/re.search(문자열)를 호출하지 않도록 공유 인스턴스를 사용한다.
+@dataclass(frozen=True, slots=True)
+class RulePatterns:
+    if_condition: re.Pattern[str]
+    is_null: re.Pattern[str]
+    len_zero: re.Pattern[str]
+    nullif_empty: re.Pattern[str]
+    len_call: re.Pattern[str]
+    nullif_call: re.Pattern[str]
+    range_comparison: re.Pattern[str]
+    range_between: re.Pattern[str]
+    range_variable: re.Pattern[str]
+    exists_call: re.Pattern[str]
+    not_exists: re.Pattern[str]
+    raise_action: re.Pattern[str]
+    return_code: re.Pattern[str]
+    case_keyword: re.Pattern[str]
+    case_expression: re.Pattern[str]
+    case_status_column: re.Pattern[str]
+    soft_delete_predicates: tuple[tuple[re.Pattern[str], str], ...]
+    status_predicates: tuple[tuple[re.Pattern[str], str], ...]
+
+
+# [함수 설명]
+# - 목적: _build_rule_patterns 처리 로직을 수행한다.
+# - 입력: case_insensitive: bool
+# - 출력: 컴파일된 RulePatterns 인스턴스를 반환한다.
+# - 에러 처리: 고정 패턴만 컴파일하므로 별도 예외 처리는 없다.
+# - 결정론: 동일 플래그에 대해 항상 동일한 패턴 묶음을 만든다.
+# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+def _build_rule_patterns(case_insensitive: bool) -> RulePatterns:
+    flags = re.IGNORECASE if case_insensitive else 0
+
+    def compile_(pattern: str) -> re.Pattern[str]:
+        return re.compile(pattern, flags)
+
+    return RulePatterns(
+        if_condition=compile_(
+            r"\bIF\s+(?P<cond>.+?)(?=\bBEGIN\b|\bTHROW\b|\bRAISERROR\b|\bRETURN\b|\bELSE\b)"
+        ),
+        is_null=compile_(r"\bIS\s+NULL\b"),
+        len_zero=compile_(r"\bLEN\s*\(\s*@\w+\s*\)\s*=\s*0\b"),
+        nullif_empty=compile_(r"\bNULLIF\s*\(\s*@\w+\s*,\s*'\\?'\s*\)\s+IS\s+NULL\b"),
+        len_call=compile_(r"\bLEN\s*\("),
+        nullif_call=compile_(r"\bNULLIF\s*\("),
+        range_comparison=compile_(r"@[\w]+\s*(<=|>=|<|>)\s*-?\d+(?:\.\d+)?"),
+        range_between=compile_(r"@[\w]+\s+BETWEEN\s+-?\d+(?:\.\d+)?\s+AND\s+-?\d+(?:\.\d+)?"),
+        range_variable=compile_(r"@[\w]+\s*(<=|>=|<|>)\s*@"),
+        exists_call=compile_(r"\bEXISTS\s*\("),
+        not_exists=compile_(r"\bNOT\s+EXISTS\b"),
+        raise_action=compile_(r"\bTHROW\b|\bRAISERROR\b"),
+        return_code=compile_(r"\bRETURN\s+-?\d+\b"),
+        case_keyword=compile_(r"\bCASE\b"),
+        case_expression=compile_(r"\bCASE\s+(?P<expr>.+?)\s+WHEN\b"),
+        case_status_column=compile_(r"\b(status|active|use_yn|del_yn)\b"),
+        soft_delete_predicates=(
+            (compile_(r"\bis_deleted\s*=\s*0\b"), "is_deleted = ?"),
+            (compile_(r"\bdeleted_yn\s*=\s*'\\?'\b"), "deleted_yn = ?"),
+            (compile_(r"\bdel_yn\s*=\s*'\\?'\b"), "del_yn = ?"),
+        ),
+        status_predicates=(
+            (compile_(r"\buse_yn\s*=\s*'\\?'\b"), "use_yn = ?"),
+            (compile_(r"\bactive_yn\s*=\s*'\\?'\b"), "active_yn = ?"),
+            (compile_(r"\bstatus\s*=\s*'\\?'\b"), "status = ?"),
+        ),
+    )
+
+
+RULE_PATTERNS_BY_CASE = {flag: _build_rule_patterns(flag) for flag in (True, False)}
+
+
 # [함수 설명]
 # - 목적: analyze_business_rules 처리 로직을 수행한다.
 # - 입력: 함수 시그니처 인자
@@ -85,17 +166,19 @@ def analyze_business_rules(
     signals: list[str] = []
 
     rule_counter = 0
-    flags = re.IGNORECASE if case_insensitive else 0
+    patterns = RULE_PATTERNS_BY_CASE[case_insensitive]
 
-    for match in _iter_if_conditions(cleaned, flags):
+    for match in _iter_if_conditions(cleaned, patterns):
         condition = match.condition
-        action = _action_from_window(cleaned, match.end, flags)
+        action = _action_from_window(cleaned, match.end, patterns)
         action_signal = _action_signal(action)
         action_triggers = action in {"raise_error", "return_code"}
 
-        if _is_exists_condition(condition, flags):
+        if _is_exists_condition(condition, patterns):
             rule_counter += 1
-            exists_kind = "not_exists_check" if _is_not_exists(condition, flags) else "exists_check"
+            exists_kind = (
+                "not_exists_check" if _is_not_exists(condition, patterns) else "exists_check"
+            )
             confidence = 0.8
             rule_signals = ["IF", "EXISTS"]
             if exists_kind == "not_exists_check":
@@ -117,10 +200,10 @@ def analyze_business_rules(
             signals.extend(rule_signals)
             continue
 
-        if _is_guard_condition(condition, flags):
+        if _is_guard_condition(condition, patterns):
             rule_counter += 1
             confidence = 0.85 if action_triggers else 0.65
-            guard_signals = _guard_signals(condition, flags)
+            guard_signals = _guard_signals(condition, patterns)
             if action_signal:
                 guard_signals.append(action_signal)
             rules.append(
@@ -136,7 +219,7 @@ def analyze_business_rules(
             signals.extend(guard_signals)
             continue
 
-        range_result = _is_range_condition(condition, flags)
+        range_result = _is_range_condition(condition, patterns)
         if range_result:
             rule_counter += 1
             confidence = 0.75 if range_result == "clear" else 0.6
@@ -155,21 +238,21 @@ def analyze_business_rules(
             )
             signals.extend(range_signals)
 
-    soft_delete_rules = _detect_soft_delete_filters(cleaned, rule_counter, flags)
+    soft_delete_rules = _detect_soft_delete_filters(cleaned, rule_counter, patterns)
     if soft_delete_rules:
         rule_counter = int(soft_delete_rules[-1].id[1:])
         rules.extend(soft_delete_rules)
         for rule in soft_delete_rules:
             signals.extend(rule.signals)
 
-    status_rules = _detect_status_filters(cleaned, rule_counter, flags)
+    status_rules = _detect_status_filters(cleaned, rule_counter, patterns)
     if status_rules:
         rule_counter = int(status_rules[-1].id[1:])
         rules.extend(status_rules)
         for rule in status_rules:
             signals.extend(rule.signals)
 
-    case_rules = _detect_case_mappings(cleaned, rule_counter, flags)
+    case_rules = _detect_case_mappings(cleaned, rule_counter, patterns)
     if case_rules:
         rules.extend(case_rules)
         for rule in case_rules:
@@ -220,11 +303,28 @@ def analyze_business_rules(
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _preprocess_sql(sql: str) -> str:
-    without_strings = re.sub(r"'(?:''|[^'])*'", "'?'", sql)
-    without_block_comments = re.sub(r"/\*.*?\*/", " ", without_strings, flags=re.DOTALL)
-    without_line_comments = re.sub(r"--.*?$", " ", without_block_comments, flags=re.MULTILINE)
-    normalized_identifiers = re.sub(r"\[([^\]]+)\]", r"\1", without_line_comments)
-    return re.sub(r"\s+", " ", normalized_identifiers).strip()
+    # 주석/문자열/식별자를 왼쪽부터 한 번에 처리하므로 주석 속 따옴표가 문자열로 오인되지 않는다.
+    masked = SQL_TOKEN_PATTERN.sub(_mask_rule_token, sql)
+    return WHITESPACE_PATTERN.sub(" ", masked).strip()
+
+
+# [함수 설명]
+# - 목적: _mask_rule_token 처리 로직을 수행한다.
+# - 입력: match: re.Match[str]
+# - 출력: 주석은 공백, 문자열은 '?' 자리표시자, 대괄호 식별자는 괄호를 벗긴 값을 반환한다.
+# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
+# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
+# - 보안: 문자열 리터럴 원문은 규칙 조건에 남기지 않는다.
+def _mask_rule_token(match: re.Match[str]) -> str:
+    kind = match.lastgroup
+    token = match.group()
+    if kind == "string":
+        return "N'?'" if token[0] == "N" else "'?'"
+    if kind == "identifier":
+        if token[0] == "[" and len(token) > 2:
+            return token[1:-1]
+        return token
+    return " "
 
 
 # [클래스 설명]
@@ -240,120 +340,104 @@ class IfConditionMatch:
 
 # [함수 설명]
 # - 목적: _iter_if_conditions 처리 로직을 수행한다.
-# - 입력: sql: str, flags: int
+# - 입력: sql: str, patterns: RulePatterns
 # - 출력: 구조화된 dict 결과를 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _iter_if_conditions(sql: str, flags: int) -> list[IfConditionMatch]:
+def _iter_if_conditions(sql: str, patterns: RulePatterns) -> list[IfConditionMatch]:
     matches: list[IfConditionMatch] = []
-    pattern = re.compile(
-        r"\bIF\s+(?P<cond>.+?)(?=\bBEGIN\b|\bTHROW\b|\bRAISERROR\b|\bRETURN\b|\bELSE\b)",
-        flags,
-    )
-    for match in pattern.finditer(sql):
+    for match in patterns.if_condition.finditer(sql):
         matches.append(IfConditionMatch(condition=match.group("cond").strip(), end=match.end()))
     return matches
 
 
 # [함수 설명]
 # - 목적: _is_guard_condition 처리 로직을 수행한다.
-# - 입력: condition: str, flags: int
+# - 입력: condition: str, patterns: RulePatterns
 # - 출력: 구조화된 dict 결과를 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _is_guard_condition(condition: str, flags: int) -> bool:
-    null_check = re.search(r"\bIS\s+NULL\b", condition, flags)
-    empty_string = re.search(r"=\s*'\\?'|=\s*''", condition)
-    len_zero = re.search(r"\bLEN\s*\(\s*@\w+\s*\)\s*=\s*0\b", condition, flags)
-    nullif_check = re.search(
-        r"\bNULLIF\s*\(\s*@\w+\s*,\s*'\\?'\s*\)\s+IS\s+NULL\b",
-        condition,
-        flags,
-    )
+def _is_guard_condition(condition: str, patterns: RulePatterns) -> bool:
+    null_check = patterns.is_null.search(condition)
+    empty_string = EMPTY_STRING_PATTERN.search(condition)
+    len_zero = patterns.len_zero.search(condition)
+    nullif_check = patterns.nullif_empty.search(condition)
     return bool(null_check or empty_string or len_zero or nullif_check)
 
 
 # [함수 설명]
 # - 목적: _guard_signals 처리 로직을 수행한다.
-# - 입력: condition: str, flags: int
+# - 입력: condition: str, patterns: RulePatterns
 # - 출력: 구조화된 dict 결과를 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _guard_signals(condition: str, flags: int) -> list[str]:
+def _guard_signals(condition: str, patterns: RulePatterns) -> list[str]:
     signals = ["IF"]
-    if re.search(r"\bIS\s+NULL\b", condition, flags):
+    if patterns.is_null.search(condition):
         signals.append("IS NULL")
-    if re.search(r"\bLEN\s*\(", condition, flags):
+    if patterns.len_call.search(condition):
         signals.append("LEN")
-    if re.search(r"\bNULLIF\s*\(", condition, flags):
+    if patterns.nullif_call.search(condition):
         signals.append("NULLIF")
-    if re.search(r"=\s*'\\?'|=\s*''", condition):
+    if EMPTY_STRING_PATTERN.search(condition):
         signals.append("EMPTY")
     return signals
 
 
 # [함수 설명]
 # - 목적: _is_range_condition 처리 로직을 수행한다.
-# - 입력: condition: str, flags: int
+# - 입력: condition: str, patterns: RulePatterns
 # - 출력: 구조화된 dict 결과를 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _is_range_condition(condition: str, flags: int) -> str | None:
-    comparison = re.search(
-        r"@[\w]+\s*(<=|>=|<|>)\s*-?\d+(?:\.\d+)?",
-        condition,
-        flags,
-    )
-    between = re.search(
-        r"@[\w]+\s+BETWEEN\s+-?\d+(?:\.\d+)?\s+AND\s+-?\d+(?:\.\d+)?",
-        condition,
-        flags,
-    )
+def _is_range_condition(condition: str, patterns: RulePatterns) -> str | None:
+    comparison = patterns.range_comparison.search(condition)
+    between = patterns.range_between.search(condition)
     if comparison or between:
         return "clear"
-    if re.search(r"@[\w]+\s*(<=|>=|<|>)\s*@", condition, flags):
+    if patterns.range_variable.search(condition):
         return "fuzzy"
     return None
 
 
 # [함수 설명]
 # - 목적: _is_exists_condition 처리 로직을 수행한다.
-# - 입력: condition: str, flags: int
+# - 입력: condition: str, patterns: RulePatterns
 # - 출력: 구조화된 dict 결과를 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _is_exists_condition(condition: str, flags: int) -> bool:
-    return bool(re.search(r"\bEXISTS\s*\(", condition, flags))
+def _is_exists_condition(condition: str, patterns: RulePatterns) -> bool:
+    return bool(patterns.exists_call.search(condition))
 
 
 # [함수 설명]
 # - 목적: _is_not_exists 처리 로직을 수행한다.
-# - 입력: condition: str, flags: int
+# - 입력: condition: str, patterns: RulePatterns
 # - 출력: 구조화된 dict 결과를 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _is_not_exists(condition: str, flags: int) -> bool:
-    return bool(re.search(r"\bNOT\s+EXISTS\b", condition, flags))
+def _is_not_exists(condition: str, patterns: RulePatterns) -> bool:
+    return bool(patterns.not_exists.search(condition))
 
 
 # [함수 설명]
 # - 목적: _action_from_window 처리 로직을 수행한다.
-# - 입력: sql: str, start: int, flags: int
+# - 입력: sql: str, start: int, patterns: RulePatterns
 # - 출력: 구조화된 dict 결과를 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _action_from_window(sql: str, start: int, flags: int) -> str:
+def _action_from_window(sql: str, start: int, patterns: RulePatterns) -> str:
     window = sql[start : start + 220]
-    if re.search(r"\bTHROW\b|\bRAISERROR\b", window, flags):
+    if patterns.raise_action.search(window):
         return "raise_error"
-    if re.search(r"\bRETURN\s+-?\d+\b", window, flags):
+    if patterns.return_code.search(window):
         return "return_code"
     return "branch"
 
@@ -381,10 +465,10 @@ def _action_signal(action: str) -> str | None:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _sanitize_condition(condition: str) -> str:
-    sanitized = re.sub(r"'(?:''|[^'])*'", "'?'", condition)
-    sanitized = re.sub(r"\b-?\d+(?:\.\d+)?\b", "?", sanitized)
-    sanitized = re.sub(r"\bSELECT\b.*", "SELECT …", sanitized, flags=re.IGNORECASE)
-    sanitized = re.sub(r"\s+", " ", sanitized).strip()
+    sanitized = STRING_LITERAL_PATTERN.sub("'?'", condition)
+    sanitized = NUMBER_LITERAL_PATTERN.sub("?", sanitized)
+    sanitized = SELECT_TAIL_PATTERN.sub("SELECT …", sanitized)
+    sanitized = WHITESPACE_PATTERN.sub(" ", sanitized).strip()
     if len(sanitized) > MAX_CONDITION_LENGTH:
         sanitized = f"{sanitized[: MAX_CONDITION_LENGTH - 1]}…"
     return sanitized
@@ -403,34 +487,26 @@ def _rule_id(counter: int) -> str:
 
 # [함수 설명]
 # - 목적: _detect_soft_delete_filters 처리 로직을 수행한다.
-# - 입력: sql: str, counter: int, flags: int
+# - 입력: sql: str, counter: int, patterns: RulePatterns
 # - 출력: 구조화된 dict 결과를 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _detect_soft_delete_filters(sql: str, counter: int, flags: int) -> list[Rule]:
-    patterns = [
-        (r"\bis_deleted\s*=\s*0\b", "is_deleted = ?"),
-        (r"\bdeleted_yn\s*=\s*'\\?'\b", "deleted_yn = ?"),
-        (r"\bdel_yn\s*=\s*'\\?'\b", "del_yn = ?"),
-    ]
-    return _detect_predicate_rules(sql, counter, patterns, "soft_delete_filter", flags)
+def _detect_soft_delete_filters(sql: str, counter: int, patterns: RulePatterns) -> list[Rule]:
+    return _detect_predicate_rules(
+        sql, counter, patterns.soft_delete_predicates, "soft_delete_filter"
+    )
 
 
 # [함수 설명]
 # - 목적: _detect_status_filters 처리 로직을 수행한다.
-# - 입력: sql: str, counter: int, flags: int
+# - 입력: sql: str, counter: int, patterns: RulePatterns
 # - 출력: 구조화된 dict 결과를 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _detect_status_filters(sql: str, counter: int, flags: int) -> list[Rule]:
-    patterns = [
-        (r"\buse_yn\s*=\s*'\\?'\b", "use_yn = ?"),
-        (r"\bactive_yn\s*=\s*'\\?'\b", "active_yn = ?"),
-        (r"\bstatus\s*=\s*'\\?'\b", "status = ?"),
-    ]
-    return _detect_predicate_rules(sql, counter, patterns, "status_filter", flags)
+def _detect_status_filters(sql: str, counter: int, patterns: RulePatterns) -> list[Rule]:
+    return _detect_predicate_rules(sql, counter, patterns.status_predicates, "status_filter")
 
 
 # [함수 설명]
@@ -443,14 +519,13 @@ def _detect_status_filters(sql: str, counter: int, flags: int) -> list[Rule]:
 def _detect_predicate_rules(
     sql: str,
     counter: int,
-    patterns: list[tuple[str, str]],
+    predicates: tuple[tuple[re.Pattern[str], str], ...],
     kind: str,
-    flags: int,
 ) -> list[Rule]:
     found: list[Rule] = []
     seen_conditions: set[str] = set()
-    for pattern, condition in patterns:
-        if re.search(pattern, sql, flags):
+    for pattern, condition in predicates:
+        if pattern.search(sql):
             if condition in seen_conditions:
                 continue
             seen_conditions.add(condition)
@@ -471,23 +546,23 @@ def _detect_predicate_rules(
 
 # [함수 설명]
 # - 목적: _detect_case_mappings 처리 로직을 수행한다.
-# - 입력: sql: str, counter: int, flags: int
+# - 입력: sql: str, counter: int, patterns: RulePatterns
 # - 출력: 구조화된 dict 결과를 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _detect_case_mappings(sql: str, counter: int, flags: int) -> list[Rule]:
-    matches = list(re.finditer(r"\bCASE\b", sql, flags))
+def _detect_case_mappings(sql: str, counter: int, patterns: RulePatterns) -> list[Rule]:
+    matches = list(patterns.case_keyword.finditer(sql))
     if not matches:
         return []
     found: list[Rule] = []
     for match in matches:
         window = sql[match.start() : match.start() + 120]
-        expr_match = re.search(r"\bCASE\s+(?P<expr>.+?)\s+WHEN\b", window, flags)
+        expr_match = patterns.case_expression.search(window)
         expr = expr_match.group("expr").strip() if expr_match else ""
         headline = f"CASE mapping on {expr}" if expr else "CASE mapping"
         mapped_confidence = 0.65
-        if re.search(r"\b(status|active|use_yn|del_yn)\b", expr, flags):
+        if patterns.case_status_column.search(expr):
             mapped_confidence = 0.75
         counter += 1
         found.append(
@@ -9,17 +9,16 @@ from __future__ import annotations
 import importlib.util
 import logging
 import re
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 
-from app.services.safe_sql import strip_comments_and_strings, summarize_sql
+from app.services.safe_sql import summarize_sql
+from app.services.tsql_call_scan import EXEC_SIGNAL_BY_KIND, scan_calls
 
 logger = logging.getLogger(__name__)
 
 SIGNAL_LIMIT = 10
 
-IDENTIFIER_PATTERN = r"(?:\[[^\]]+\]|[A-Za-z_][\w$#]*)"
-QUALIFIED_NAME_PATTERN = rf"{IDENTIFIER_PATTERN}(?:\s*\.\s*{IDENTIFIER_PATTERN})*"
-
 
 # [클래스 설명]
 # - 역할: SqlObject 데이터 모델/구성 요소을 정의한다.
@@ -49,6 +48,32 @@ class Options:
     max_edges: int = 2000
 
 
+# [클래스 설명]
+# - 역할: GraphNode 호출 그래프 노드 레코드를 정의한다.
+# - 사용 위치: build_call_graph 내부에서 노드 인덱스/정렬/토폴로지 계산에 사용된다.
+# - 핵심 동작: slots 기반 고정 필드로 노드당 dict 생성 없이 속성 접근한다.
+# - 제약/주의: 응답 직렬화 시점에만 dict로 변환한다.
+@dataclass(frozen=True, slots=True)
+class GraphNode:
+    id: str
+    name: str
+    type: str
+
+
+# [클래스 설명]
+# - 역할: EdgeStat 호출 간선 집계 레코드를 정의한다.
+# - 사용 위치: build_call_graph 내부에서 (from, to, kind)별 호출 횟수/시그널 누적에 사용된다.
+# - 핵심 동작: slots 기반 가변 필드로 count/signals를 제자리에서 갱신한다.
+# - 제약/주의: 응답 직렬화 시점에만 dict로 변환한다.
+@dataclass(slots=True)
+class EdgeStat:
+    from_id: str
+    to_id: str
+    kind: str
+    count: int = 1
+    signals: list[str] = field(default_factory=list)
+
+
 # [함수 설명]
 # - 목적: build_call_graph 처리 로직을 수행한다.
 # - 입력: objects: list[SqlObject], options: Options
@@ -67,8 +92,7 @@ def build_call_graph(objects: list[SqlObject], options: Options) -> dict[str, ob
 
     filtered_objects = [obj for obj in objects if _include_object(obj, options)]
 
-    node_entries: list[dict[str, str]] = []
-    node_by_id: dict[str, dict[str, str]] = {}
+    node_by_id: dict[str, GraphNode] = {}
     base_name_index: dict[str, list[str]] = {}
 
     for obj in filtered_objects:
@@ -77,20 +101,10 @@ def build_call_graph(objects: list[SqlObject], options: Options) -> dict[str, ob
             continue
         if normalized_id in node_by_id:
             continue
-        node = {
-            "id": normalized_id,
-            "name": obj.name,
-            "type": obj.type,
-        }
-        node_by_id[normalized_id] = node
-        node_entries.append(node)
+        node_by_id[normalized_id] = GraphNode(id=normalized_id, name=obj.name, type=obj.type)
         _index_base_name(normalized_id, base_name_index)
 
-    exec_pattern, function_pattern, function_definition_pattern = _build_patterns(
-        options.case_insensitive
-    )
-
-    edge_stats: dict[tuple[str, str, str], dict[str, object]] = {}
+    edge_stats: dict[tuple[str, str, str], EdgeStat] = {}
     ambiguous_calls: set[tuple[str, str]] = set()
 
     for obj in filtered_objects:
@@ -106,51 +120,35 @@ def build_call_graph(objects: list[SqlObject], options: Options) -> dict[str, ob
             summary["sha256_8"],
         )
 
-        cleaned_sql = _normalize_whitespace(strip_comments_and_strings(obj.sql))
-
-        for match in exec_pattern.finditer(cleaned_sql):
-            name = match.group("name")
-            if options.ignore_dynamic_exec and _is_dynamic_exec(name, options):
+        for event in scan_calls(obj.sql, options.case_insensitive):
+            if event.is_definition:
                 continue
-            kind = match.group("kind").lower()
-            signal = "EXECUTE" if kind == "execute" else "EXEC"
+            if event.kind == "function_call":
+                object_type, signal = "function", "FUNCTION"
+            else:
+                if options.ignore_dynamic_exec and _is_dynamic_exec(event.name, options):
+                    continue
+                object_type, signal = "procedure", EXEC_SIGNAL_BY_KIND[event.kind]
             resolved = _resolve_target(
-                name,
+                event.name,
                 base_name_index,
                 node_by_id,
                 options,
-                object_type="procedure",
+                object_type=object_type,
                 ambiguous_calls=ambiguous_calls,
                 caller_name=obj.name,
                 errors=errors,
             )
             if resolved:
-                _record_edge(edge_stats, caller_id, resolved, kind, signal)
+                _record_edge(edge_stats, caller_id, resolved, event.kind, signal)
 
-        definition_spans = _find_definition_spans(cleaned_sql, function_definition_pattern)
-        for match in function_pattern.finditer(cleaned_sql):
-            if match.span("name") in definition_spans:
-                continue
-            name = match.group("name")
-            resolved = _resolve_target(
-                name,
-                base_name_index,
-                node_by_id,
-                options,
-                object_type="function",
-                ambiguous_calls=ambiguous_calls,
-                caller_name=obj.name,
-                errors=errors,
-            )
-            if resolved:
-                _record_edge(edge_stats, caller_id, resolved, "function_call", "FUNCTION")
-
-    node_entries.sort(key=lambda item: item["id"])
+    # 노드 id는 유일하므로 키만 정렬해 노드 목록을 한 번에 구성한다.
+    node_entries = [node_by_id[node_id] for node_id in sorted(node_by_id)]
 
     truncated = False
     if len(node_entries) > options.max_nodes:
         node_entries = node_entries[: options.max_nodes]
-        node_by_id = {node["id"]: node for node in node_entries}
+        node_by_id = {node.id: node for node in node_entries}
         truncated = True
         errors.append(
             {
@@ -160,7 +158,6 @@ def build_call_graph(objects: list[SqlObject], options: Options) -> dict[str, ob
         )
 
     edges = _build_edges(edge_stats, node_by_id)
-    edges.sort(key=lambda item: (item["from"], item["to"], item["kind"]))
 
     if len(edges) > options.max_edges:
         edges = edges[: options.max_edges]
@@ -187,7 +184,9 @@ def build_call_graph(objects: list[SqlObject], options: Options) -> dict[str, ob
             "truncated": truncated,
         },
         "graph": {
-            "nodes": node_entries,
+            "nodes": [
+                {"id": node.id, "name": node.name, "type": node.type} for node in node_entries
+            ],
             "edges": edges,
         },
         "topology": topology,
@@ -223,56 +222,6 @@ def _index_base_name(full_id: str, base_name_index: dict[str, list[str]]) -> Non
     base_name_index.setdefault(base_name, []).append(full_id)
 
 
-# [함수 설명]
-# - 목적: _build_patterns 처리 로직을 수행한다.
-# - 입력: 함수 시그니처 인자
-# - 출력: 구조화된 dict 결과를 반환한다.
-# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
-# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
-# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _build_patterns(
-    case_insensitive: bool,
-) -> tuple[re.Pattern[str], re.Pattern[str], re.Pattern[str]]:
-    flags = re.IGNORECASE if case_insensitive else 0
-    exec_pattern = re.compile(
-        rf"\b(?P<kind>EXEC(?:UTE)?)\s+(?!\s*@)(?!\s*\()(?P<name>{QUALIFIED_NAME_PATTERN})",
-        flags,
-    )
-    function_pattern = re.compile(rf"\b(?P<name>{QUALIFIED_NAME_PATTERN})\s*\(", flags)
-    function_definition_pattern = re.compile(
-        rf"\b(?:CREATE|ALTER)\s+FUNCTION\s+(?P<name>{QUALIFIED_NAME_PATTERN})\s*\(",
-        flags,
-    )
-    return exec_pattern, function_pattern, function_definition_pattern
-
-
-# [함수 설명]
-# - 목적: _normalize_whitespace 처리 로직을 수행한다.
-# - 입력: sql: str
-# - 출력: 구조화된 dict 결과를 반환한다.
-# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
-# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
-# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _normalize_whitespace(sql: str) -> str:
-    return " ".join(sql.split())
-
-
-# [함수 설명]
-# - 목적: _find_definition_spans 처리 로직을 수행한다.
-# - 입력: 함수 시그니처 인자
-# - 출력: 구조화된 dict 결과를 반환한다.
-# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
-# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
-# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _find_definition_spans(
-    sql: str, function_definition_pattern: re.Pattern[str]
-) -> set[tuple[int, int]]:
-    spans: set[tuple[int, int]] = set()
-    for match in function_definition_pattern.finditer(sql):
-        spans.add(match.span("name"))
-    return spans
-
-
 # [함수 설명]
 # - 목적: _is_dynamic_exec 처리 로직을 수행한다.
 # - 입력: name: str, options: Options
@@ -295,7 +244,7 @@ def _is_dynamic_exec(name: str, options: Options) -> bool:
 def _resolve_target(
     name: str,
     base_name_index: dict[str, list[str]],
-    node_by_id: dict[str, dict[str, str]],
+    node_by_id: dict[str, GraphNode],
     options: Options,
     object_type: str,
     ambiguous_calls: set[tuple[str, str]],
@@ -314,7 +263,7 @@ def _resolve_target(
     # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
     def _is_target_type(target_id: str) -> bool:
         node = node_by_id.get(target_id)
-        return node is not None and node["type"].lower() == object_type
+        return node is not None and node.type.lower() == object_type
 
     if options.schema_sensitive:
         if schema is None:
@@ -354,7 +303,7 @@ def _resolve_target(
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _record_edge(
-    edge_stats: dict[tuple[str, str, str], dict[str, object]],
+    edge_stats: dict[tuple[str, str, str], EdgeStat],
     from_id: str,
     to_id: str,
     kind: str,
@@ -363,16 +312,10 @@ def _record_edge(
     key = (from_id, to_id, kind)
     entry = edge_stats.get(key)
     if entry is None:
-        edge_stats[key] = {
-            "from": from_id,
-            "to": to_id,
-            "kind": kind,
-            "count": 1,
-            "signals": [signal],
-        }
+        edge_stats[key] = EdgeStat(from_id=from_id, to_id=to_id, kind=kind, signals=[signal])
         return
-    entry["count"] = int(entry["count"]) + 1
-    signals = entry["signals"]
+    entry.count += 1
+    signals = entry.signals
     if signal not in signals and len(signals) < SIGNAL_LIMIT:
         signals.append(signal)
 
@@ -385,21 +328,22 @@ def _record_edge(
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _build_edges(
-    edge_stats: dict[tuple[str, str, str], dict[str, object]],
-    node_by_id: dict[str, dict[str, str]],
+    edge_stats: dict[tuple[str, str, str], EdgeStat],
+    node_by_id: dict[str, GraphNode],
 ) -> list[dict[str, object]]:
     edges: list[dict[str, object]] = []
-    node_ids = set(node_by_id)
-    for entry in edge_stats.values():
-        if entry["from"] not in node_ids or entry["to"] not in node_ids:
+    # edge_stats 키가 (from, to, kind) 이므로 키 정렬만으로 최종 간선 순서가 결정된다.
+    for key in sorted(edge_stats):
+        entry = edge_stats[key]
+        if entry.from_id not in node_by_id or entry.to_id not in node_by_id:
             continue
         edges.append(
             {
-                "from": entry["from"],
-                "to": entry["to"],
-                "kind": entry["kind"],
-                "count": entry["count"],
-                "signals": entry["signals"],
+                "from": entry.from_id,
+                "to": entry.to_id,
+                "kind": entry.kind,
+                "count": entry.count,
+                "signals": entry.signals,
             }
         )
     return edges
@@ -413,11 +357,11 @@ def _build_edges(
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _build_topology(
-    nodes: list[dict[str, str]],
+    nodes: list[GraphNode],
     edges: list[dict[str, object]],
 ) -> dict[str, object]:
-    in_degree = {node["id"]: 0 for node in nodes}
-    out_degree = {node["id"]: 0 for node in nodes}
+    in_degree = {node.id: 0 for node in nodes}
+    out_degree = {node.id: 0 for node in nodes}
 
     for edge in edges:
         from_id = edge["from"]
@@ -427,8 +371,9 @@ def _build_topology(
         if to_id in in_degree:
             in_degree[to_id] += 1
 
-    roots = sorted([node_id for node_id, degree in in_degree.items() if degree == 0])
-    leaves = sorted([node_id for node_id, degree in out_degree.items() if degree == 0])
+    # nodes가 id 순으로 정렬되어 전달되므로 dict 순회 결과도 이미 정렬되어 있다.
+    roots = [node_id for node_id, degree in in_degree.items() if degree == 0]
+    leaves = [node_id for node_id, degree in out_degree.items() if degree == 0]
 
     return {
         "roots": roots,
@@ -488,7 +433,8 @@ def _normalize_full_name(name: str, case_insensitive: bool) -> str:
     parts = [_clean_identifier(part) for part in re.split(r"\.", name) if part.strip()]
     if case_insensitive:
         parts = [part.lower() for part in parts]
-    return ".".join(parts)
+    # 노드 id는 dict 키/간선 키로 반복 비교되므로 intern 해 동일 문자열 객체를 공유한다.
+    return sys.intern(".".join(parts))
 
 
 # [함수 설명]
@@ -0,0 +1,88 @@
+# [파일 설명]
+# - 목적: call-graph/callers 서비스가 공유하는 EXEC/함수 호출 스캔 로직을 제공한다.
+# - 제공 기능: 주석/문자열 제거 후 호출 이벤트(종류, 이름, 정의 여부)를 추출한다.
+# - 입력/출력: SQL 본문과 대소문자 옵션을 입력받아 불변 CallEvent 튜플을 반환한다.
+# - 주의 사항: 결과는 (sql, case_insensitive) 단위로 캐시되므로 두 엔드포인트가 재사용한다.
+# - 연관 모듈: app.services.tsql_call_graph, app.services.tsql_callers에서 호출된다.
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from app.services.safe_sql import ascii_lower, cached_scan, strip_comments_and_strings
+
+IDENTIFIER_PATTERN = r"(?:\[[^\]]+\]|[A-Za-z_][\w$#]*)"
+QUALIFIED_NAME_PATTERN = rf"{IDENTIFIER_PATTERN}(?:\s*\.\s*{IDENTIFIER_PATTERN})*"
+
+EXEC_SIGNAL_BY_KIND = {"exec": "EXEC", "execute": "EXECUTE"}
+
+
+# [클래스 설명]
+# - 역할: CallEvent 호출 이벤트 레코드를 정의한다.
+# - 사용 위치: scan_calls 결과로 call-graph/callers 서비스에서 소비된다.
+# - 핵심 동작: kind는 exec/execute/function_call, is_definition은 CREATE/ALTER FUNCTION 이름 여부다.
+# - 제약/주의: 캐시에서 공유되므로 불변(frozen)으로 유지한다.
+@dataclass(frozen=True, slots=True)
+class CallEvent:
+    kind: str
+    name: str
+    is_definition: bool = False
+
+
+# [함수 설명]
+# - 목적: _build_patterns 처리 로직을 수행한다.
+# - 입력: case_insensitive: bool
+# - 출력: (exec, function, function_definition) 컴파일 패턴 튜플을 반환한다.
+# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
+# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
+# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+def _build_patterns(
+    case_insensitive: bool,
+) -> tuple[re.Pattern[str], re.Pattern[str], re.Pattern[str]]:
+    # 대소문자 무시 모드는 ASCII 소문자화한 SQL에 소문자 키워드로 매칭한다(re.IGNORECASE 미사용).
+    kw = str.lower if case_insensitive else str
+    exec_pattern = re.compile(
+        rf"\b(?P<kind>{kw('EXEC')}(?:{kw('UTE')})?)\s+(?!\s*@)(?!\s*\()"
+        rf"(?P<name>{QUALIFIED_NAME_PATTERN})"
+    )
+    function_pattern = re.compile(rf"\b(?P<name>{QUALIFIED_NAME_PATTERN})\s*\(")
+    function_definition_pattern = re.compile(
+        rf"\b(?:{kw('CREATE')}|{kw('ALTER')})\s+{kw('FUNCTION')}\s+"
+        rf"(?P<name>{QUALIFIED_NAME_PATTERN})\s*\("
+    )
+    return exec_pattern, function_pattern, function_definition_pattern
+
+
+PATTERNS_BY_CASE = {flag: _build_patterns(flag) for flag in (True, False)}
+
+
+# [함수 설명]
+# - 목적: scan_calls 처리 로직을 수행한다.
+# - 입력: sql: str, case_insensitive: bool
+# - 출력: EXEC 이벤트 뒤에 함수 호출 이벤트가 이어지는 CallEvent 튜플을 반환한다.
+# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
+# - 결정론: 각 종류 내에서는 SQL 등장 순서를 유지한다.
+# - 캐시: 불변 튜플을 반환하므로 call-graph/callers가 동일 SQL 스캔 결과를 공유한다.
+@cached_scan
+def scan_calls(sql: str, case_insensitive: bool) -> tuple[CallEvent, ...]:
+    cleaned_sql = strip_comments_and_strings(sql)
+    if case_insensitive:
+        cleaned_sql = ascii_lower(cleaned_sql)
+    exec_pattern, function_pattern, function_definition_pattern = PATTERNS_BY_CASE[case_insensitive]
+
+    events = [
+        CallEvent(kind=match.group("kind").lower(), name=match.group("name"))
+        for match in exec_pattern.finditer(cleaned_sql)
+    ]
+    definition_spans = {
+        match.span("name") for match in function_definition_pattern.finditer(cleaned_sql)
+    }
+    events.extend(
+        CallEvent(
+            kind="function_call",
+            name=match.group("name"),
+            is_definition=match.span("name") in definition_spans,
+        )
+        for match in function_pattern.finditer(cleaned_sql)
+    )
+    return tuple(events)
@@ -10,7 +10,8 @@ import logging
 import re
 from dataclasses import dataclass
 
-from app.services.safe_sql import strip_comments_and_strings, summarize_sql
+from app.services.safe_sql import summarize_sql
+from app.services.tsql_call_scan import EXEC_SIGNAL_BY_KIND, CallEvent, scan_calls
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +19,6 @@ MAX_OBJECTS = 500
 MAX_TOTAL_SQL_LENGTH = 1_000_000
 SIGNAL_LIMIT = 10
 
-IDENTIFIER_PATTERN = r"(?:\[[^\]]+\]|[A-Za-z_][\w$#]*)"
-QUALIFIED_NAME_PATTERN = rf"{IDENTIFIER_PATTERN}(?:\s*\.\s*{IDENTIFIER_PATTERN})*"
-
 
 # [클래스 설명]
 # - 역할: SqlObject 데이터 모델/구성 요소을 정의한다.
@@ -73,7 +71,6 @@ def find_callers(
 
     objects_to_process = _apply_limits(objects, total_length, errors)
 
-    exec_pattern, function_pattern = _build_patterns(options.case_insensitive)
     callers: list[dict[str, object]] = []
 
     for sql_object in objects_to_process:
@@ -82,7 +79,6 @@ def find_callers(
         ):
             continue
 
-        cleaned_sql = strip_comments_and_strings(sql_object.sql)
         summary = summarize_sql(sql_object.sql)
         logger.info(
             "find_callers: object=%s sql_len=%s sql_hash=%s",
@@ -91,27 +87,11 @@ def find_callers(
             summary["sha256_8"],
         )
 
-        matches: list[tuple[str, str]] = []
+        events = scan_calls(sql_object.sql, options.case_insensitive)
         if target_type == "function":
-            matches.extend(
-                _find_function_calls(
-                    cleaned_sql,
-                    target_schema,
-                    target_name,
-                    options,
-                    function_pattern,
-                )
-            )
+            matches = _find_function_calls(events, target_schema, target_name, options)
         else:
-            matches.extend(
-                _find_exec_calls(
-                    cleaned_sql,
-                    target_schema,
-                    target_name,
-                    options,
-                    exec_pattern,
-                )
-            )
+            matches = _find_exec_calls(events, target_schema, target_name, options)
 
         if not matches:
             continue
@@ -187,23 +167,6 @@ def _apply_limits(
     return trimmed
 
 
-# [함수 설명]
-# - 목적: _build_patterns 처리 로직을 수행한다.
-# - 입력: case_insensitive: bool
-# - 출력: 구조화된 dict 결과를 반환한다.
-# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
-# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
-# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _build_patterns(case_insensitive: bool) -> tuple[re.Pattern[str], re.Pattern[str]]:
-    flags = re.IGNORECASE if case_insensitive else 0
-    exec_pattern = re.compile(
-        rf"\b(?P<kind>EXEC(?:UTE)?)\s+(?!\s*@)(?!\s*\()(?P<name>{QUALIFIED_NAME_PATTERN})",
-        flags,
-    )
-    function_pattern = re.compile(rf"\b(?P<name>{QUALIFIED_NAME_PATTERN})\s*\(", flags)
-    return exec_pattern, function_pattern
-
-
 # [함수 설명]
 # - 목적: _find_exec_calls 처리 로직을 수행한다.
 # - 입력: 함수 시그니처 인자
@@ -212,20 +175,18 @@ def _build_patterns(case_insensitive: bool) -> tuple[re.Pattern[str], re.Pattern
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _find_exec_calls(
-    sql: str,
+    events: tuple[CallEvent, ...],
     target_schema: str | None,
     target_name: str,
     options: CallerOptions,
-    exec_pattern: re.Pattern[str],
 ) -> list[tuple[str, str]]:
     matches: list[tuple[str, str]] = []
-    for match in exec_pattern.finditer(sql):
-        name = match.group("name")
-        if not _matches_target(name, target_schema, target_name, options):
+    for event in events:
+        if event.kind == "function_call":
             continue
-        kind = match.group("kind").lower()
-        signal = "EXECUTE" if kind == "execute" else "EXEC"
-        matches.append((kind, signal))
+        if not _matches_target(event.name, target_schema, target_name, options):
+            continue
+        matches.append((event.kind, EXEC_SIGNAL_BY_KIND[event.kind]))
     return matches
 
 
@@ -237,16 +198,16 @@ def _find_exec_calls(
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _find_function_calls(
-    sql: str,
+    events: tuple[CallEvent, ...],
     target_schema: str | None,
     target_name: str,
     options: CallerOptions,
-    function_pattern: re.Pattern[str],
 ) -> list[tuple[str, str]]:
     matches: list[tuple[str, str]] = []
-    for match in function_pattern.finditer(sql):
-        name = match.group("name")
-        if not _matches_target(name, target_schema, target_name, options):
+    for event in events:
+        if event.kind != "function_call":
+            continue
+        if not _matches_target(event.name, target_schema, target_name, options):
             continue
         matches.append(("function_call", "FUNCTION"))
     return matches
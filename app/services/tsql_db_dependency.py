@@ -7,13 +7,11 @@
 from __future__ import annotations
 
 import importlib.util
-import logging
 import re
 from typing import Any
 
-from app.services.safe_sql import summarize_sql
-
-logger = logging.getLogger(__name__)
+from app.services.analysis_cache import cached_analysis
+from app.services.safe_sql import SQL_TOKEN_PATTERN
 
 EXCLUDED_DB_TOKENS = {"dbo", "sys", "information_schema"}
 
@@ -50,6 +48,14 @@ TEMP_TABLE_INSERT_PATTERN = re.compile(
 )
 TABLE_VARIABLE_PATTERN = re.compile(r"\bDECLARE\s+@\w+\s+TABLE\b", re.IGNORECASE)
 
+# 정규식 탐지 전에 casefold한 SQL에서 필수 리터럴 포함 여부를 먼저 확인해 불필요한 스캔을 건너뛴다.
+# casefold는 re.IGNORECASE가 같다고 보는 문자(예: U+017F)를 모두 접으므로 누락이 없다('i' 키워드는 제외).
+CLR_TRIGGER_KEYWORDS = ("assembly", "external_access", "unsafe", "clr")
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+BRACKET_IDENTIFIER_PATTERN = re.compile(r"\[([^\]]+)\]")
+DOT_SPACING_PATTERN = re.compile(r"\s*\.\s*")
+
 REASON_MESSAGES = {
     "RSN_LINKED_SERVER": "Linked server usage increases environment coupling and deployment complexity.",
     "RSN_CROSS_DB": "Cross-database references increase coupling across database boundaries.",
@@ -109,6 +115,7 @@ RECOMMENDATION_MAP = {
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+@cached_analysis
 def analyze_db_dependency(
     sql: str,
     dialect: str = "tsql",
@@ -116,17 +123,11 @@ def analyze_db_dependency(
     schema_sensitive: bool = False,
     max_items: int = 200,
 ) -> dict[str, Any]:
-    summary = summarize_sql(sql)
-    logger.info(
-        "analyze_db_dependency: sql_len=%s sql_hash=%s",
-        summary["len"],
-        summary["sha256_8"],
-    )
-
-    stripped_sql = _strip_comments(sql)
-    masked_sql = _mask_string_literals(stripped_sql)
+    masked_sql = _strip_comments_and_mask_strings(sql)
     normalized_sql = _normalize_whitespace(_normalize_bracketed_identifiers(masked_sql))
     scan_sql = normalized_sql
+    folded_sql = scan_sql.casefold()
+    has_dotted_names = "." in folded_sql
 
     linked_servers: dict[str, dict[str, Any]] = {}
     cross_database: dict[tuple[str, str, str, str], dict[str, Any]] = {}
@@ -145,68 +146,75 @@ def analyze_db_dependency(
 
     four_part_spans: list[tuple[int, int]] = []
 
-    for match in FOUR_PART_PATTERN.finditer(scan_sql):
-        server, db_name, schema_name, object_name = match.groups()
-        server_name = _normalize_identifier(server, case_insensitive)
-        four_part_spans.append(match.span())
-        _add_linked_server(linked_servers, server_name, "FOUR_PART")
-        _ = (db_name, schema_name, object_name)
+    if has_dotted_names:
+        for match in FOUR_PART_PATTERN.finditer(scan_sql):
+            server, db_name, schema_name, object_name = match.groups()
+            server_name = _normalize_identifier(server, case_insensitive)
+            four_part_spans.append(match.span())
+            _add_linked_server(linked_servers, server_name, "FOUR_PART")
+            _ = (db_name, schema_name, object_name)
 
-    for match in THREE_PART_PATTERN.finditer(scan_sql):
-        if _overlaps_any(match.span(), four_part_spans):
-            continue
-        db_name, schema_name, object_name = match.groups()
-        db_token = db_name.lower() if case_insensitive else db_name
-        if db_token in EXCLUDED_DB_TOKENS:
-            continue
-        cross_key = (
-            _normalize_identifier(db_name, case_insensitive),
-            _normalize_identifier(schema_name, case_insensitive)
-            if schema_sensitive
-            else schema_name,
-            _normalize_identifier(object_name, case_insensitive),
-            "three_part_name",
-        )
-        cross_database.setdefault(
-            cross_key,
-            {
-                "database": cross_key[0],
-                "schema": cross_key[1],
-                "object": cross_key[2],
-                "kind": "three_part_name",
-                "signals": ["THREE_PART"],
-            },
-        )
-
-    for match in OPENQUERY_PATTERN.finditer(scan_sql):
-        openquery_count += 1
-        server_name = _normalize_identifier(match.group(1), case_insensitive)
-        _add_linked_server(linked_servers, server_name, "OPENQUERY")
-
-    for _ in OPENDATASOURCE_PATTERN.finditer(scan_sql):
-        opendatasource_count += 1
-
-    for match in EXEC_AT_PATTERN.finditer(scan_sql):
-        remote_exec_count += 1
-        server_name = _normalize_identifier(match.group(1), case_insensitive)
-        _add_linked_server(linked_servers, server_name, "EXEC AT")
-        remote_exec.setdefault(
-            (server_name, "exec_at"),
-            {"target": server_name, "kind": "exec_at", "signals": ["EXEC AT"]},
-        )
-
-    xp_cmdshell_matches = XP_CMDSHELL_PATTERN.findall(scan_sql)
-    if xp_cmdshell_matches:
-        xp_cmdshell_count = len(xp_cmdshell_matches)
-        system_objects["SYS_XP_CMDSHELL"] = {
-            "id": "SYS_XP_CMDSHELL",
-            "signals": ["xp_cmdshell"],
-        }
-
-    xp_other_matches = [
-        match for match in XP_OTHER_PATTERN.findall(scan_sql) if match.lower() != "xp_cmdshell"
-    ]
-    sp_oa_matches = SP_OA_PATTERN.findall(scan_sql)
+        for match in THREE_PART_PATTERN.finditer(scan_sql):
+            if _overlaps_any(match.span(), four_part_spans):
+                continue
+            db_name, schema_name, object_name = match.groups()
+            db_token = db_name.lower() if case_insensitive else db_name
+            if db_token in EXCLUDED_DB_TOKENS:
+                continue
+            cross_key = (
+                _normalize_identifier(db_name, case_insensitive),
+                _normalize_identifier(schema_name, case_insensitive)
+                if schema_sensitive
+                else schema_name,
+                _normalize_identifier(object_name, case_insensitive),
+                "three_part_name",
+            )
+            cross_database.setdefault(
+                cross_key,
+                {
+                    "database": cross_key[0],
+                    "schema": cross_key[1],
+                    "object": cross_key[2],
+                    "kind": "three_part_name",
+                    "signals": ["THREE_PART"],
+                },
+            )
+
+    if "openquery" in folded_sql:
+        for match in OPENQUERY_PATTERN.finditer(scan_sql):
+            openquery_count += 1
+            server_name = _normalize_identifier(match.group(1), case_insensitive)
+            _add_linked_server(linked_servers, server_name, "OPENQUERY")
+
+    if "opendatasource" in folded_sql:
+        for _ in OPENDATASOURCE_PATTERN.finditer(scan_sql):
+            opendatasource_count += 1
+
+    if "exec" in folded_sql:
+        for match in EXEC_AT_PATTERN.finditer(scan_sql):
+            remote_exec_count += 1
+            server_name = _normalize_identifier(match.group(1), case_insensitive)
+            _add_linked_server(linked_servers, server_name, "EXEC AT")
+            remote_exec.setdefault(
+                (server_name, "exec_at"),
+                {"target": server_name, "kind": "exec_at", "signals": ["EXEC AT"]},
+            )
+
+    if "xp_cmdshell" in folded_sql:
+        xp_cmdshell_matches = XP_CMDSHELL_PATTERN.findall(scan_sql)
+        if xp_cmdshell_matches:
+            xp_cmdshell_count = len(xp_cmdshell_matches)
+            system_objects["SYS_XP_CMDSHELL"] = {
+                "id": "SYS_XP_CMDSHELL",
+                "signals": ["xp_cmdshell"],
+            }
+
+    xp_other_matches = (
+        [match for match in XP_OTHER_PATTERN.findall(scan_sql) if match.lower() != "xp_cmdshell"]
+        if "xp_" in folded_sql
+        else []
+    )
+    sp_oa_matches = SP_OA_PATTERN.findall(scan_sql) if "sp_oa" in folded_sql else []
     if xp_other_matches:
         system_proc_count += len(xp_other_matches)
         system_objects["SYS_XP_OTHER"] = {"id": "SYS_XP_OTHER", "signals": ["xp_*"]}
@@ -217,7 +225,11 @@ def analyze_db_dependency(
             "signals": ["sp_OA*"],
         }
 
-    clr_matches = CLR_PATTERN.findall(scan_sql)
+    clr_matches = (
+        CLR_PATTERN.findall(scan_sql)
+        if any(keyword in folded_sql for keyword in CLR_TRIGGER_KEYWORDS)
+        else []
+    )
     if clr_matches:
         clr_signal_count = len(clr_matches)
         signals = _sorted_unique(
@@ -230,13 +242,14 @@ def analyze_db_dependency(
 
     temp_table_signals: set[str] = set()
     temp_table_present = False
-    if TEMP_TABLE_PATTERN.search(scan_sql):
+    has_temp_marker = "#" in folded_sql
+    if has_temp_marker and TEMP_TABLE_PATTERN.search(scan_sql):
         temp_table_present = True
         temp_table_signals.add("#temp")
-    if TEMP_TABLE_CREATE_PATTERN.search(scan_sql):
+    if has_temp_marker and TEMP_TABLE_CREATE_PATTERN.search(scan_sql):
         temp_table_present = True
         temp_table_signals.add("CREATE TABLE #")
-    if TEMP_TABLE_INSERT_PATTERN.search(scan_sql):
+    if has_temp_marker and TEMP_TABLE_INSERT_PATTERN.search(scan_sql):
         temp_table_present = True
         temp_table_signals.add("INSERT INTO #")
     if temp_table_present:
@@ -247,7 +260,7 @@ def analyze_db_dependency(
         }
 
     table_variable_present = False
-    if TABLE_VARIABLE_PATTERN.search(scan_sql):
+    if "declare" in folded_sql and TABLE_VARIABLE_PATTERN.search(scan_sql):
         table_variable_present = True
         tempdb_pressure_signals += 1
         tempdb_signals["TABLE_VARIABLE"] = {
@@ -383,91 +396,32 @@ def analyze_db_dependency(
 
 
 # [함수 설명]
-# - 목적: _strip_comments 처리 로직을 수행한다.
+# - 목적: _strip_comments_and_mask_strings 처리 로직을 수행한다.
 # - 입력: sql: str
-# - 출력: 구조화된 dict 결과를 반환한다.
-# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
+# - 출력: 주석을 제거하고 문자열 리터럴을 '__STR__' 자리표시자로 바꾼 SQL을 반환한다.
+# - 에러 처리: 닫히지 않은 주석/문자열은 safe_sql 규칙대로 치환하지 않고 원문에 남긴다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _strip_comments(sql: str) -> str:
-    result: list[str] = []
-    i = 0
-    in_string = False
-    length = len(sql)
-    while i < length:
-        if in_string:
-            if sql[i] == "'":
-                if i + 1 < length and sql[i + 1] == "'":
-                    result.append("''")
-                    i += 2
-                    continue
-                in_string = False
-                result.append("'")
-                i += 1
-                continue
-            result.append(sql[i])
-            i += 1
-            continue
-
-        if sql[i : i + 2] == "--":
-            while i < length and sql[i] != "\n":
-                i += 1
-            continue
-        if sql[i : i + 2] == "/*":
-            i += 2
-            while i < length and sql[i : i + 2] != "*/":
-                i += 1
-            i = i + 2 if i < length else i
-            continue
-        if sql[i] == "'":
-            in_string = True
-            result.append("'")
-            i += 1
-            continue
-        result.append(sql[i])
-        i += 1
-    return "".join(result)
+def _strip_comments_and_mask_strings(sql: str) -> str:
+    return SQL_TOKEN_PATTERN.sub(_scan_token_replacement, sql)
 
 
 # [함수 설명]
-# - 목적: _mask_string_literals 처리 로직을 수행한다.
-# - 입력: sql: str
-# - 출력: 구조화된 dict 결과를 반환한다.
+# - 목적: _scan_token_replacement 처리 로직을 수행한다.
+# - 입력: match: re.Match[str]
+# - 출력: 주석은 빈 문자열, 문자열 리터럴은 N 접두사를 유지한 자리표시자, 식별자는 원문을 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
-# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
-# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _mask_string_literals(sql: str) -> str:
-    result: list[str] = []
-    i = 0
-    length = len(sql)
-    while i < length:
-        if sql[i : i + 2].lower() == "n'":
-            result.append("N'__STR__'")
-            i += 2
-            while i < length:
-                if sql[i] == "'":
-                    if i + 1 < length and sql[i + 1] == "'":
-                        i += 2
-                        continue
-                    i += 1
-                    break
-                i += 1
-            continue
-        if sql[i] == "'":
-            result.append("'__STR__'")
-            i += 1
-            while i < length:
-                if sql[i] == "'":
-                    if i + 1 < length and sql[i + 1] == "'":
-                        i += 2
-                        continue
-                    i += 1
-                    break
-                i += 1
-            continue
-        result.append(sql[i])
-        i += 1
-    return "".join(result)
+# - 결정론: safe_sql.SQL_TOKEN_PATTERN 규칙을 따르므로 다른 분석기와 토큰 경계가 같다.
+#   대괄호/따옴표 식별자 안의 작은따옴표([it's])는 문자열을 열지 않으며,
+#   소문자 n 접두사는 토큰에 포함되지 않아 n'__STR__' 형태로 남는다(탐지 패턴은 대소문자를 무시한다).
+# - 보안: 문자열 리터럴 원문은 스캔 대상에 남기지 않는다.
+def _scan_token_replacement(match: re.Match[str]) -> str:
+    kind = match.lastgroup
+    if kind == "identifier":
+        return match.group()
+    if kind != "string":
+        return ""
+    return "'__STR__'" if match.group()[0] == "'" else "N'__STR__'"
 
 
 # [함수 설명]
@@ -478,7 +432,7 @@ def _mask_string_literals(sql: str) -> str:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _normalize_whitespace(sql: str) -> str:
-    return re.sub(r"\s+", " ", sql).strip()
+    return WHITESPACE_PATTERN.sub(" ", sql).strip()
 
 
 # [함수 설명]
@@ -489,8 +443,8 @@ def _normalize_whitespace(sql: str) -> str:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _normalize_bracketed_identifiers(sql: str) -> str:
-    without_brackets = re.sub(r"\[([^\]]+)\]", r"\1", sql)
-    return re.sub(r"\s*\.\s*", ".", without_brackets)
+    without_brackets = BRACKET_IDENTIFIER_PATTERN.sub(r"\1", sql)
+    return DOT_SPACING_PATTERN.sub(".", without_brackets)
 
 
 # [함수 설명]
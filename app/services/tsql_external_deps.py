@@ -10,20 +10,27 @@ import logging
 import re
 from collections.abc import Iterable
 
-from app.services.safe_sql import summarize_sql
+from app.services.safe_sql import (
+    ascii_lower,
+    strip_comments,
+    strip_comments_and_strings,
+    summarize_sql,
+)
 
 logger = logging.getLogger(__name__)
 
-BLOCK_COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.DOTALL)
-LINE_COMMENT_PATTERN = re.compile(r"--.*?$", re.MULTILINE)
-STRING_LITERAL_PATTERN = re.compile(r"N'(?:''|[^'])*'|'(?:''|[^'])*'", re.DOTALL)
-
 IDENTIFIER_PATTERN = r"(?:\[[^\]]+\]|[A-Za-z_][\w$#]*)"
 
 SIGNAL_LIMIT = 15
 
 EXCLUDED_DB_NAMES = {"dbo", "sys", "information_schema"}
 
+# 각 패턴이 매칭되려면 반드시 포함해야 하는 소문자 부분 문자열이다(빠른 배제용).
+SCAN_TRIGGER_KEYWORDS = ("exec", "openquery", "opendatasource", "xp_cmdshell")
+CLR_TRIGGER_KEYWORDS = ("assembly", "external_access", "unsafe", "sp_configure")
+
+OTHER_KIND_BY_ID = {"EXT_CLR": "clr", "EXT_XP_CMDSHELL": "xp_cmdshell"}
+
 
 # [함수 설명]
 # - 목적: analyze_external_dependencies 처리 로직을 수행한다.
@@ -47,11 +54,10 @@ def analyze_external_dependencies(sql: str, options: dict | None = None) -> dict
     errors: list[str] = []
     signals: set[str] = set()
 
-    comment_stripped = _strip_comments(sql)
+    comment_stripped = strip_comments(sql)
+    cleaned_sql = strip_comments_and_strings(sql)
     clr_signals = _detect_clr_signals(comment_stripped, case_insensitive)
 
-    cleaned_sql = _replace_string_literals(comment_stripped)
-
     linked_servers: dict[str, set[str]] = {}
     cross_database: set[tuple[str, str, str, str]] = set()
     remote_exec: dict[str, set[str]] = {}
@@ -59,51 +65,54 @@ def analyze_external_dependencies(sql: str, options: dict | None = None) -> dict
     opendatasource: dict[str, set[str]] = {}
     others: dict[str, set[str]] = {}
 
-    patterns = _build_patterns(case_insensitive)
-
-    for match in patterns["openquery"].finditer(cleaned_sql):
-        server = _clean_identifier(match.group("server"))
-        _add_signal(openquery, server, "OPENQUERY")
-        _add_signal(linked_servers, server, "OPENQUERY")
-        signals.add("OPENQUERY")
-
-    if patterns["opendatasource"].search(cleaned_sql):
-        _add_signal(opendatasource, "OPENDATASOURCE", "OPENDATASOURCE")
-        signals.add("OPENDATASOURCE")
-
-    for match in patterns["exec_at"].finditer(cleaned_sql):
-        server = _clean_identifier(match.group("server"))
-        _add_signal(remote_exec, server, "EXEC AT")
-        _add_signal(linked_servers, server, "EXEC AT")
-        signals.add("EXEC AT")
-
-    four_part_spans: list[tuple[int, int]] = []
-    for match in patterns["four_part"].finditer(cleaned_sql):
-        four_part_spans.append(match.span())
-        server = _clean_identifier(match.group("server"))
-        _add_signal(linked_servers, server, "four_part_name")
-        signals.add("four_part_name")
-
-    for match in patterns["three_part"].finditer(cleaned_sql):
-        span = match.span()
-        if _span_within(span, four_part_spans):
-            continue
-        database = _clean_identifier(match.group("database"))
-        if database.lower() in EXCLUDED_DB_NAMES:
-            continue
-        schema = _clean_identifier(match.group("schema"))
-        obj = _clean_identifier(match.group("object"))
-        cross_database.add((database, schema, obj, "three_part_name"))
-        signals.add("three_part_name")
+    patterns = PATTERNS_BY_CASE[case_insensitive]
+    scan_sql = ascii_lower(cleaned_sql) if case_insensitive else cleaned_sql
+
+    # 트리거 부분 문자열이 하나도 없으면 정규식 스캔 전체를 건너뛴다.
+    if _has_scan_triggers(scan_sql if case_insensitive else ascii_lower(cleaned_sql)):
+        for match in patterns["openquery"].finditer(scan_sql):
+            server = _clean_identifier(_group_text(cleaned_sql, match, "server"))
+            _add_signal(openquery, server, "OPENQUERY")
+            _add_signal(linked_servers, server, "OPENQUERY")
+            signals.add("OPENQUERY")
+
+        if patterns["opendatasource"].search(scan_sql):
+            _add_signal(opendatasource, "OPENDATASOURCE", "OPENDATASOURCE")
+            signals.add("OPENDATASOURCE")
+
+        for match in patterns["exec_at"].finditer(scan_sql):
+            server = _clean_identifier(_group_text(cleaned_sql, match, "server"))
+            _add_signal(remote_exec, server, "EXEC AT")
+            _add_signal(linked_servers, server, "EXEC AT")
+            signals.add("EXEC AT")
+
+        four_part_spans: list[tuple[int, int]] = []
+        for match in patterns["four_part"].finditer(scan_sql):
+            four_part_spans.append(match.span())
+            server = _clean_identifier(_group_text(cleaned_sql, match, "server"))
+            _add_signal(linked_servers, server, "four_part_name")
+            signals.add("four_part_name")
+
+        for match in patterns["three_part"].finditer(scan_sql):
+            span = match.span()
+            if _span_within(span, four_part_spans):
+                continue
+            database = _clean_identifier(_group_text(cleaned_sql, match, "database"))
+            if database.lower() in EXCLUDED_DB_NAMES:
+                continue
+            schema = _clean_identifier(_group_text(cleaned_sql, match, "schema"))
+            obj = _clean_identifier(_group_text(cleaned_sql, match, "object"))
+            cross_database.add((database, schema, obj, "three_part_name"))
+            signals.add("three_part_name")
+
+        if patterns["xp_cmdshell"].search(scan_sql):
+            others["EXT_XP_CMDSHELL"] = {"XP_CMDSHELL"}
+            signals.add("XP_CMDSHELL")
 
     if clr_signals:
         others["EXT_CLR"] = set(clr_signals)
         signals.add("CLR")
 
-    if patterns["xp_cmdshell"].search(cleaned_sql):
-        others["EXT_XP_CMDSHELL"] = {"XP_CMDSHELL"}
-        signals.add("XP_CMDSHELL")
-
     linked_servers_list = _build_linked_server_list(linked_servers)
     cross_database_list = _build_cross_database_list(cross_database)
     remote_exec_list = _build_target_list(remote_exec, "exec_at")
@@ -178,49 +187,53 @@ def _resolve_options(options: dict | None) -> dict[str, object]:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _build_patterns(case_insensitive: bool) -> dict[str, re.Pattern[str]]:
-    flags = re.IGNORECASE if case_insensitive else 0
+    # 대소문자 무시 모드는 ASCII 소문자화한 SQL에 소문자 키워드로 매칭한다(re.IGNORECASE 미사용).
+    kw = str.lower if case_insensitive else str
     return {
-        "openquery": re.compile(rf"\bOPENQUERY\s*\(\s*(?P<server>{IDENTIFIER_PATTERN})\s*,", flags),
-        "opendatasource": re.compile(r"\bOPENDATASOURCE\s*\(", flags),
+        "openquery": re.compile(
+            rf"\b{kw('OPENQUERY')}\s*\(\s*(?P<server>{IDENTIFIER_PATTERN})\s*,"
+        ),
+        "opendatasource": re.compile(rf"\b{kw('OPENDATASOURCE')}\s*\("),
         "exec_at": re.compile(
-            rf"\bEXEC(?:UTE)?\b[^;]*?\bAT\b\s*(?P<server>{IDENTIFIER_PATTERN})",
-            flags,
+            rf"\b{kw('EXEC')}(?:{kw('UTE')})?\b[^;]*?\b{kw('AT')}\b\s*"
+            rf"(?P<server>{IDENTIFIER_PATTERN})"
         ),
         "four_part": re.compile(
             rf"\b(?P<server>{IDENTIFIER_PATTERN})\s*\.\s*(?P<database>{IDENTIFIER_PATTERN})"
-            rf"\s*\.\s*(?P<schema>{IDENTIFIER_PATTERN})\s*\.\s*(?P<object>{IDENTIFIER_PATTERN})\b",
-            flags,
+            rf"\s*\.\s*(?P<schema>{IDENTIFIER_PATTERN})\s*\.\s*(?P<object>{IDENTIFIER_PATTERN})\b"
         ),
         "three_part": re.compile(
             rf"\b(?P<database>{IDENTIFIER_PATTERN})\s*\.\s*(?P<schema>{IDENTIFIER_PATTERN})"
-            rf"\s*\.\s*(?P<object>{IDENTIFIER_PATTERN})\b",
-            flags,
+            rf"\s*\.\s*(?P<object>{IDENTIFIER_PATTERN})\b"
         ),
-        "xp_cmdshell": re.compile(r"\bxp_cmdshell\b", flags),
+        "xp_cmdshell": re.compile(rf"\b{kw('xp_cmdshell')}\b"),
     }
 
 
 # [함수 설명]
-# - 목적: _strip_comments 처리 로직을 수행한다.
-# - 입력: sql: str
-# - 출력: 구조화된 dict 결과를 반환한다.
+# - 목적: _build_clr_patterns 처리 로직을 수행한다.
+# - 입력: case_insensitive: bool
+# - 출력: (CLR 시그널, 컴파일된 패턴) 튜플 목록을 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _strip_comments(sql: str) -> str:
-    sql = BLOCK_COMMENT_PATTERN.sub(" ", sql)
-    return LINE_COMMENT_PATTERN.sub(" ", sql)
+def _build_clr_patterns(case_insensitive: bool) -> tuple[tuple[str, re.Pattern[str]], ...]:
+    kw = str.lower if case_insensitive else str
+    return (
+        ("CREATE ASSEMBLY", re.compile(rf"\b{kw('CREATE')}\s+{kw('ASSEMBLY')}\b")),
+        ("EXTERNAL_ACCESS", re.compile(rf"\b{kw('EXTERNAL_ACCESS')}\b")),
+        ("UNSAFE", re.compile(rf"\b{kw('UNSAFE')}\b")),
+        (
+            "CLR_ENABLED",
+            re.compile(
+                rf"\b{kw('sp_configure')}\b\s*{kw('N')}?'[^']*{kw('clr')}\s+{kw('enabled')}[^']*'"
+            ),
+        ),
+    )
 
 
-# [함수 설명]
-# - 목적: _replace_string_literals 처리 로직을 수행한다.
-# - 입력: sql: str
-# - 출력: 구조화된 dict 결과를 반환한다.
-# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
-# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
-# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _replace_string_literals(sql: str) -> str:
-    return STRING_LITERAL_PATTERN.sub("''", sql)
+PATTERNS_BY_CASE = {flag: _build_patterns(flag) for flag in (True, False)}
+CLR_PATTERNS_BY_CASE = {flag: _build_clr_patterns(flag) for flag in (True, False)}
 
 
 # [함수 설명]
@@ -231,21 +244,45 @@ def _replace_string_literals(sql: str) -> str:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _detect_clr_signals(sql: str, case_insensitive: bool) -> list[str]:
-    flags = re.IGNORECASE if case_insensitive else 0
+    lowered = ascii_lower(sql)
+    if not any(keyword in lowered for keyword in CLR_TRIGGER_KEYWORDS):
+        return []
+    if case_insensitive:
+        sql = lowered
     signals: set[str] = set()
 
-    if re.search(r"\bCREATE\s+ASSEMBLY\b", sql, flags):
-        signals.update(["CLR", "CREATE ASSEMBLY"])
-    if re.search(r"\bEXTERNAL_ACCESS\b", sql, flags):
-        signals.update(["CLR", "EXTERNAL_ACCESS"])
-    if re.search(r"\bUNSAFE\b", sql, flags):
-        signals.update(["CLR", "UNSAFE"])
-    if re.search(r"\bsp_configure\b\s*N?'[^']*clr\s+enabled[^']*'", sql, flags):
-        signals.update(["CLR", "CLR_ENABLED"])
+    for signal, pattern in CLR_PATTERNS_BY_CASE[case_insensitive]:
+        if pattern.search(sql):
+            signals.update(["CLR", signal])
 
     return _sorted_unique(signals)
 
 
+# [함수 설명]
+# - 목적: _has_scan_triggers 처리 로직을 수행한다.
+# - 입력: lowered_sql: str (ASCII 소문자화된 SQL)
+# - 출력: 외부 의존성 패턴이 매칭될 가능성이 있으면 True를 반환한다.
+# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
+# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
+# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+def _has_scan_triggers(lowered_sql: str) -> bool:
+    if "." in lowered_sql:
+        return True
+    return any(keyword in lowered_sql for keyword in SCAN_TRIGGER_KEYWORDS)
+
+
+# [함수 설명]
+# - 목적: _group_text 처리 로직을 수행한다.
+# - 입력: sql: str, match: re.Match[str], group: str
+# - 출력: 소문자화 이전 원문에서 그룹 위치의 문자열을 잘라 반환한다.
+# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
+# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
+# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+def _group_text(sql: str, match: re.Match[str], group: str) -> str:
+    start, end = match.span(group)
+    return sql[start:end]
+
+
 # [함수 설명]
 # - 목적: _clean_identifier 처리 로직을 수행한다.
 # - 입력: identifier: str
@@ -358,9 +395,7 @@ def _build_other_list(others: dict[str, set[str]]) -> list[dict[str, object]]:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _infer_other_kind(key: str) -> str:
-    if key == "EXT_XP_CMDSHELL":
-        return "xp_cmdshell"
-    return "clr"
+    return OTHER_KIND_BY_ID.get(key, "clr")
 
 
 # [함수 설명]
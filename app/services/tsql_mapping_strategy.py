@@ -6,10 +6,9 @@
 # - 연관 모듈: app.api.mcp 라우터에서 호출된다.
 from __future__ import annotations
 
-import logging
 from dataclasses import dataclass
 
-from app.services.safe_sql import summarize_sql
+from app.services.analysis_cache import cached_analysis
 from app.services.tsql_analyzer import (
     analyze_control_flow,
     analyze_data_changes,
@@ -19,8 +18,6 @@ from app.services.tsql_analyzer import (
     analyze_transactions,
 )
 
-logger = logging.getLogger(__name__)
-
 
 # [클래스 설명]
 # - 역할: StrategyItem 데이터 모델/구성 요소을 정의한다.
@@ -52,6 +49,7 @@ class ReasonItem:
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+@cached_analysis
 def recommend_mapping_strategy(
     sql: str,
     obj_type: str,
@@ -66,13 +64,6 @@ def recommend_mapping_strategy(
     - Default to rewrite unless risk signals demand call_sp_first.
     - target_style="call_sp_first" only allows rewrite for very safe inputs.
     """
-    summary = summarize_sql(sql)
-    logger.info(
-        "recommend_mapping_strategy: sql_len=%s sql_hash=%s",
-        summary["len"],
-        summary["sha256_8"],
-    )
-
     references = analyze_references(sql, dialect)
     transactions = analyze_transactions(sql)
     impacts = analyze_migration_impacts(sql)
@@ -6,9 +6,11 @@
 # - 연관 모듈: app.api.mcp 라우터에서 호출된다.
 from __future__ import annotations
 
+import bisect
 import logging
 from dataclasses import dataclass
 
+from app.services.analysis_cache import cached_analysis
 from app.services.safe_sql import summarize_sql
 from app.services.tsql_analyzer import (
     analyze_control_flow,
@@ -45,6 +47,110 @@ class RecommendationItem:
     message: str
 
 
+BASE_SCORE = 10
+
+# 점수 구간 상한(포함)과 난이도 레벨을 같은 순서로 둔다: ..24 low, ..49 medium, ..74 high.
+DIFFICULTY_LEVEL_UPPER_BOUNDS = (24, 49, 74)
+DIFFICULTY_LEVELS = ("low", "medium", "high", "very_high")
+
+# 불리언 시그널 이름과 참일 때 더해지는 고정 점수 요인. 한 번의 순회로 요인 목록을 만든다.
+FLAG_FACTORS: tuple[tuple[str, FactorItem], ...] = (
+    (
+        "has_dynamic_sql",
+        FactorItem(
+            "FAC_DYN_SQL",
+            25,
+            "Dynamic SQL increases rewrite complexity and requires MyBatis dynamic tags or refactor.",
+        ),
+    ),
+    (
+        "has_cursor",
+        FactorItem(
+            "FAC_CURSOR",
+            25,
+            "Cursor usage typically needs set-based rewrites when moving to MyBatis.",
+        ),
+    ),
+    (
+        "uses_temp_objects",
+        FactorItem(
+            "FAC_TEMP_OBJECTS",
+            12,
+            "Temporary tables or table variables require alternative structures in Java/MyBatis.",
+        ),
+    ),
+    (
+        "has_merge",
+        FactorItem("FAC_MERGE", 10, "MERGE statements often need custom merge logic in MyBatis."),
+    ),
+    (
+        "has_output_clause",
+        FactorItem("FAC_OUTPUT", 10, "OUTPUT clauses require explicit result handling in MyBatis."),
+    ),
+    (
+        "has_identity_retrieval",
+        FactorItem(
+            "FAC_IDENTITY",
+            8,
+            "Identity retrieval patterns add key handling complexity in MyBatis.",
+        ),
+    ),
+    (
+        "uses_transaction",
+        FactorItem(
+            "FAC_TXN_IN_SQL",
+            10,
+            "Transaction statements inside SQL need careful boundary handling.",
+        ),
+    ),
+    (
+        "has_writes",
+        FactorItem(
+            "FAC_WRITES",
+            10,
+            "Write operations increase migration complexity compared with read-only logic.",
+        ),
+    ),
+    (
+        "has_try_catch",
+        FactorItem(
+            "FAC_TRY_CATCH", 5, "TRY/CATCH blocks require aligned exception handling in Java."
+        ),
+    ),
+    (
+        "uses_at_at_error",
+        FactorItem(
+            "FAC_LEGACY_ERROR",
+            8,
+            "Legacy @@ERROR handling needs refactoring to Java exceptions.",
+        ),
+    ),
+)
+
+
+# [함수 설명]
+# - 목적: evaluate_mybatis_difficulty 호출마다 SQL 요약과 객체 유형 로그를 남긴다.
+# - 입력: evaluate_mybatis_difficulty와 같은 인자
+# - 출력: 없음
+# - 에러 처리: 예외 없이 로그만 기록한다.
+# - 결정론: 캐시 적중 여부와 무관하게 동일 입력에 대해 동일한 로그를 남긴다.
+# - 보안: 원문 SQL 대신 길이와 해시 앞 8자리만 기록한다.
+def _log_difficulty_call(
+    sql: str,
+    obj_type: str,
+    dialect: str = "tsql",
+    case_insensitive: bool = True,
+    max_reason_items: int = 25,
+) -> None:
+    summary = summarize_sql(sql)
+    logger.info(
+        "evaluate_mybatis_difficulty: sql_len=%s sql_hash=%s obj_type=%s",
+        summary["len"],
+        summary["sha256_8"],
+        obj_type.lower() if case_insensitive else obj_type,
+    )
+
+
 # [함수 설명]
 # - 목적: evaluate_mybatis_difficulty 처리 로직을 수행한다.
 # - 입력: 함수 시그니처 인자
@@ -52,6 +158,7 @@ class RecommendationItem:
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+@cached_analysis(log_call=_log_difficulty_call)
 def evaluate_mybatis_difficulty(
     sql: str,
     obj_type: str,
@@ -65,14 +172,6 @@ def evaluate_mybatis_difficulty(
     - Base score 10.
     - Add points for signals, then clamp 0..100.
     """
-    summary = summarize_sql(sql)
-    logger.info(
-        "evaluate_mybatis_difficulty: sql_len=%s sql_hash=%s obj_type=%s",
-        summary["len"],
-        summary["sha256_8"],
-        obj_type.lower() if case_insensitive else obj_type,
-    )
-
     references = analyze_references(sql, dialect)
     transactions = analyze_transactions(sql)
     impacts = analyze_migration_impacts(sql)
@@ -105,127 +204,54 @@ def evaluate_mybatis_difficulty(
 
     error_signaling = _error_signaling(error_handling, case_insensitive)
 
-    factors: list[FactorItem] = []
-
-    # [함수 설명]
-    # - 목적: add_factor 처리 로직을 수행한다.
-    # - 입력: item_id: str, points: int, message: str
-    # - 출력: 구조화된 dict 결과를 반환한다.
-    # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
-    # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
-    # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-    def add_factor(item_id: str, points: int, message: str) -> None:
-        factors.append(FactorItem(id=item_id, points=points, message=message))
-
-    score = 10
-
-    if has_dynamic_sql:
-        score += 25
-        add_factor(
-            "FAC_DYN_SQL",
-            25,
-            "Dynamic SQL increases rewrite complexity and requires MyBatis dynamic tags or refactor.",
-        )
-    if has_cursor:
-        score += 25
-        add_factor(
-            "FAC_CURSOR",
-            25,
-            "Cursor usage typically needs set-based rewrites when moving to MyBatis.",
-        )
-    if uses_temp_objects:
-        score += 12
-        add_factor(
-            "FAC_TEMP_OBJECTS",
-            12,
-            "Temporary tables or table variables require alternative structures in Java/MyBatis.",
-        )
-    if has_merge:
-        score += 10
-        add_factor(
-            "FAC_MERGE",
-            10,
-            "MERGE statements often need custom merge logic in MyBatis.",
-        )
-    if has_output_clause:
-        score += 10
-        add_factor(
-            "FAC_OUTPUT",
-            10,
-            "OUTPUT clauses require explicit result handling in MyBatis.",
-        )
-    if has_identity_retrieval:
-        score += 8
-        add_factor(
-            "FAC_IDENTITY",
-            8,
-            "Identity retrieval patterns add key handling complexity in MyBatis.",
-        )
-    if uses_transaction:
-        score += 10
-        add_factor(
-            "FAC_TXN_IN_SQL",
-            10,
-            "Transaction statements inside SQL need careful boundary handling.",
-        )
-    if has_writes:
-        score += 10
-        add_factor(
-            "FAC_WRITES",
-            10,
-            "Write operations increase migration complexity compared with read-only logic.",
-        )
+    flag_signals = {
+        "has_dynamic_sql": has_dynamic_sql,
+        "has_cursor": has_cursor,
+        "uses_temp_objects": uses_temp_objects,
+        "has_merge": has_merge,
+        "has_output_clause": has_output_clause,
+        "has_identity_retrieval": has_identity_retrieval,
+        "uses_transaction": uses_transaction,
+        "has_writes": has_writes,
+        "has_try_catch": has_try_catch,
+        "uses_at_at_error": uses_at_at_error,
+    }
+    factors = [factor for signal, factor in FLAG_FACTORS if flag_signals[signal]]
 
     if len(write_ops_sorted) > 1:
-        multi_points = min(12, 3 * (len(write_ops_sorted) - 1))
-        score += multi_points
-        add_factor(
-            "FAC_MULTI_WRITE_OPS",
-            multi_points,
-            "Multiple write operation types increase mapping complexity in MyBatis.",
-        )
-
-    if has_try_catch:
-        score += 5
-        add_factor(
-            "FAC_TRY_CATCH",
-            5,
-            "TRY/CATCH blocks require aligned exception handling in Java.",
+        factors.append(
+            FactorItem(
+                id="FAC_MULTI_WRITE_OPS",
+                points=min(12, 3 * (len(write_ops_sorted) - 1)),
+                message="Multiple write operation types increase mapping complexity in MyBatis.",
+            )
         )
-    if uses_at_at_error:
-        score += 8
-        add_factor(
-            "FAC_LEGACY_ERROR",
-            8,
-            "Legacy @@ERROR handling needs refactoring to Java exceptions.",
-        )
-
     if cyclomatic_complexity > 5:
-        complexity_points = min(20, 2 * (cyclomatic_complexity - 5))
-        score += complexity_points
-        add_factor(
-            "FAC_COMPLEXITY",
-            complexity_points,
-            "Higher control flow complexity increases migration effort.",
+        factors.append(
+            FactorItem(
+                id="FAC_COMPLEXITY",
+                points=min(20, 2 * (cyclomatic_complexity - 5)),
+                message="Higher control flow complexity increases migration effort.",
+            )
         )
-
     if table_count > 6:
-        table_points = min(14, 2 * (table_count - 6))
-        score += table_points
-        add_factor(
-            "FAC_MANY_TABLES",
-            table_points,
-            "Large table fan-out increases query mapping complexity.",
+        factors.append(
+            FactorItem(
+                id="FAC_MANY_TABLES",
+                points=min(14, 2 * (table_count - 6)),
+                message="Large table fan-out increases query mapping complexity.",
+            )
         )
-
     if function_call_count > 10:
-        score += 5
-        add_factor(
-            "FAC_MANY_FUNCS",
-            5,
-            "High function call volume can complicate migration logic.",
+        factors.append(
+            FactorItem(
+                id="FAC_MANY_FUNCS",
+                points=5,
+                message="High function call volume can complicate migration logic.",
+            )
         )
 
+    score = BASE_SCORE + sum(factor.points for factor in factors)
     score = max(0, min(100, score))
     difficulty_level = _difficulty_level(score)
     estimated_work_units = min(20, max(0, round(score / 5)))
@@ -300,13 +326,7 @@ def evaluate_mybatis_difficulty(
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _difficulty_level(score: int) -> str:
-    if score <= 24:
-        return "low"
-    if score <= 49:
-        return "medium"
-    if score <= 74:
-        return "high"
-    return "very_high"
+    return DIFFICULTY_LEVELS[bisect.bisect_left(DIFFICULTY_LEVEL_UPPER_BOUNDS, score)]
 
 
 # [함수 설명]
@@ -6,13 +6,11 @@
 # - 연관 모듈: app.api.mcp 라우터에서 호출된다.
 from __future__ import annotations
 
-import logging
 import re
 from typing import Any
 
-from app.services.safe_sql import summarize_sql
-
-logger = logging.getLogger(__name__)
+from app.services.analysis_cache import cached_analysis
+from app.services.safe_sql import strip_comments, strip_comments_and_strings
 
 try:  # pragma: no cover - optional dependency
     from sqlglot import exp, parse
@@ -21,6 +19,33 @@ try:  # pragma: no cover - optional dependency
 except Exception:  # pragma: no cover - optional dependency
     SQLGLOT_AVAILABLE = False
 
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+LEADING_WILDCARD_LIKE_PATTERN = re.compile(r"\bLIKE\s+N?'\s*%", re.IGNORECASE)
+IN_LIST_PATTERN = re.compile(r"\bIN\s*\(([^)]*)\)", re.IGNORECASE | re.DOTALL)
+SELECT_KEYWORD_PATTERN = re.compile(r"\bSELECT\b", re.IGNORECASE)
+UPDATE_STATEMENT_PATTERN = re.compile(r"\bUPDATE\b[\s\S]*?(?:;|$)", re.IGNORECASE)
+DELETE_STATEMENT_PATTERN = re.compile(r"\bDELETE\b[\s\S]*?(?:;|$)", re.IGNORECASE)
+CURSOR_PATTERN = re.compile(r"\bCURSOR\b", re.IGNORECASE)
+WHILE_PATTERN = re.compile(r"\bWHILE\b", re.IGNORECASE)
+DML_KEYWORD_PATTERN = re.compile(r"\b(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+SP_EXECUTESQL_PATTERN = re.compile(r"\bSP_EXECUTESQL\b", re.IGNORECASE)
+EXEC_VARIABLE_PATTERN = re.compile(r"\bEXEC(?:UTE)?\s*\(?\s*@\w+", re.IGNORECASE)
+INTO_KEYWORD_PATTERN = re.compile(r"\bINTO\b", re.IGNORECASE)
+MERGE_PATTERN = re.compile(r"\bMERGE\b", re.IGNORECASE)
+SELECT_STAR_PATTERN = re.compile(r"\bSELECT\s+(?:TOP\s+\d+\s+)?\*", re.IGNORECASE)
+# "WHERE ... 함수(" 형태는 첫 WHERE 뒤에서 함수 패턴만 한 번 찾는다(선행 [\s\S]*? 역추적 제거).
+WHERE_KEYWORD_PATTERN = re.compile(r"\bWHERE\b", re.IGNORECASE)
+FUNCTION_ON_COLUMN_PATTERN = re.compile(r"\b(UPPER|LOWER|CONVERT|CAST)\s*\(", re.IGNORECASE)
+IMPLICIT_CONVERSION_PATTERN = re.compile(r"\b(CAST|CONVERT)\s*\([^\)]*\)\s*[=<>]", re.IGNORECASE)
+WHERE_SEGMENT_PATTERN = re.compile(
+    r"\bWHERE\b([\s\S]*?)(?:\bGROUP\b|\bORDER\b|\bHAVING\b|\bUNION\b|;|$)", re.IGNORECASE
+)
+OR_KEYWORD_PATTERN = re.compile(r"\bOR\b", re.IGNORECASE)
+SCALAR_UDF_PATTERN = re.compile(r"\b(?:\w+\.)?fn_[A-Za-z0-9_]+\s*\(", re.IGNORECASE)
+NOLOCK_PATTERN = re.compile(r"\bNOLOCK\b", re.IGNORECASE)
+TABLE_VARIABLE_PATTERN = re.compile(r"\bDECLARE\s+@\w+\s+TABLE\b", re.IGNORECASE)
+TEMP_TABLE_PATTERN = re.compile(r"\B##?\w+", re.IGNORECASE)
 
 SEVERITY_ORDER = {
     "critical": 0,
@@ -133,26 +158,26 @@ RECOMMENDATION_MAP = {
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+@cached_analysis
 def analyze_performance_risk(
     sql: str,
     dialect: str = "tsql",
     case_insensitive: bool = True,
     max_findings: int = 50,
 ) -> dict[str, Any]:
-    summary = summarize_sql(sql)
-    logger.info(
-        "analyze_performance_risk: sql_len=%s sql_hash=%s",
-        summary["len"],
-        summary["sha256_8"],
-    )
-
-    stripped_sql = _strip_comments(sql)
+    # 주석 제거/문자열 마스킹은 safe_sql의 단일 토큰 패스(캐시)를 사용해 문자열 속 "--"를 보존한다.
+    stripped_sql = strip_comments(sql)
     wildcard_like = _detect_leading_wildcard_like(stripped_sql)
     large_in_list = _detect_large_in_list(stripped_sql)
 
-    masked_sql = _mask_string_literals(stripped_sql)
+    masked_sql = strip_comments_and_strings(sql)
     normalized_sql = _normalize_whitespace(masked_sql)
-    scan_sql = normalized_sql.upper() if case_insensitive else normalized_sql
+    # 대문자 사본은 한 번만 만들어 대소문자 무시 스캔과 ORDER BY 탐지가 함께 사용한다.
+    upper_sql = normalized_sql.upper()
+    scan_sql = upper_sql if case_insensitive else normalized_sql
+    # 필수 리터럴이 없으면 정규식 탐지를 건너뛴다. casefold는 re.IGNORECASE가 같다고 보는 문자를
+    # 모두 접지만 'i'는 예외(U+0130/U+0131)이므로 WHILE 탐지는 게이트하지 않는다.
+    folded_sql = scan_sql.casefold()
 
     findings: list[dict[str, Any]] = []
     errors: list[str] = []
@@ -185,7 +210,7 @@ def analyze_performance_risk(
             }
         )
 
-    if _has_cursor(scan_sql):
+    if "cursor" in folded_sql and _has_cursor(scan_sql):
         add_finding(
             "PRF_CURSOR_RBAR",
             "critical",
@@ -203,7 +228,7 @@ def analyze_performance_risk(
             "Refactor WHILE loops that perform DML into set-based operations.",
         )
 
-    if _has_dynamic_sql(scan_sql):
+    if "exec" in folded_sql and _has_dynamic_sql(scan_sql):
         add_finding(
             "PRF_DYNAMIC_SQL",
             "high",
@@ -269,7 +294,7 @@ def analyze_performance_risk(
             "Review SELECT INTO usage to avoid unexpected logging or tempdb pressure.",
         )
 
-    if _detect_merge(scan_sql):
+    if "merge" in folded_sql and _detect_merge(scan_sql):
         add_finding(
             "PRF_MERGE",
             "high",
@@ -278,7 +303,7 @@ def analyze_performance_risk(
             "Review MERGE usage for concurrency and plan stability impacts.",
         )
 
-    if _detect_select_star(scan_sql):
+    if "*" in folded_sql and _detect_select_star(scan_sql):
         add_finding(
             "PRF_SELECT_STAR",
             "medium",
@@ -332,7 +357,7 @@ def analyze_performance_risk(
             "Consider temp tables or table-valued parameters for large IN lists.",
         )
 
-    if _detect_scalar_udf(scan_sql):
+    if "fn_" in folded_sql and _detect_scalar_udf(scan_sql):
         add_finding(
             "PRF_SCALAR_UDF",
             "medium",
@@ -341,7 +366,7 @@ def analyze_performance_risk(
             "Review scalar UDF usage and consider inline alternatives.",
         )
 
-    if _detect_nolock(scan_sql):
+    if "nolock" in folded_sql and _detect_nolock(scan_sql):
         add_finding(
             "PRF_NOLOCK",
             "low",
@@ -350,7 +375,7 @@ def analyze_performance_risk(
             "Review NOLOCK usage to avoid dirty reads unless explicitly acceptable.",
         )
 
-    if _detect_table_variable(scan_sql):
+    if "declare" in folded_sql and _detect_table_variable(scan_sql):
         add_finding(
             "PRF_TABLE_VARIABLE",
             "low",
@@ -359,7 +384,7 @@ def analyze_performance_risk(
             "Review table variable usage for cardinality estimation impacts.",
         )
 
-    if _detect_temp_table(scan_sql):
+    if "#" in folded_sql and _detect_temp_table(scan_sql):
         add_finding(
             "PRF_TEMP_TABLE",
             "low",
@@ -368,7 +393,7 @@ def analyze_performance_risk(
             "Review temp table usage to avoid unnecessary tempdb pressure.",
         )
 
-    if _detect_order_by_no_top(scan_sql):
+    if _detect_order_by_no_top(upper_sql):
         add_finding(
             "PRF_ORDER_BY_NO_TOP",
             "low",
@@ -526,29 +551,6 @@ def _risk_level(score: int) -> str:
     return "low"
 
 
-# [함수 설명]
-# - 목적: _strip_comments 처리 로직을 수행한다.
-# - 입력: sql: str
-# - 출력: 구조화된 dict 결과를 반환한다.
-# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
-# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
-# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _strip_comments(sql: str) -> str:
-    without_block = re.sub(r"/\*.*?\*/", " ", sql, flags=re.DOTALL)
-    return re.sub(r"--[^\n]*", " ", without_block)
-
-
-# [함수 설명]
-# - 목적: _mask_string_literals 처리 로직을 수행한다.
-# - 입력: sql: str
-# - 출력: 구조화된 dict 결과를 반환한다.
-# - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
-# - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
-# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _mask_string_literals(sql: str) -> str:
-    return re.sub(r"'(?:''|[^'])*'", "''", sql)
-
-
 # [함수 설명]
 # - 목적: _normalize_whitespace 처리 로직을 수행한다.
 # - 입력: sql: str
@@ -557,7 +559,7 @@ def _mask_string_literals(sql: str) -> str:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _normalize_whitespace(sql: str) -> str:
-    return re.sub(r"\s+", " ", sql).strip()
+    return WHITESPACE_PATTERN.sub(" ", sql).strip()
 
 
 # [함수 설명]
@@ -568,7 +570,7 @@ def _normalize_whitespace(sql: str) -> str:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _detect_leading_wildcard_like(sql: str) -> bool:
-    return bool(re.search(r"\bLIKE\s+N?'\s*%", sql, flags=re.IGNORECASE))
+    return bool(LEADING_WILDCARD_LIKE_PATTERN.search(sql))
 
 
 # [함수 설명]
@@ -579,9 +581,9 @@ def _detect_leading_wildcard_like(sql: str) -> bool:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _detect_large_in_list(sql: str, threshold: int = 20) -> bool:
-    for match in re.finditer(r"\bIN\s*\(([^)]*)\)", sql, flags=re.IGNORECASE | re.DOTALL):
+    for match in IN_LIST_PATTERN.finditer(sql):
         content = match.group(1)
-        if re.search(r"\bSELECT\b", content, flags=re.IGNORECASE):
+        if SELECT_KEYWORD_PATTERN.search(content):
             continue
         items = [item.strip() for item in content.split(",") if item.strip()]
         if len(items) >= threshold:
@@ -620,9 +622,9 @@ def _detect_missing_where(
             errors.append(f"parse_error: {exc.__class__.__name__}")
 
     statement_pattern = (
-        r"\bUPDATE\b[\s\S]*?(?:;|$)" if statement_type == "update" else r"\bDELETE\b[\s\S]*?(?:;|$)"
+        UPDATE_STATEMENT_PATTERN if statement_type == "update" else DELETE_STATEMENT_PATTERN
     )
-    for match in re.finditer(statement_pattern, scan_sql, flags=re.IGNORECASE):
+    for match in statement_pattern.finditer(scan_sql):
         statement = match.group(0)
         if " WHERE " not in statement.upper():
             return "possible"
@@ -637,7 +639,7 @@ def _detect_missing_where(
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _has_cursor(scan_sql: str) -> bool:
-    return bool(re.search(r"\bCURSOR\b", scan_sql, flags=re.IGNORECASE))
+    return bool(CURSOR_PATTERN.search(scan_sql))
 
 
 # [함수 설명]
@@ -648,9 +650,9 @@ def _has_cursor(scan_sql: str) -> bool:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _has_loop_dml(scan_sql: str) -> bool:
-    for match in re.finditer(r"\bWHILE\b", scan_sql, flags=re.IGNORECASE):
+    for match in WHILE_PATTERN.finditer(scan_sql):
         window = scan_sql[match.end() : match.end() + 300]
-        if re.search(r"\b(INSERT|UPDATE|DELETE)\b", window, flags=re.IGNORECASE):
+        if DML_KEYWORD_PATTERN.search(window):
             return True
     return False
 
@@ -663,9 +665,23 @@ def _has_loop_dml(scan_sql: str) -> bool:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _has_dynamic_sql(scan_sql: str) -> bool:
-    if re.search(r"\bSP_EXECUTESQL\b", scan_sql, flags=re.IGNORECASE):
+    if SP_EXECUTESQL_PATTERN.search(scan_sql):
         return True
-    return bool(re.search(r"\bEXEC(?:UTE)?\s*\(?\s*@\w+", scan_sql, flags=re.IGNORECASE))
+    return bool(EXEC_VARIABLE_PATTERN.search(scan_sql))
+
+
+# [함수 설명]
+# - 목적: anchor 패턴의 첫 매치 이후에 target 패턴이 나타나는지 확인한다.
+# - 입력: anchor: re.Pattern[str], target: re.Pattern[str], scan_sql: str
+# - 출력: target이 첫 anchor 뒤에 있으면 True를 반환한다.
+# - 에러 처리: anchor가 없으면 False를 반환한다.
+# - 결정론: "anchor[\s\S]*?target" 단일 정규식과 같은 판정을 anchor 수와 무관한 선형 시간에 낸다.
+# - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+def _search_after_first(anchor: re.Pattern[str], target: re.Pattern[str], scan_sql: str) -> bool:
+    anchor_match = anchor.search(scan_sql)
+    if anchor_match is None:
+        return False
+    return target.search(scan_sql, anchor_match.end()) is not None
 
 
 # [함수 설명]
@@ -676,7 +692,7 @@ def _has_dynamic_sql(scan_sql: str) -> bool:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _detect_select_into(scan_sql: str) -> bool:
-    return bool(re.search(r"\bSELECT\b[\s\S]*?\bINTO\b", scan_sql, flags=re.IGNORECASE))
+    return _search_after_first(SELECT_KEYWORD_PATTERN, INTO_KEYWORD_PATTERN, scan_sql)
 
 
 # [함수 설명]
@@ -687,7 +703,7 @@ def _detect_select_into(scan_sql: str) -> bool:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _detect_merge(scan_sql: str) -> bool:
-    return bool(re.search(r"\bMERGE\b", scan_sql, flags=re.IGNORECASE))
+    return bool(MERGE_PATTERN.search(scan_sql))
 
 
 # [함수 설명]
@@ -698,7 +714,7 @@ def _detect_merge(scan_sql: str) -> bool:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _detect_select_star(scan_sql: str) -> bool:
-    return bool(re.search(r"\bSELECT\s+(?:TOP\s+\d+\s+)?\*", scan_sql, flags=re.IGNORECASE))
+    return bool(SELECT_STAR_PATTERN.search(scan_sql))
 
 
 # [함수 설명]
@@ -709,13 +725,7 @@ def _detect_select_star(scan_sql: str) -> bool:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _detect_function_on_column(scan_sql: str) -> bool:
-    return bool(
-        re.search(
-            r"\bWHERE\b[\s\S]*?\b(UPPER|LOWER|CONVERT|CAST)\s*\(",
-            scan_sql,
-            flags=re.IGNORECASE,
-        )
-    )
+    return _search_after_first(WHERE_KEYWORD_PATTERN, FUNCTION_ON_COLUMN_PATTERN, scan_sql)
 
 
 # [함수 설명]
@@ -726,13 +736,7 @@ def _detect_function_on_column(scan_sql: str) -> bool:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _detect_implicit_conversion(scan_sql: str) -> bool:
-    return bool(
-        re.search(
-            r"\bWHERE\b[\s\S]*?\b(CAST|CONVERT)\s*\([^\)]*\)\s*[=<>]",
-            scan_sql,
-            flags=re.IGNORECASE,
-        )
-    )
+    return _search_after_first(WHERE_KEYWORD_PATTERN, IMPLICIT_CONVERSION_PATTERN, scan_sql)
 
 
 # [함수 설명]
@@ -743,13 +747,9 @@ def _detect_implicit_conversion(scan_sql: str) -> bool:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _detect_or_chain(scan_sql: str, threshold: int = 5) -> bool:
-    for match in re.finditer(
-        r"\bWHERE\b([\s\S]*?)(?:\bGROUP\b|\bORDER\b|\bHAVING\b|\bUNION\b|;|$)",
-        scan_sql,
-        flags=re.IGNORECASE,
-    ):
+    for match in WHERE_SEGMENT_PATTERN.finditer(scan_sql):
         segment = match.group(1)
-        if len(re.findall(r"\bOR\b", segment, flags=re.IGNORECASE)) >= threshold:
+        if len(OR_KEYWORD_PATTERN.findall(segment)) >= threshold:
             return True
     return False
 
@@ -762,7 +762,7 @@ def _detect_or_chain(scan_sql: str, threshold: int = 5) -> bool:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _detect_scalar_udf(scan_sql: str) -> bool:
-    return bool(re.search(r"\b(?:\w+\.)?fn_[A-Za-z0-9_]+\s*\(", scan_sql, flags=re.IGNORECASE))
+    return bool(SCALAR_UDF_PATTERN.search(scan_sql))
 
 
 # [함수 설명]
@@ -773,7 +773,7 @@ def _detect_scalar_udf(scan_sql: str) -> bool:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _detect_nolock(scan_sql: str) -> bool:
-    return bool(re.search(r"\bNOLOCK\b", scan_sql, flags=re.IGNORECASE))
+    return bool(NOLOCK_PATTERN.search(scan_sql))
 
 
 # [함수 설명]
@@ -784,7 +784,7 @@ def _detect_nolock(scan_sql: str) -> bool:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _detect_table_variable(scan_sql: str) -> bool:
-    return bool(re.search(r"\bDECLARE\s+@\w+\s+TABLE\b", scan_sql, flags=re.IGNORECASE))
+    return bool(TABLE_VARIABLE_PATTERN.search(scan_sql))
 
 
 # [함수 설명]
@@ -795,19 +795,19 @@ def _detect_table_variable(scan_sql: str) -> bool:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _detect_temp_table(scan_sql: str) -> bool:
-    return bool(re.search(r"\B##?\w+", scan_sql, flags=re.IGNORECASE))
+    return bool(TEMP_TABLE_PATTERN.search(scan_sql))
 
 
 # [함수 설명]
 # - 목적: _detect_order_by_no_top 처리 로직을 수행한다.
-# - 입력: scan_sql: str
+# - 입력: upper_sql: 대문자로 변환된 SQL(문장마다 다시 변환하지 않는다)
 # - 출력: 구조화된 dict 결과를 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _detect_order_by_no_top(scan_sql: str) -> bool:
-    for statement in scan_sql.split(";"):
-        if "ORDER BY" in statement.upper() and " TOP " not in statement.upper():
-            if " OFFSET " not in statement.upper() and " FETCH " not in statement.upper():
+def _detect_order_by_no_top(upper_sql: str) -> bool:
+    for statement in upper_sql.split(";"):
+        if "ORDER BY" in statement and " TOP " not in statement:
+            if " OFFSET " not in statement and " FETCH " not in statement:
                 return True
     return False
@@ -6,11 +6,10 @@
 # - 연관 모듈: app.api.mcp 라우터에서 호출된다.
 from __future__ import annotations
 
-import logging
 import re
 from dataclasses import dataclass
 
-from app.services.safe_sql import summarize_sql
+from app.services.analysis_cache import cached_analysis
 from app.services.tsql_analyzer import (
     analyze_control_flow,
     analyze_data_changes,
@@ -20,7 +19,9 @@ from app.services.tsql_analyzer import (
     analyze_transactions,
 )
 
-logger = logging.getLogger(__name__)
+BLOCK_COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.DOTALL)
+LINE_COMMENT_PATTERN = re.compile(r"--[^\n]*")
+GUARD_CHECK_PATTERN = re.compile(r"\bif\s+exists\b|\bexists\s*\(")
 
 
 # [클래스 설명]
@@ -54,18 +55,12 @@ class Recommendation:
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+@cached_analysis
 def evaluate_reusability(sql: str, dialect: str = "tsql", max_reason_items: int = 20) -> dict:
     """Evaluate reusability/utility candidacy for a single T-SQL SP/FN definition.
 
     Scoring model (deterministic): start at 100, subtract penalties, apply bonus, clamp 0..100.
     """
-    summary = summarize_sql(sql)
-    logger.info(
-        "evaluate_reusability: sql_len=%s sql_hash=%s",
-        summary["len"],
-        summary["sha256_8"],
-    )
-
     references = analyze_references(sql, dialect)
     transactions = analyze_transactions(sql)
     impacts = analyze_migration_impacts(sql)
@@ -395,7 +390,7 @@ def _candidate_type(
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _has_guard_checks(sql: str) -> bool:
     stripped = _strip_sql_comments(sql).lower()
-    return bool(re.search(r"\bif\s+exists\b", stripped) or re.search(r"\bexists\s*\(", stripped))
+    return bool(GUARD_CHECK_PATTERN.search(stripped))
 
 
 # [함수 설명]
@@ -406,8 +401,8 @@ def _has_guard_checks(sql: str) -> bool:
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
 def _strip_sql_comments(sql: str) -> str:
-    no_block = re.sub(r"/\*.*?\*/", " ", sql, flags=re.DOTALL)
-    return re.sub(r"--[^\n]*", " ", no_block)
+    no_block = BLOCK_COMMENT_PATTERN.sub(" ", sql)
+    return LINE_COMMENT_PATTERN.sub(" ", no_block)
 
 
 # [함수 설명]
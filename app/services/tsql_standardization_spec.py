@@ -269,6 +269,7 @@ def build_standardization_spec(
     perf_risk_level = _safe_get(perf_risk, ["summary", "risk_level"], default="unknown")
     difficulty_level = _difficulty_level(mapping_strategy, difficulty)
 
+    # 각 태그는 _build_tags에서 최대 한 번만 추가되므로 중복 제거 없이 정렬만 한다.
     tags = _build_tags(
         has_writes=has_writes,
         uses_transaction=uses_transaction,
@@ -279,7 +280,7 @@ def build_standardization_spec(
         perf_risk_level=perf_risk_level,
         difficulty_level=difficulty_level,
     )
-    tags = sorted(set(tags))
+    tags.sort()
     tags = _cap_list(tags, options.max_items_per_section, errors, "tags")
 
     templates = _build_templates(business_rules)
@@ -6,10 +6,11 @@
 # - 연관 모듈: app.api.mcp 라우터에서 호출된다.
 from __future__ import annotations
 
-import logging
-from dataclasses import dataclass
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Final
 
-from app.services.safe_sql import summarize_sql
+from app.services.analysis_cache import cached_analysis
 from app.services.tsql_analyzer import (
     analyze_control_flow,
     analyze_data_changes,
@@ -18,18 +19,76 @@ from app.services.tsql_analyzer import (
     analyze_transactions,
 )
 
-logger = logging.getLogger(__name__)
-
-
-# [클래스 설명]
-# - 역할: GuidanceItem 데이터 모델/구성 요소을 정의한다.
-# - 사용 위치: API 요청/응답 또는 서비스 내부 구조에서 사용된다.
-# - 핵심 동작: 필드 타입과 검증 규칙을 통해 데이터 구조를 고정한다.
-# - 제약/주의: 동작 로직보다 스키마 표현에 집중하며 결정론적 직렬화를 전제로 한다.
-@dataclass(frozen=True)
-class GuidanceItem:
-    id: str
-    message: str
+# 가이던스 메시지는 모두 정적 문자열이므로 모듈 로드 시 한 번만 만든다.
+# 읽기 전용 MappingProxyType으로 두고 결과에는 _dedupe_guidance에서 만든 dict 사본만 담아,
+# 호출자가 결과를 변경해도(캐시 비활성화 시 포함) 모듈 상태가 오염되지 않는다.
+_SUG_NO_TX_READONLY: Final = MappingProxyType(
+    {
+        "id": "SUG_NO_TX_READONLY",
+        "message": "Do not open a transaction; keep method non-transactional.",
+    }
+)
+_SUG_OPTIONAL_READONLY_TX: Final = MappingProxyType(
+    {
+        "id": "SUG_OPTIONAL_READONLY_TX",
+        "message": "Optionally use @Transactional(readOnly = true) if your platform benefits from it.",
+    }
+)
+_SUG_SERVICE_TX_REQUIRED: Final = MappingProxyType(
+    {
+        "id": "SUG_SERVICE_TX_REQUIRED",
+        "message": "@Transactional(REQUIRED) over the service method.",
+    }
+)
+_SUG_AVOID_DOUBLE_TX: Final = MappingProxyType(
+    {
+        "id": "SUG_AVOID_DOUBLE_TX",
+        "message": "Avoid wrapping SP-managed transactions with Java transactions initially.",
+    }
+)
+_SUG_USE_NOT_SUPPORTED: Final = MappingProxyType(
+    {
+        "id": "SUG_USE_NOT_SUPPORTED",
+        "message": "Consider Propagation.NOT_SUPPORTED when calling SP that manages its own "
+        "transaction.",
+    }
+)
+_SUG_MATCH_ISOLATION: Final = MappingProxyType(
+    {
+        "id": "SUG_MATCH_ISOLATION",
+        "message": "Match SQL isolation level in Spring or keep it in DB at first.",
+    }
+)
+_SUG_XACT_ABORT_ALIGN: Final = MappingProxyType(
+    {
+        "id": "SUG_XACT_ABORT_ALIGN",
+        "message": "Ensure thrown exceptions trigger rollback to align with XACT_ABORT.",
+    }
+)
+_SUG_ROLLBACK_ON_EXCEPTION: Final = MappingProxyType(
+    {
+        "id": "SUG_ROLLBACK_ON_EXCEPTION",
+        "message": "Configure rollback on exceptions to mirror DB rollback behavior.",
+    }
+)
+_ANTI_NESTED_TX: Final = MappingProxyType(
+    {
+        "id": "ANTI_NESTED_TX",
+        "message": "Avoid nested/overlapping Java+TSQL transactions without clear ownership.",
+    }
+)
+_ANTI_PARTIAL_TX: Final = MappingProxyType(
+    {
+        "id": "ANTI_PARTIAL_TX",
+        "message": "Do not split writes into separate transactions if atomicity is required.",
+    }
+)
+_ANTI_SWALLOW_ERRORS: Final = MappingProxyType(
+    {
+        "id": "ANTI_SWALLOW_ERRORS",
+        "message": "Do not swallow RAISERROR/THROW; map to exceptions and rollback.",
+    }
+)
 
 
 # [함수 설명]
@@ -39,6 +98,7 @@ class GuidanceItem:
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
+@cached_analysis
 def recommend_transaction_boundary(
     sql: str,
     obj_type: str,
@@ -55,13 +115,6 @@ def recommend_transaction_boundary(
     - When SQL manages transactions, use hybrid guidance and avoid double-transactioning.
     - Confidence decreases with SQL-managed transactions, complexity, and rewrite risks.
     """
-    summary = summarize_sql(sql)
-    logger.info(
-        "recommend_transaction_boundary: sql_len=%s sql_hash=%s",
-        summary["len"],
-        summary["sha256_8"],
-    )
-
     transactions = analyze_transactions(sql)
     data_changes = analyze_data_changes(sql, dialect)
     error_handling = analyze_error_handling(sql)
@@ -97,8 +150,8 @@ def recommend_transaction_boundary(
     confidence = 0.75 if has_writes else 0.85
     summary_isolation = None
 
-    suggestions: list[GuidanceItem] = []
-    anti_patterns: list[GuidanceItem] = []
+    suggestions: list[Mapping[str, str]] = []
+    anti_patterns: list[Mapping[str, str]] = []
     notes: list[str] = []
 
     if not has_writes:
@@ -106,94 +159,36 @@ def recommend_transaction_boundary(
         transactional = False
         propagation = "SUPPORTS"
         read_only = True
-        suggestions.extend(
-            [
-                GuidanceItem(
-                    "SUG_NO_TX_READONLY",
-                    "Do not open a transaction; keep method non-transactional.",
-                ),
-                GuidanceItem(
-                    "SUG_OPTIONAL_READONLY_TX",
-                    "Optionally use @Transactional(readOnly = true) if your platform benefits from it.",
-                ),
-            ]
-        )
+        suggestions.extend([_SUG_NO_TX_READONLY, _SUG_OPTIONAL_READONLY_TX])
         notes.append("Read-only access can omit @Transactional by default.")
     elif not uses_transaction_in_sql:
-        suggestions.append(
-            GuidanceItem(
-                "SUG_SERVICE_TX_REQUIRED",
-                "@Transactional(REQUIRED) over the service method.",
-            )
-        )
+        suggestions.append(_SUG_SERVICE_TX_REQUIRED)
         notes.append("Keep transaction scope minimal but spanning consistent write set.")
 
     if uses_transaction_in_sql and has_writes:
         recommended_boundary = "hybrid"
         rollback_in_catch = bool(has_try_catch and transactions["rollback_count"] > 0)
         propagation = "NOT_SUPPORTED" if rollback_in_catch else "REQUIRES_NEW"
-        suggestions.extend(
-            [
-                GuidanceItem(
-                    "SUG_AVOID_DOUBLE_TX",
-                    "Avoid wrapping SP-managed transactions with Java transactions initially.",
-                ),
-                GuidanceItem(
-                    "SUG_USE_NOT_SUPPORTED",
-                    "Consider Propagation.NOT_SUPPORTED when calling SP that manages its own "
-                    "transaction.",
-                ),
-            ]
-        )
-        anti_patterns.append(
-            GuidanceItem(
-                "ANTI_NESTED_TX",
-                "Avoid nested/overlapping Java+TSQL transactions without clear ownership.",
-            )
-        )
+        suggestions.extend([_SUG_AVOID_DOUBLE_TX, _SUG_USE_NOT_SUPPORTED])
+        anti_patterns.append(_ANTI_NESTED_TX)
         notes.append("Favor SP-owned transaction scope until refactor is complete.")
 
     if isolation_level_in_sql:
         summary_isolation = _normalize_isolation_level(isolation_level_in_sql)
-        suggestions.append(
-            GuidanceItem(
-                "SUG_MATCH_ISOLATION",
-                "Match SQL isolation level in Spring or keep it in DB at first.",
-            )
-        )
+        suggestions.append(_SUG_MATCH_ISOLATION)
 
     if xact_abort == "ON":
-        suggestions.append(
-            GuidanceItem(
-                "SUG_XACT_ABORT_ALIGN",
-                "Ensure thrown exceptions trigger rollback to align with XACT_ABORT.",
-            )
-        )
+        suggestions.append(_SUG_XACT_ABORT_ALIGN)
 
     if error_handling.get("uses_throw") or error_handling.get("uses_raiserror"):
-        suggestions.append(
-            GuidanceItem(
-                "SUG_ROLLBACK_ON_EXCEPTION",
-                "Configure rollback on exceptions to mirror DB rollback behavior.",
-            )
-        )
+        suggestions.append(_SUG_ROLLBACK_ON_EXCEPTION)
 
     if complexity >= 12 or has_dynamic_sql or has_cursor or uses_temp_objects:
-        anti_patterns.append(
-            GuidanceItem(
-                "ANTI_PARTIAL_TX",
-                "Do not split writes into separate transactions if atomicity is required.",
-            )
-        )
+        anti_patterns.append(_ANTI_PARTIAL_TX)
         notes.append("Complex rewrites benefit from narrower, well-owned boundaries.")
 
     if error_signaling:
-        anti_patterns.append(
-            GuidanceItem(
-                "ANTI_SWALLOW_ERRORS",
-                "Do not swallow RAISERROR/THROW; map to exceptions and rollback.",
-            )
-        )
+        anti_patterns.append(_ANTI_SWALLOW_ERRORS)
 
     if complexity > 8:
         confidence -= 0.05
@@ -204,8 +199,8 @@ def recommend_transaction_boundary(
 
     confidence = _clamp(confidence, 0.5, 0.9)
 
-    suggestions_payload = _normalize_guidance(suggestions)
-    anti_patterns_payload = _normalize_guidance(anti_patterns)
+    suggestions_payload = _dedupe_guidance(suggestions)
+    anti_patterns_payload = _dedupe_guidance(anti_patterns)
     notes_payload = list(notes)
     (
         suggestions_payload,
@@ -310,22 +305,17 @@ def _normalize_isolation_level(value: str) -> str:
 
 
 # [함수 설명]
-# - 목적: _normalize_guidance 처리 로직을 수행한다.
-# - 입력: items: list[GuidanceItem]
+# - 목적: _dedupe_guidance 처리 로직을 수행한다.
+# - 입력: items: list[Mapping[str, str]]
 # - 출력: 구조화된 dict 결과를 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _normalize_guidance(items: list[GuidanceItem]) -> list[dict[str, str]]:
-    by_id: dict[str, GuidanceItem] = {}
-    for item in items:
-        if item.id in by_id:
-            continue
-        by_id[item.id] = item
-    return [
-        {"id": item.id, "message": item.message}
-        for item in sorted(by_id.values(), key=lambda item: item.id)
-    ]
+# - 복사: 중복 제거 후 남은 항목만 dict로 복사한다. MappingProxyType은 copy.deepcopy가 지원하지
+#   않아(TypeError) 분석 캐시의 깊은 복사에 맡길 수 없고, 캐시 비활성화 시에는 이 사본이 유일한 복사다.
+def _dedupe_guidance(items: list[Mapping[str, str]]) -> list[dict[str, str]]:
+    by_id = {item["id"]: item for item in items}
+    return [dict(by_id[item_id]) for item_id in sorted(by_id)]
 
 
 # [함수 설명]
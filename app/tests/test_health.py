@@ -1,23 +0,0 @@
-# [파일 설명]
-# - 목적: API 및 서비스의 기대 동작을 자동으로 검증한다.
-# - 제공 기능: 클라이언트 호출과 응답 구조에 대한 단언을 포함한다.
-# - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
-# - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
-# - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-
-# [함수 설명]
-# - 목적: health 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
-# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
-# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
-# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
-# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_health() -> None:
-    client = TestClient(app)
-    r = client.get("/health")
-    assert r.status_code == 200
-    assert r.json()["status"] == "ok"
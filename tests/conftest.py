@@ -7,8 +7,147 @@
 from __future__ import annotations
 
 import sys
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
 from pathlib import Path
+from typing import Any
+
+import pytest
+import sqlglot
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.services.analysis_cache import clear_analysis_caches  # noqa: E402
+from app.services.safe_sql import ANALYSIS_CACHE_ENV, clear_scan_caches  # noqa: E402
+from app.services.tsql_analyzer import analyze_data_changes  # noqa: E402
+from app.services.tsql_db_dependency import analyze_db_dependency  # noqa: E402
+from app.services.tsql_mybatis_difficulty import evaluate_mybatis_difficulty  # noqa: E402
+from app.services.tsql_performance_risk import analyze_performance_risk  # noqa: E402
+from app.services.tsql_tx_boundary import recommend_transaction_boundary  # noqa: E402
+from tests.helpers import json_of  # noqa: E402
+
+WARMUP_SQL = "SELECT 1"
+
+
+# [함수 설명]
+# - 목적: sqlglot tsql 방언과 분석 서비스의 초기화 비용을 워커 세션 시작 시 한 번만 지불한다.
+# - 입력: 없음
+# - 출력: 없음
+# - 에러 처리: 실패 시 pytest가 fixture 오류를 보고한다.
+# - 결정론: 서비스 내부의 analyze_* 호출이 캐시를 채우므로 워밍업 뒤 분석/스캔 캐시를 모두 비운다.
+#   따라서 테스트는 항상 빈 캐시에서 시작한다.
+# - 보안: 고정된 SELECT 1만 사용한다.
+@pytest.fixture(scope="session", autouse=True)
+def warmup_analyzers() -> None:
+    sqlglot.parse_one(WARMUP_SQL, read="tsql")
+    analyze_data_changes.__wrapped__(WARMUP_SQL, "tsql")
+    evaluate_mybatis_difficulty.__wrapped__(WARMUP_SQL, "procedure")
+    recommend_transaction_boundary.__wrapped__(WARMUP_SQL, "procedure")
+    analyze_db_dependency.__wrapped__(WARMUP_SQL)
+    analyze_performance_risk.__wrapped__(WARMUP_SQL)
+    clear_analysis_caches()
+    clear_scan_caches()
+
+
+# [함수 설명]
+# - 목적: 테스트 동안 분석 캐시를 꺼서 매 호출이 실제로 다시 계산되도록 한다.
+# - 입력: monkeypatch
+# - 출력: 없음
+# - 에러 처리: 테스트 종료 시 monkeypatch가 환경 변수를 원래대로 되돌린다.
+# - 결정론: 결정론 테스트가 캐시 사본끼리 비교하는 자기 비교가 되지 않게 한다.
+# - 보안: 민감 정보를 다루지 않는다.
+@pytest.fixture
+def analysis_cache_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(ANALYSIS_CACHE_ENV, "0")
+
+
+# [함수 설명]
+# - 목적: 세션 전체에서 공유하는 TestClient를 제공한다.
+# - 입력: 없음
+# - 출력: lifespan이 시작된 TestClient를 반환한다.
+# - 에러 처리: 실패 시 pytest가 fixture 오류를 보고한다.
+# - 결정론: 엔드포인트가 상태를 변경하지 않으므로 공유해도 결과가 동일하다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+# [함수 설명]
+# - 목적: evidence 검색 테스트가 공유하는 표준 문서 디렉터리를 세션당 한 번 만든다.
+# - 입력: tmp_path_factory
+# - 출력: MyBatis 동적 SQL/트랜잭션 경계 문서가 들어 있는 디렉터리 경로를 반환한다.
+# - 에러 처리: 실패 시 pytest가 fixture 오류를 보고한다.
+# - 결정론: 테스트는 읽기만 하므로 공유해도 결과가 같다(내용을 바꾸는 테스트는 tmp_path를 쓴다).
+# - 보안: 고정된 문서 텍스트만 사용한다.
+@pytest.fixture(scope="session")
+def evidence_docs_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    docs_dir = tmp_path_factory.mktemp("docs")
+    (docs_dir / "mybatis_dynamic_sql.md").write_text(
+        "# MyBatis Dynamic SQL Standard\n\n"
+        "Prefer dynamic_sql handling with <if>/<choose>/<foreach> tags to avoid concatenation.\n"
+        "Use mybatis tags to keep SQL readable.\n",
+        encoding="utf-8",
+    )
+    (docs_dir / "transactions.md").write_text(
+        "# Transaction Boundaries\n\n"
+        "Define @Transactional at the service layer and keep boundaries consistent.\n",
+        encoding="utf-8",
+    )
+    return docs_dir
+
+
+# [함수 설명]
+# - 목적: 세션 범위 async 픽스처가 사용할 anyio 백엔드를 asyncio로 고정한다.
+# - 입력: 없음
+# - 출력: 백엔드 이름을 반환한다.
+# - 에러 처리: 없음
+# - 결정론: 항상 동일한 백엔드를 사용한다.
+# - 보안: 민감 정보를 다루지 않는다.
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+# [함수 설명]
+# - 목적: 스레드 전환 없이 ASGI 앱을 직접 호출하는 AsyncClient를 세션 동안 공유한다.
+# - 입력: 없음
+# - 출력: ASGITransport 기반 AsyncClient를 반환한다.
+# - 에러 처리: 실패 시 pytest가 fixture 오류를 보고한다.
+# - 결정론: 엔드포인트가 상태를 변경하지 않으므로 공유해도 결과가 동일하다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.fixture(scope="session")
+async def async_client() -> AsyncIterator[AsyncClient]:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as test_client:
+        yield test_client
+
+
+# [함수 설명]
+# - 목적: /mcp/analyze 응답을 (sql, dialect) 단위로 세션 동안 재사용한다.
+# - 입력: async_client 픽스처
+# - 출력: (status_code, 응답 JSON) 튜플을 반환하는 async 호출 함수를 제공한다.
+# - 에러 처리: 실패 시 pytest가 fixture 오류를 보고한다.
+# - 결정론: 분석 결과가 입력에만 의존하므로 동일 입력의 캐시 재사용이 안전하다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.fixture(scope="session")
+def analyze(
+    async_client: AsyncClient,
+) -> Callable[[str, str], Awaitable[tuple[int, dict[str, Any]]]]:
+    cache: dict[tuple[str, str], tuple[int, dict[str, Any]]] = {}
+
+    async def _analyze(sql: str, dialect: str = "tsql") -> tuple[int, dict[str, Any]]:
+        key = (sql, dialect)
+        if key not in cache:
+            response = await async_client.post(
+                "/mcp/analyze", json={"sql": sql, "dialect": dialect}
+            )
+            cache[key] = (response.status_code, json_of(response))
+        return cache[key]
+
+    return _analyze
@@ -0,0 +1,62 @@
+# [파일 설명]
+# - 목적: 여러 테스트 모듈이 공유하는 응답 디코딩/비교 도우미를 제공한다.
+# - 제공 기능: json_of, assert_json_eq, ids_of, case_values 함수를 포함한다.
+# - 입력/출력: httpx 응답이나 응답 항목 목록을 받아 디코딩 값/집합을 반환하거나 단언한다.
+# - 주의 사항: conftest는 모듈로 import하지 않으므로 공유 함수는 이 모듈에 둔다.
+# - 연관 모듈: tests/conftest.py 및 tests/test_*.py에서 사용된다.
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+import orjson
+from httpx import Response
+
+
+# [함수 설명]
+# - 목적: 응답 본문을 orjson으로 디코딩한다.
+# - 입력: httpx Response
+# - 출력: 디코딩된 JSON 값을 반환한다.
+# - 에러 처리: 본문이 JSON이 아니면 orjson.JSONDecodeError가 발생한다.
+# - 결정론: 동일 본문은 항상 동일한 값으로 디코딩된다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+def json_of(response: Response) -> Any:
+    return orjson.loads(response.content)
+
+
+# [함수 설명]
+# - 목적: 응답 본문 전체가 기대 JSON과 같은지 검증한다.
+# - 입력: httpx Response, 기대 JSON 값
+# - 출력: 없음
+# - 에러 처리: 불일치 시 디코딩 결과와 비교해 pytest가 차이를 보고한다.
+# - 결정론: 키 순서까지 같으면 dict 생성 없이 바이트 비교로 끝낸다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+def assert_json_eq(response: Response, expected: Any) -> None:
+    if response.content == orjson.dumps(expected):
+        return
+    assert json_of(response) == expected
+
+
+# [함수 설명]
+# - 목적: 응답 항목 목록(factors/findings/suggestions 등)의 id 집합을 만든다.
+# - 입력: id 키를 가진 dict 목록
+# - 출력: id 문자열 집합을 반환한다.
+# - 에러 처리: id 키가 없으면 KeyError가 발생해 응답 구조 불일치를 드러낸다.
+# - 결정론: 집합 비교만 하므로 응답 항목 순서와 무관하다.
+# - 보안: 민감 정보를 다루지 않는다.
+def ids_of(items: Iterable[dict[str, Any]]) -> set[str]:
+    return {item["id"] for item in items}
+
+
+# [함수 설명]
+# - 목적: pytest.param CASES 표에서 id로 케이스 값을 찾는다.
+# - 입력: pytest.param 목록, 케이스 id
+# - 출력: 해당 케이스의 values 튜플을 반환한다.
+# - 에러 처리: id가 없으면 KeyError로 표와 테스트의 불일치를 드러낸다.
+# - 결정론: 목록 순서와 무관하게 같은 케이스를 고른다.
+# - 보안: 민감 정보를 다루지 않는다.
+def case_values(cases: Iterable[Any], case_id: str) -> tuple[Any, ...]:
+    for case in cases:
+        if case.id == case_id:
+            return tuple(case.values)
+    raise KeyError(case_id)
@@ -6,8 +6,6 @@
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
 from fastapi.testclient import TestClient
 
-from app.main import app
-
 
 # [함수 설명]
 # - 목적: health returns ok 동작을 검증한다.
@@ -16,9 +14,7 @@ from app.main import app
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_health_returns_ok() -> None:
-    client = TestClient(app)
-
+def test_health_returns_ok(client: TestClient) -> None:
     response = client.get("/health")
 
     assert response.status_code == 200
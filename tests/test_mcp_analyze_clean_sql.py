@@ -0,0 +1,97 @@
+# [파일 설명]
+# - 목적: API 및 서비스의 기대 동작을 자동으로 검증한다.
+# - 제공 기능: 클라이언트 호출과 응답 구조에 대한 단언을 포함한다.
+# - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
+# - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
+# - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+
+AnalyzeCall = Callable[[str, str], Awaitable[tuple[int, dict[str, Any]]]]
+
+_NO_OPERATIONS = {
+    op: {"count": 0, "tables": []}
+    for op in ("insert", "update", "delete", "merge", "truncate", "select_into")
+}
+
+CLEAN_SQL_EXPECTATIONS = [
+    (
+        "data_changes",
+        {
+            "has_writes": False,
+            "operations": _NO_OPERATIONS,
+            "table_operations": [],
+            "signals": [],
+            "notes": [],
+        },
+    ),
+    (
+        "error_handling",
+        {
+            "has_try_catch": False,
+            "try_count": 0,
+            "catch_count": 0,
+            "uses_throw": False,
+            "throw_count": 0,
+            "uses_raiserror": False,
+            "raiserror_count": 0,
+            "uses_at_at_error": False,
+            "at_at_error_count": 0,
+            "uses_error_functions": [],
+            "uses_print": False,
+            "print_count": 0,
+            "uses_return": False,
+            "return_count": 0,
+            "return_values": [],
+            "uses_output_error_params": False,
+            "output_error_params": [],
+            "signals": [],
+        },
+    ),
+    (
+        "transactions",
+        {
+            "uses_transaction": False,
+            "begin_count": 0,
+            "commit_count": 0,
+            "rollback_count": 0,
+            "savepoint_count": 0,
+            "has_try_catch": False,
+            "xact_abort": None,
+            "isolation_level": None,
+        },
+    ),
+    (
+        "migration_impacts",
+        {
+            "has_impact": False,
+            "items": [],
+        },
+    ),
+]
+
+
+# [함수 설명]
+# - 목적: SELECT 1 단일 응답으로 data_changes/error_handling/transactions/impacts 섹션을 검증한다.
+# - 입력: 섹션 이름과 기대 필드 값을 파라미터로 받는다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.parametrize(
+    "section, expectations",
+    CLEAN_SQL_EXPECTATIONS,
+    ids=[section for section, _ in CLEAN_SQL_EXPECTATIONS],
+)
+@pytest.mark.anyio
+async def test_mcp_analyze_clean_sql(
+    analyze: AnalyzeCall, section: str, expectations: dict[str, Any]
+) -> None:
+    status, data = await analyze("SELECT 1", "tsql")
+
+    assert status == 200
+    payload = data[section]
+    for key, expected in expectations.items():
+        assert payload[key] == expected, key
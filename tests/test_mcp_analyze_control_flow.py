@@ -4,9 +4,33 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
-from fastapi.testclient import TestClient
+from typing import Final
 
-from app.main import app
+from app.services.tsql_analyzer import analyze_control_flow
+
+CONTROL_FLOW_COMPLEX_SQL: Final[str] = """
+    IF @flag = 1
+    BEGIN
+        SELECT 1;
+    END
+    ELSE
+    BEGIN
+        SELECT 2;
+    END
+    WHILE @i < 10
+    BEGIN
+        SET @i = @i + 1;
+    END
+    BEGIN TRY
+        RETURN;
+    END TRY
+    BEGIN CATCH
+        RETURN;
+    END CATCH
+    """
+
+_TERMINAL_NODE_TYPES = frozenset({"start", "end"})
+_EXPECTED_NODE_TYPES = frozenset({"start", "if", "while", "try", "catch", "end"})
 
 
 # [함수 설명]
@@ -17,17 +41,7 @@ from app.main import app
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
 def test_mcp_analyze_control_flow_simple() -> None:
-    client = TestClient(app)
-    payload = {
-        "sql": "SELECT 1",
-        "dialect": "tsql",
-    }
-
-    response = client.post("/mcp/analyze", json=payload)
-
-    assert response.status_code == 200
-    data = response.json()
-    control_flow = data["control_flow"]
+    control_flow = analyze_control_flow("SELECT 1", "tsql")["control_flow"]
     summary = control_flow["summary"]
     assert summary["has_branching"] is False
     assert summary["has_loops"] is False
@@ -37,8 +51,7 @@ def test_mcp_analyze_control_flow_simple() -> None:
     assert summary["loop_count"] == 0
     assert summary["cyclomatic_complexity"] == 1
     node_types = {node["type"] for node in control_flow["graph"]["nodes"]}
-    assert "start" in node_types
-    assert "end" in node_types
+    assert _TERMINAL_NODE_TYPES.issubset(node_types)
 
 
 # [함수 설명]
@@ -49,36 +62,7 @@ def test_mcp_analyze_control_flow_simple() -> None:
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
 def test_mcp_analyze_control_flow_complex() -> None:
-    client = TestClient(app)
-    payload = {
-        "sql": """
-        IF @flag = 1
-        BEGIN
-            SELECT 1;
-        END
-        ELSE
-        BEGIN
-            SELECT 2;
-        END
-        WHILE @i < 10
-        BEGIN
-            SET @i = @i + 1;
-        END
-        BEGIN TRY
-            RETURN;
-        END TRY
-        BEGIN CATCH
-            RETURN;
-        END CATCH
-        """,
-        "dialect": "tsql",
-    }
-
-    response = client.post("/mcp/analyze", json=payload)
-
-    assert response.status_code == 200
-    data = response.json()
-    control_flow = data["control_flow"]
+    control_flow = analyze_control_flow(CONTROL_FLOW_COMPLEX_SQL, "tsql")["control_flow"]
     summary = control_flow["summary"]
     assert summary["has_branching"] is True
     assert summary["has_loops"] is True
@@ -96,4 +80,4 @@ def test_mcp_analyze_control_flow_complex() -> None:
     )
     assert summary["cyclomatic_complexity"] == expected_complexity
     node_types = {node["type"] for node in control_flow["graph"]["nodes"]}
-    assert {"start", "if", "while", "try", "catch", "end"}.issubset(node_types)
+    assert _EXPECTED_NODE_TYPES.issubset(node_types)
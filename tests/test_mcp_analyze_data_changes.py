@@ -4,38 +4,28 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
-from fastapi.testclient import TestClient
+import logging
+from typing import Final
+
+import pytest
 
-from app.main import app
 from app.services.tsql_analyzer import analyze_data_changes
 
+MIXED_DML_SQL: Final[str] = """
+    INSERT INTO dbo.A (Id) OUTPUT INSERTED.Id VALUES (1);
+    UPDATE dbo.B SET Name = 'x';
+    DELETE FROM dbo.C OUTPUT DELETED.Id WHERE Id = 1;
+    MERGE INTO dbo.D AS target
+    USING dbo.Source AS src ON target.Id = src.Id
+    WHEN MATCHED THEN UPDATE SET target.Name = src.Name;
+    TRUNCATE TABLE dbo.E;
+    SELECT Id INTO dbo.F FROM dbo.G;
+    """
 
-# [함수 설명]
-# - 목적: mcp analyze data changes read only 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
-# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
-# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
-# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
-# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mcp_analyze_data_changes_read_only() -> None:
-    client = TestClient(app)
-    payload = {
-        "sql": "SELECT 1",
-        "dialect": "tsql",
-    }
-
-    response = client.post("/mcp/analyze", json=payload)
-
-    assert response.status_code == 200
-    data = response.json()
-    data_changes = data["data_changes"]
-    assert data_changes["has_writes"] is False
-    for op in data_changes["operations"].values():
-        assert op["count"] == 0
-        assert op["tables"] == []
-    assert data_changes["table_operations"] == []
-    assert data_changes["signals"] == []
-    assert data_changes["notes"] == []
+_EXPECTED_DML_SIGNALS = frozenset(
+    {"INSERT", "UPDATE", "DELETE", "MERGE", "TRUNCATE", "SELECT INTO"}
+)
+_EXPECTED_OUTPUT_SIGNALS = frozenset({"OUTPUT", "INSERTED", "DELETED"})
 
 
 # [함수 설명]
@@ -46,26 +36,7 @@ def test_mcp_analyze_data_changes_read_only() -> None:
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
 def test_mcp_analyze_data_changes_mixed_dml() -> None:
-    client = TestClient(app)
-    payload = {
-        "sql": """
-        INSERT INTO dbo.A (Id) OUTPUT INSERTED.Id VALUES (1);
-        UPDATE dbo.B SET Name = 'x';
-        DELETE FROM dbo.C OUTPUT DELETED.Id WHERE Id = 1;
-        MERGE INTO dbo.D AS target
-        USING dbo.Source AS src ON target.Id = src.Id
-        WHEN MATCHED THEN UPDATE SET target.Name = src.Name;
-        TRUNCATE TABLE dbo.E;
-        SELECT Id INTO dbo.F FROM dbo.G;
-        """,
-        "dialect": "tsql",
-    }
-
-    response = client.post("/mcp/analyze", json=payload)
-
-    assert response.status_code == 200
-    data = response.json()
-    data_changes = data["data_changes"]
+    data_changes = analyze_data_changes(MIXED_DML_SQL, "tsql")["data_changes"]
     assert data_changes["has_writes"] is True
 
     operations = data_changes["operations"]
@@ -91,8 +62,8 @@ def test_mcp_analyze_data_changes_mixed_dml() -> None:
     assert table_ops["DBO.F"] == {"select_into"}
 
     signals = set(data_changes["signals"])
-    assert {"INSERT", "UPDATE", "DELETE", "MERGE", "TRUNCATE", "SELECT INTO"}.issubset(signals)
-    assert {"OUTPUT", "INSERTED", "DELETED"}.issubset(signals)
+    assert _EXPECTED_DML_SIGNALS.issubset(signals)
+    assert _EXPECTED_OUTPUT_SIGNALS.issubset(signals)
 
 
 # [함수 설명]
@@ -109,3 +80,39 @@ def test_data_changes_fallback_regex() -> None:
     assert data_changes["has_writes"] is True
     assert data_changes["operations"]["update"]["count"] == 1
     assert data_changes["operations"]["update"]["tables"] == ["DBO.B"]
+
+
+# [함수 설명]
+# - 목적: 캐시된 분석 결과가 호출자 변경으로 오염되지 않는지 검증한다.
+# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+def test_data_changes_cached_result_is_isolated() -> None:
+    first = analyze_data_changes("UPDATE dbo.B SET", "tsql")
+    first["data_changes"]["operations"]["update"]["tables"].append("DBO.MUTATED")
+
+    second = analyze_data_changes("UPDATE dbo.B SET", "tsql")
+
+    assert second["data_changes"]["operations"]["update"]["tables"] == ["DBO.B"]
+
+
+# [함수 설명]
+# - 목적: 캐시 적중 호출에도 SQL 요약 로그가 남는지 검증한다.
+# - 입력: pytest caplog 픽스처와 고정 SQL을 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 보안: 로그에 원문 SQL이 포함되지 않는지 함께 확인한다.
+def test_data_changes_logs_summary_on_cache_hit(caplog: pytest.LogCaptureFixture) -> None:
+    sql = "UPDATE dbo.LogHit SET flag = 1"
+    analyze_data_changes(sql, "tsql")
+
+    with caplog.at_level(logging.INFO, logger="app.services.tsql_analyzer"):
+        analyze_data_changes(sql, "tsql")
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 1
+    assert messages[0].startswith("analyze_data_changes: sql_len=30 sql_hash=")
+    assert "dbo.LogHit" not in messages[0]
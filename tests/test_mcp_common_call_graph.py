@@ -4,198 +4,195 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
-from fastapi.testclient import TestClient
+from collections.abc import Awaitable, Callable
+from typing import Any
 
-from app.main import app
+import pytest
+from httpx import AsyncClient
 
+from tests.helpers import json_of
 
-# [함수 설명]
-# - 목적: call graph simple corpus 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
-# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
-# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
-# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
-# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_call_graph_simple_corpus() -> None:
-    client = TestClient(app)
-
-    response = client.post(
-        "/mcp/common/call-graph",
-        json={
-            "objects": [
-                {
-                    "name": "dbo.usp_A",
-                    "type": "procedure",
-                    "sql": "CREATE PROCEDURE dbo.usp_A AS EXEC dbo.usp_B;",
-                },
-                {
-                    "name": "dbo.usp_B",
-                    "type": "procedure",
-                    "sql": "CREATE PROCEDURE dbo.usp_B AS SELECT dbo.fn_C(1);",
-                },
-                {
-                    "name": "dbo.fn_C",
-                    "type": "function",
-                    "sql": "CREATE FUNCTION dbo.fn_C() RETURNS INT AS BEGIN RETURN 1; END",
-                },
-            ]
+CORPORA: dict[str, list[dict[str, str]]] = {
+    "simple": [
+        {
+            "name": "dbo.usp_A",
+            "type": "procedure",
+            "sql": "CREATE PROCEDURE dbo.usp_A AS EXEC dbo.usp_B;",
+        },
+        {
+            "name": "dbo.usp_B",
+            "type": "procedure",
+            "sql": "CREATE PROCEDURE dbo.usp_B AS SELECT dbo.fn_C(1);",
+        },
+        {
+            "name": "dbo.fn_C",
+            "type": "function",
+            "sql": "CREATE FUNCTION dbo.fn_C() RETURNS INT AS BEGIN RETURN 1; END",
+        },
+    ],
+    "comments_and_strings": [
+        {
+            "name": "dbo.usp_A",
+            "type": "procedure",
+            "sql": """
+            CREATE PROCEDURE dbo.usp_A AS
+            BEGIN
+                EXEC dbo.usp_B;
+                -- EXEC dbo.usp_B
+                SELECT 'EXEC dbo.usp_B';
+            END
+            """,
+        },
+        {
+            "name": "dbo.usp_B",
+            "type": "procedure",
+            "sql": "CREATE PROCEDURE dbo.usp_B AS SELECT 1;",
+        },
+    ],
+    "dynamic_exec": [
+        {
+            "name": "dbo.usp_A",
+            "type": "procedure",
+            "sql": """
+            CREATE PROCEDURE dbo.usp_A AS
+            BEGIN
+                EXEC(@sql);
+                EXEC sp_executesql @sql;
+            END
+            """,
+        },
+        {
+            "name": "dbo.usp_B",
+            "type": "procedure",
+            "sql": "CREATE PROCEDURE dbo.usp_B AS SELECT 1;",
+        },
+    ],
+    "ambiguous_target": [
+        {
+            "name": "dbo.usp_A",
+            "type": "procedure",
+            "sql": "CREATE PROCEDURE dbo.usp_A AS EXEC usp_X;",
         },
-    )
-
-    assert response.status_code == 200
-    payload = response.json()
-
-    assert payload["summary"]["object_count"] == 3
-    assert payload["summary"]["node_count"] == 3
-    assert payload["summary"]["edge_count"] == 2
-
-    assert payload["graph"]["nodes"] == [
-        {"id": "dbo.fn_c", "name": "dbo.fn_C", "type": "function"},
-        {"id": "dbo.usp_a", "name": "dbo.usp_A", "type": "procedure"},
-        {"id": "dbo.usp_b", "name": "dbo.usp_B", "type": "procedure"},
-    ]
-    assert payload["graph"]["edges"] == [
         {
-            "from": "dbo.usp_a",
-            "to": "dbo.usp_b",
-            "kind": "exec",
-            "count": 1,
-            "signals": ["EXEC"],
+            "name": "dbo.usp_X",
+            "type": "procedure",
+            "sql": "CREATE PROCEDURE dbo.usp_X AS SELECT 1;",
         },
         {
-            "from": "dbo.usp_b",
-            "to": "dbo.fn_c",
-            "kind": "function_call",
-            "count": 1,
-            "signals": ["FUNCTION"],
+            "name": "alt.usp_X",
+            "type": "procedure",
+            "sql": "CREATE PROCEDURE alt.usp_X AS SELECT 2;",
         },
-    ]
+    ],
+}
+
+CASES: list[tuple[str, str, Any]] = [
+    ("simple", "summary.object_count", 3),
+    ("simple", "summary.node_count", 3),
+    ("simple", "summary.edge_count", 2),
+    (
+        "simple",
+        "graph.nodes",
+        [
+            {"id": "dbo.fn_c", "name": "dbo.fn_C", "type": "function"},
+            {"id": "dbo.usp_a", "name": "dbo.usp_A", "type": "procedure"},
+            {"id": "dbo.usp_b", "name": "dbo.usp_B", "type": "procedure"},
+        ],
+    ),
+    (
+        "simple",
+        "graph.edges",
+        [
+            {
+                "from": "dbo.usp_a",
+                "to": "dbo.usp_b",
+                "kind": "exec",
+                "count": 1,
+                "signals": ["EXEC"],
+            },
+            {
+                "from": "dbo.usp_b",
+                "to": "dbo.fn_c",
+                "kind": "function_call",
+                "count": 1,
+                "signals": ["FUNCTION"],
+            },
+        ],
+    ),
+    ("comments_and_strings", "summary.edge_count", 1),
+    ("comments_and_strings", "graph.edges.0.count", 1),
+    ("dynamic_exec", "summary.edge_count", 0),
+    ("dynamic_exec", "graph.edges", []),
+    ("ambiguous_target", "summary.edge_count", 0),
+    (
+        "ambiguous_target",
+        "errors",
+        [
+            {
+                "id": "AMBIGUOUS_TARGET",
+                "message": "Call to usp_x is ambiguous across schemas.",
+                "object": "dbo.usp_A",
+            }
+        ],
+    ),
+]
 
 
 # [함수 설명]
-# - 목적: call graph ignores comments and strings 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
-# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
-# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
-# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 목적: 코퍼스별 call-graph 응답을 모듈 범위에서 한 번만 계산해 재사용한다.
+# - 입력: client 픽스처
+# - 출력: corpus_id를 받아 응답 JSON을 반환하는 호출 함수를 제공한다.
+# - 에러 처리: 응답 코드가 200이 아니면 assertion 실패로 보고한다.
+# - 결정론: 동일 코퍼스는 항상 동일한 응답을 반환하므로 캐시 재사용이 안전하다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_call_graph_ignores_comments_and_strings() -> None:
-    client = TestClient(app)
+@pytest.fixture(scope="module")
+def graph_response(
+    async_client: AsyncClient,
+) -> Callable[[str], Awaitable[dict[str, Any]]]:
+    cache: dict[str, dict[str, Any]] = {}
 
-    response = client.post(
-        "/mcp/common/call-graph",
-        json={
-            "objects": [
-                {
-                    "name": "dbo.usp_A",
-                    "type": "procedure",
-                    "sql": """
-                    CREATE PROCEDURE dbo.usp_A AS
-                    BEGIN
-                        EXEC dbo.usp_B;
-                        -- EXEC dbo.usp_B
-                        SELECT 'EXEC dbo.usp_B';
-                    END
-                    """,
-                },
-                {
-                    "name": "dbo.usp_B",
-                    "type": "procedure",
-                    "sql": "CREATE PROCEDURE dbo.usp_B AS SELECT 1;",
-                },
-            ]
-        },
-    )
-
-    assert response.status_code == 200
-    payload = response.json()
+    async def _response(corpus_id: str) -> dict[str, Any]:
+        if corpus_id not in cache:
+            response = await async_client.post(
+                "/mcp/common/call-graph", json={"objects": CORPORA[corpus_id]}
+            )
+            assert response.status_code == 200
+            cache[corpus_id] = json_of(response)
+        return cache[corpus_id]
 
-    assert payload["summary"]["edge_count"] == 1
-    assert payload["graph"]["edges"][0]["count"] == 1
+    return _response
 
 
 # [함수 설명]
-# - 목적: call graph ignores dynamic exec 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
-# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
-# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
-# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
-# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_call_graph_ignores_dynamic_exec() -> None:
-    client = TestClient(app)
-
-    response = client.post(
-        "/mcp/common/call-graph",
-        json={
-            "objects": [
-                {
-                    "name": "dbo.usp_A",
-                    "type": "procedure",
-                    "sql": """
-                    CREATE PROCEDURE dbo.usp_A AS
-                    BEGIN
-                        EXEC(@sql);
-                        EXEC sp_executesql @sql;
-                    END
-                    """,
-                },
-                {
-                    "name": "dbo.usp_B",
-                    "type": "procedure",
-                    "sql": "CREATE PROCEDURE dbo.usp_B AS SELECT 1;",
-                },
-            ]
-        },
-    )
-
-    assert response.status_code == 200
-    payload = response.json()
-
-    assert payload["summary"]["edge_count"] == 0
-    assert payload["graph"]["edges"] == []
+# - 목적: 점(.)으로 구분된 경로로 응답의 하위 값을 조회한다.
+# - 입력: payload: Any, path: str
+# - 출력: 경로에 해당하는 값을 반환한다.
+# - 에러 처리: 경로가 없으면 KeyError/IndexError가 발생한다.
+# - 결정론: 동일 입력으로 항상 동일한 값을 반환한다.
+# - 보안: 민감 정보를 다루지 않는다.
+def _lookup(payload: Any, path: str) -> Any:
+    for part in path.split("."):
+        payload = payload[int(part)] if part.isdigit() else payload[part]
+    return payload
 
 
 # [함수 설명]
-# - 목적: call graph ambiguous target 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: call graph 코퍼스별 요약/그래프/에러 필드를 검증한다.
+# - 입력: 코퍼스 ID, 응답 경로, 기대값을 파라미터로 받는다.
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_call_graph_ambiguous_target() -> None:
-    client = TestClient(app)
-
-    response = client.post(
-        "/mcp/common/call-graph",
-        json={
-            "objects": [
-                {
-                    "name": "dbo.usp_A",
-                    "type": "procedure",
-                    "sql": "CREATE PROCEDURE dbo.usp_A AS EXEC usp_X;",
-                },
-                {
-                    "name": "dbo.usp_X",
-                    "type": "procedure",
-                    "sql": "CREATE PROCEDURE dbo.usp_X AS SELECT 1;",
-                },
-                {
-                    "name": "alt.usp_X",
-                    "type": "procedure",
-                    "sql": "CREATE PROCEDURE alt.usp_X AS SELECT 2;",
-                },
-            ]
-        },
-    )
-
-    assert response.status_code == 200
-    payload = response.json()
-
-    assert payload["summary"]["edge_count"] == 0
-    assert payload["errors"] == [
-        {
-            "id": "AMBIGUOUS_TARGET",
-            "message": "Call to usp_x is ambiguous across schemas.",
-            "object": "dbo.usp_A",
-        }
-    ]
+@pytest.mark.parametrize(
+    "corpus_id, path, expected",
+    CASES,
+    ids=[f"{corpus_id}-{path}" for corpus_id, path, _ in CASES],
+)
+@pytest.mark.anyio
+async def test_call_graph(
+    graph_response: Callable[[str], Awaitable[dict[str, Any]]],
+    corpus_id: str,
+    path: str,
+    expected: Any,
+) -> None:
+    assert _lookup(await graph_response(corpus_id), path) == expected
@@ -4,9 +4,10 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
-from fastapi.testclient import TestClient
+import pytest
+from httpx import AsyncClient
 
-from app.main import app
+from tests.helpers import json_of
 
 
 # [함수 설명]
@@ -16,10 +17,9 @@ from app.main import app
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_callers_no_matches() -> None:
-    client = TestClient(app)
-
-    response = client.post(
+@pytest.mark.anyio
+async def test_callers_no_matches(async_client: AsyncClient) -> None:
+    response = await async_client.post(
         "/mcp/callers",
         json={
             "target": "dbo.usp_T",
@@ -35,7 +35,7 @@ def test_callers_no_matches() -> None:
     )
 
     assert response.status_code == 200
-    payload = response.json()
+    payload = json_of(response)
     assert payload["summary"] == {
         "has_callers": False,
         "caller_count": 0,
@@ -51,10 +51,9 @@ def test_callers_no_matches() -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_callers_multiple_exec_forms() -> None:
-    client = TestClient(app)
-
-    response = client.post(
+@pytest.mark.anyio
+async def test_callers_multiple_exec_forms(async_client: AsyncClient) -> None:
+    response = await async_client.post(
         "/mcp/callers",
         json={
             "target": "dbo.usp_T",
@@ -96,7 +95,7 @@ def test_callers_multiple_exec_forms() -> None:
     )
 
     assert response.status_code == 200
-    payload = response.json()
+    payload = json_of(response)
 
     assert payload["summary"]["caller_count"] == 2
     assert payload["summary"]["total_calls"] == 3
@@ -121,10 +120,9 @@ def test_callers_multiple_exec_forms() -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_callers_function_target() -> None:
-    client = TestClient(app)
-
-    response = client.post(
+@pytest.mark.anyio
+async def test_callers_function_target(async_client: AsyncClient) -> None:
+    response = await async_client.post(
         "/mcp/callers",
         json={
             "target": "dbo.fn_T",
@@ -145,9 +143,38 @@ def test_callers_function_target() -> None:
     )
 
     assert response.status_code == 200
-    payload = response.json()
+    payload = json_of(response)
 
     assert payload["summary"]["has_callers"] is True
     assert payload["summary"]["caller_count"] == 1
     assert payload["summary"]["total_calls"] == 1
     assert payload["callers"][0]["call_kinds"] == ["function_call"]
+
+
+# [함수 설명]
+# - 목적: 문자열 리터럴 내부의 주석 기호가 이후 호출을 가리지 않는지 검증한다.
+# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.anyio
+async def test_callers_comment_marker_inside_string(async_client: AsyncClient) -> None:
+    response = await async_client.post(
+        "/mcp/callers",
+        json={
+            "target": "dbo.usp_T",
+            "objects": [
+                {
+                    "name": "dbo.usp_A",
+                    "type": "procedure",
+                    "sql": "CREATE PROCEDURE dbo.usp_A AS SELECT '-- /* x'; EXEC dbo.usp_T;",
+                }
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    payload = json_of(response)
+    assert payload["summary"]["total_calls"] == 1
+    assert [caller["name"] for caller in payload["callers"]] == ["dbo.usp_A"]
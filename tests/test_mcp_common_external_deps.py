@@ -4,9 +4,10 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
-from fastapi.testclient import TestClient
+import pytest
+from httpx import AsyncClient
 
-from app.main import app
+from tests.helpers import assert_json_eq, json_of
 
 
 # [함수 설명]
@@ -16,10 +17,9 @@ from app.main import app
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_external_deps_none() -> None:
-    client = TestClient(app)
-
-    response = client.post(
+@pytest.mark.anyio
+async def test_external_deps_none(async_client: AsyncClient) -> None:
+    response = await async_client.post(
         "/mcp/external-deps",
         json={
             "name": "dbo.usp_Simple",
@@ -29,24 +29,31 @@ def test_external_deps_none() -> None:
     )
 
     assert response.status_code == 200
-    payload = response.json()
-
-    assert payload["summary"] == {
-        "has_external_deps": False,
-        "linked_server_count": 0,
-        "cross_db_count": 0,
-        "remote_exec_count": 0,
-        "openquery_count": 0,
-        "opendatasource_count": 0,
-    }
-    assert payload["external_dependencies"] == {
-        "linked_servers": [],
-        "cross_database": [],
-        "remote_exec": [],
-        "openquery": [],
-        "opendatasource": [],
-        "others": [],
-    }
+    assert_json_eq(
+        response,
+        {
+            "version": "2.2.0",
+            "object": {"name": "dbo.usp_Simple", "type": "procedure"},
+            "summary": {
+                "has_external_deps": False,
+                "linked_server_count": 0,
+                "cross_db_count": 0,
+                "remote_exec_count": 0,
+                "openquery_count": 0,
+                "opendatasource_count": 0,
+            },
+            "external_dependencies": {
+                "linked_servers": [],
+                "cross_database": [],
+                "remote_exec": [],
+                "openquery": [],
+                "opendatasource": [],
+                "others": [],
+            },
+            "signals": [],
+            "errors": [],
+        },
+    )
 
 
 # [함수 설명]
@@ -56,9 +63,8 @@ def test_external_deps_none() -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_external_deps_multiple_patterns() -> None:
-    client = TestClient(app)
-
+@pytest.mark.anyio
+async def test_external_deps_multiple_patterns(async_client: AsyncClient) -> None:
     sql = """
     CREATE PROCEDURE dbo.usp_Sample AS
     BEGIN
@@ -69,7 +75,7 @@ def test_external_deps_multiple_patterns() -> None:
     END
     """
 
-    response = client.post(
+    response = await async_client.post(
         "/mcp/external-deps",
         json={
             "name": "dbo.usp_Sample",
@@ -79,7 +85,7 @@ def test_external_deps_multiple_patterns() -> None:
     )
 
     assert response.status_code == 200
-    payload = response.json()
+    payload = json_of(response)
 
     assert payload["summary"]["has_external_deps"] is True
     assert payload["summary"]["linked_server_count"] == 1
@@ -116,9 +122,8 @@ def test_external_deps_multiple_patterns() -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_external_deps_ignore_comments_and_strings() -> None:
-    client = TestClient(app)
-
+@pytest.mark.anyio
+async def test_external_deps_ignore_comments_and_strings(async_client: AsyncClient) -> None:
     sql = """
     CREATE PROCEDURE dbo.usp_Ignore AS
     BEGIN
@@ -127,7 +132,7 @@ def test_external_deps_ignore_comments_and_strings() -> None:
     END
     """
 
-    response = client.post(
+    response = await async_client.post(
         "/mcp/external-deps",
         json={
             "name": "dbo.usp_Ignore",
@@ -137,7 +142,7 @@ def test_external_deps_ignore_comments_and_strings() -> None:
     )
 
     assert response.status_code == 200
-    payload = response.json()
+    payload = json_of(response)
 
     assert payload["summary"]["has_external_deps"] is False
     assert payload["summary"]["linked_server_count"] == 0
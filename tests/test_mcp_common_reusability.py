@@ -4,33 +4,32 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
+import asyncio
+import textwrap
+from collections.abc import Callable
+from typing import Any, Final
+
+import pytest
 from fastapi.testclient import TestClient
+from httpx import AsyncClient
+
+from app.services.tsql_reusability import evaluate_reusability
+from tests.helpers import case_values
 
-from app.main import app
+ENDPOINT: Final[str] = "/mcp/common/reusability"
+DYNAMIC_CURSOR_TXN_WRITE_REASONS: Final[frozenset[str]] = frozenset(
+    {"RSN_DYN_SQL", "RSN_CURSOR", "RSN_TXN", "RSN_WRITES"}
+)
 
 
 # [함수 설명]
-# - 목적: reusability read only lookup 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: 읽기 전용 조회 프로시저가 lookup 후보로 판정되는지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_reusability_read_only_lookup() -> None:
-    client = TestClient(app)
-
-    response = client.post(
-        "/mcp/common/reusability",
-        json={
-            "name": "dbo.usp_ReadOnly",
-            "type": "procedure",
-            "sql": "CREATE PROCEDURE dbo.usp_ReadOnly AS SELECT * FROM dbo.Users;",
-        },
-    )
-
-    assert response.status_code == 200
-    payload = response.json()
-
+def _check_read_only_lookup(payload: dict[str, Any]) -> None:
     summary = payload["summary"]
     assert summary["score"] >= 80
     assert summary["grade"] in {"A", "B"}
@@ -43,60 +42,103 @@ def test_reusability_read_only_lookup() -> None:
 
 
 # [함수 설명]
-# - 목적: reusability dynamic cursor transaction writes 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: 동적 SQL/커서/트랜잭션/쓰기가 섞인 프로시저가 낮은 점수를 받는지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_reusability_dynamic_cursor_transaction_writes() -> None:
-    client = TestClient(app)
+def _check_dynamic_cursor_transaction_writes(payload: dict[str, Any]) -> None:
+    summary = payload["summary"]
+    assert summary["score"] < 50
+    assert summary["grade"] == "D"
+    assert summary["is_candidate"] is False
 
-    response = client.post(
-        "/mcp/common/reusability",
-        json={
+    reason_ids = {reason["id"] for reason in payload["reasons"]}
+    assert DYNAMIC_CURSOR_TXN_WRITE_REASONS <= reason_ids
+
+
+DYNAMIC_CURSOR_TRANSACTION_WRITES_SQL: Final[str] = textwrap.dedent(
+    """
+    CREATE PROCEDURE dbo.usp_Bad AS
+    BEGIN
+        BEGIN TRAN;
+        DECLARE c CURSOR FOR SELECT id FROM dbo.Users;
+        OPEN c;
+        FETCH NEXT FROM c;
+        EXEC sp_executesql N'SELECT 1';
+        INSERT INTO dbo.AuditLog(id) VALUES (1);
+        COMMIT TRAN;
+    END
+    """
+).strip()
+
+
+CASES: Final[list[Any]] = [
+    pytest.param(
+        {
+            "name": "dbo.usp_ReadOnly",
+            "type": "procedure",
+            "sql": "CREATE PROCEDURE dbo.usp_ReadOnly AS SELECT * FROM dbo.Users;",
+        },
+        _check_read_only_lookup,
+        id="read_only_lookup",
+    ),
+    pytest.param(
+        {
             "name": "dbo.usp_Bad",
             "type": "procedure",
-            "sql": """
-            CREATE PROCEDURE dbo.usp_Bad AS
-            BEGIN
-                BEGIN TRAN;
-                DECLARE c CURSOR FOR SELECT id FROM dbo.Users;
-                OPEN c;
-                FETCH NEXT FROM c;
-                EXEC sp_executesql N'SELECT 1';
-                INSERT INTO dbo.AuditLog(id) VALUES (1);
-                COMMIT TRAN;
-            END
-            """,
+            "sql": DYNAMIC_CURSOR_TRANSACTION_WRITES_SQL,
         },
-    )
+        _check_dynamic_cursor_transaction_writes,
+        id="dynamic_cursor_transaction_writes",
+    ),
+]
 
-    assert response.status_code == 200
-    payload = response.json()
+# 엔드포인트 배선 테스트가 쓰는 대표 케이스(결과 목록이 비어 있지 않은 케이스)의 id다.
+ENDPOINT_CASE_ID: Final[str] = "dynamic_cursor_transaction_writes"
 
-    summary = payload["summary"]
-    assert summary["score"] < 50
-    assert summary["grade"] == "D"
-    assert summary["is_candidate"] is False
 
-    reason_ids = {reason["id"] for reason in payload["reasons"]}
-    assert "RSN_DYN_SQL" in reason_ids
-    assert "RSN_CURSOR" in reason_ids
-    assert "RSN_TXN" in reason_ids
-    assert "RSN_WRITES" in reason_ids
+# [함수 설명]
+# - 목적: reusability 케이스별 요약/시그널/사유 필드를 서비스 직접 호출로 검증한다.
+# - 입력: 요청 본문과 검증 함수를 파라미터로 받는다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.parametrize("request_body, check", CASES)
+def test_reusability(
+    request_body: dict[str, Any],
+    check: Callable[[dict[str, Any]], None],
+) -> None:
+    check(evaluate_reusability(request_body["sql"]))
 
 
 # [함수 설명]
-# - 목적: reusability determinism 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: reusability 엔드포인트 배선(요청 검증/응답 직렬화)을 대표 케이스로 검증한다.
+# - 입력: 테스트 클라이언트와 결과 목록이 채워지는 ENDPOINT_CASE_ID 케이스를 사용한다.
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_reusability_determinism() -> None:
-    client = TestClient(app)
+def test_reusability_endpoint(client: TestClient) -> None:
+    request_body, check = case_values(CASES, ENDPOINT_CASE_ID)
+    response = client.post(ENDPOINT, json=request_body)
+
+    assert response.status_code == 200
+    check(response.json())
+
 
+# [함수 설명]
+# - 목적: reusability determinism 동작을 검증한다.
+# - 입력: 분석 캐시를 끈 상태의 async 클라이언트와 고정 입력을 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 캐시를 꺼서 두 요청이 각각 실제로 계산한 결과를 비교한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.anyio
+@pytest.mark.usefixtures("analysis_cache_disabled")
+async def test_reusability_determinism(async_client: AsyncClient) -> None:
     payload = {
         "name": "dbo.usp_Same",
         "type": "procedure",
@@ -104,9 +146,33 @@ def test_reusability_determinism() -> None:
         "options": {"max_reason_items": 10},
     }
 
-    response_first = client.post("/mcp/common/reusability", json=payload)
-    response_second = client.post("/mcp/common/reusability", json=payload)
+    response_first, response_second = await asyncio.gather(
+        async_client.post(ENDPOINT, json=payload),
+        async_client.post(ENDPOINT, json=payload),
+    )
 
     assert response_first.status_code == 200
     assert response_second.status_code == 200
     assert response_first.json() == response_second.json()
+
+
+# [함수 설명]
+# - 목적: 캐시된 reusability 결과가 호출자 변경으로 오염되지 않는지 검증한다.
+# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+def test_reusability_cached_result_is_isolated() -> None:
+    sql = "CREATE PROCEDURE dbo.usp_Same AS SELECT 1;"
+    first = evaluate_reusability(sql)
+    first["summary"]["score"] = -1
+    first["reasons"].clear()
+
+    second = evaluate_reusability(sql)
+
+    assert second["summary"]["score"] == 100
+    assert [reason["id"] for reason in second["reasons"]] == [
+        "RSN_READ_ONLY",
+        "RSN_LOW_COMPLEXITY",
+    ]
@@ -4,66 +4,46 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
+import textwrap
+from collections.abc import Callable
+from typing import Any, Final
+
+import pytest
 from fastapi.testclient import TestClient
 
-from app.main import app
+from app.services.tsql_business_rules import analyze_business_rules
+from tests.helpers import case_values
+
+ENDPOINT: Final[str] = "/mcp/common/rules-template"
+GUARD_TEMPLATE_IDS: Final[frozenset[str]] = frozenset(
+    {"TPL_VALIDATE_REQUIRED_PARAM", "TPL_ERROR_TO_EXCEPTION"}
+)
+EXISTS_TEMPLATE_IDS: Final[frozenset[str]] = frozenset(
+    {"TPL_ENSURE_EXISTS", "TPL_ERROR_TO_EXCEPTION"}
+)
 
 
 # [함수 설명]
-# - 목적: rules template no rules 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: 규칙이 없는 SQL에서 규칙/템플릿 제안이 비어 있는지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_rules_template_no_rules() -> None:
-    client = TestClient(app)
-
-    response = client.post(
-        "/mcp/common/rules-template",
-        json={
-            "name": "dbo.usp_Simple",
-            "type": "procedure",
-            "sql": "CREATE PROCEDURE dbo.usp_Simple AS SELECT * FROM dbo.Users;",
-        },
-    )
-
-    assert response.status_code == 200
-    payload = response.json()
+def _check_no_rules(payload: dict[str, Any]) -> None:
     assert payload["summary"]["has_rules"] is False
     assert payload["summary"]["rule_count"] == 0
     assert payload["summary"]["template_suggestion_count"] == 0
 
 
 # [함수 설명]
-# - 목적: rules template guard throw 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: IS NULL + THROW 가드절이 guard_clause 규칙으로 추출되는지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_rules_template_guard_throw() -> None:
-    client = TestClient(app)
-
-    response = client.post(
-        "/mcp/common/rules-template",
-        json={
-            "name": "dbo.usp_Guard",
-            "type": "procedure",
-            "sql": """
-            CREATE PROCEDURE dbo.usp_Guard @p INT AS
-            BEGIN
-                IF @p IS NULL
-                BEGIN
-                    THROW 50000, 'missing', 1;
-                END
-            END
-            """,
-        },
-    )
-
-    assert response.status_code == 200
-    payload = response.json()
+def _check_guard_throw(payload: dict[str, Any]) -> None:
     assert payload["summary"]["has_rules"] is True
     assert payload["summary"]["rule_count"] == 1
     rule = payload["rules"][0]
@@ -71,78 +51,169 @@ def test_rules_template_guard_throw() -> None:
     assert rule["action"] == "raise_error"
 
     template_ids = {item["template_id"] for item in payload["template_suggestions"]}
-    assert "TPL_VALIDATE_REQUIRED_PARAM" in template_ids
-    assert "TPL_ERROR_TO_EXCEPTION" in template_ids
+    assert GUARD_TEMPLATE_IDS <= template_ids
 
 
 # [함수 설명]
-# - 목적: rules template exists raiserror 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: IF EXISTS + RAISERROR가 exists_check 규칙으로 추출되는지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_rules_template_exists_raiserror() -> None:
-    client = TestClient(app)
-
-    response = client.post(
-        "/mcp/common/rules-template",
-        json={
-            "name": "dbo.usp_Exists",
-            "type": "procedure",
-            "sql": """
-            CREATE PROCEDURE dbo.usp_Exists @id INT AS
-            BEGIN
-                IF EXISTS (SELECT 1 FROM dbo.Users WHERE id = @id)
-                BEGIN
-                    RAISERROR('exists', 16, 1);
-                    RETURN -1;
-                END
-            END
-            """,
-        },
-    )
-
-    assert response.status_code == 200
-    payload = response.json()
+def _check_exists_raiserror(payload: dict[str, Any]) -> None:
     kinds = {rule["kind"] for rule in payload["rules"]}
     assert "exists_check" in kinds
     template_ids = {item["template_id"] for item in payload["template_suggestions"]}
-    assert "TPL_ENSURE_EXISTS" in template_ids
-    assert "TPL_ERROR_TO_EXCEPTION" in template_ids
+    assert EXISTS_TEMPLATE_IDS <= template_ids
 
 
 # [함수 설명]
-# - 목적: rules template ignores comments and strings 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: 주석/문자열 안의 패턴은 무시하고 실제 가드절만 추출되는지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_rules_template_ignores_comments_and_strings() -> None:
-    client = TestClient(app)
+def _check_ignores_comments_and_strings(payload: dict[str, Any]) -> None:
+    assert payload["summary"]["rule_count"] == 1
+    kinds = {rule["kind"] for rule in payload["rules"]}
+    assert kinds == {"guard_clause"}
+
 
-    response = client.post(
-        "/mcp/common/rules-template",
-        json={
+GUARD_THROW_SQL: Final[str] = textwrap.dedent(
+    """
+    CREATE PROCEDURE dbo.usp_Guard @p INT AS
+    BEGIN
+        IF @p IS NULL
+        BEGIN
+            THROW 50000, 'missing', 1;
+        END
+    END
+    """
+).strip()
+
+
+EXISTS_RAISERROR_SQL: Final[str] = textwrap.dedent(
+    """
+    CREATE PROCEDURE dbo.usp_Exists @id INT AS
+    BEGIN
+        IF EXISTS (SELECT 1 FROM dbo.Users WHERE id = @id)
+        BEGIN
+            RAISERROR('exists', 16, 1);
+            RETURN -1;
+        END
+    END
+    """
+).strip()
+
+
+IGNORES_COMMENTS_AND_STRINGS_SQL: Final[str] = textwrap.dedent(
+    """
+    CREATE PROCEDURE dbo.usp_Comments @p INT AS
+    BEGIN
+        -- IF EXISTS (SELECT 1 FROM dbo.Table)
+        SELECT 'IF @p IS NULL THEN THROW' AS Note;
+        IF @p IS NULL
+        BEGIN
+            RETURN 1;
+        END
+    END
+    """
+).strip()
+
+
+QUOTE_INSIDE_COMMENT_SQL: Final[str] = textwrap.dedent(
+    """
+    CREATE PROCEDURE dbo.usp_QuoteInComment @p INT AS
+    BEGIN
+        -- don't skip validation
+        IF @p IS NULL
+        BEGIN
+            THROW 50000, 'missing', 1;
+        END
+    END
+    """
+).strip()
+
+
+CASES: Final[list[Any]] = [
+    pytest.param(
+        {
+            "name": "dbo.usp_Simple",
+            "type": "procedure",
+            "sql": "CREATE PROCEDURE dbo.usp_Simple AS SELECT * FROM dbo.Users;",
+        },
+        _check_no_rules,
+        id="no_rules",
+    ),
+    pytest.param(
+        {
+            "name": "dbo.usp_Guard",
+            "type": "procedure",
+            "sql": GUARD_THROW_SQL,
+        },
+        _check_guard_throw,
+        id="guard_throw",
+    ),
+    pytest.param(
+        {
+            "name": "dbo.usp_Exists",
+            "type": "procedure",
+            "sql": EXISTS_RAISERROR_SQL,
+        },
+        _check_exists_raiserror,
+        id="exists_raiserror",
+    ),
+    pytest.param(
+        {
             "name": "dbo.usp_Comments",
             "type": "procedure",
-            "sql": """
-            CREATE PROCEDURE dbo.usp_Comments @p INT AS
-            BEGIN
-                -- IF EXISTS (SELECT 1 FROM dbo.Table)
-                SELECT 'IF @p IS NULL THEN THROW' AS Note;
-                IF @p IS NULL
-                BEGIN
-                    RETURN 1;
-                END
-            END
-            """,
+            "sql": IGNORES_COMMENTS_AND_STRINGS_SQL,
         },
-    )
+        _check_ignores_comments_and_strings,
+        id="ignores_comments_and_strings",
+    ),
+    pytest.param(
+        {
+            "name": "dbo.usp_QuoteInComment",
+            "type": "procedure",
+            "sql": QUOTE_INSIDE_COMMENT_SQL,
+        },
+        _check_guard_throw,
+        id="quote_inside_comment",
+    ),
+]
+
+# 엔드포인트 배선 테스트가 쓰는 대표 케이스(결과 목록이 비어 있지 않은 케이스)의 id다.
+ENDPOINT_CASE_ID: Final[str] = "guard_throw"
+
+
+# [함수 설명]
+# - 목적: rules-template 케이스별 요약/규칙/템플릿 제안 필드를 서비스 직접 호출로 검증한다.
+# - 입력: 요청 본문과 검증 함수를 파라미터로 받는다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.parametrize("request_body, check", CASES)
+def test_rules_template(
+    request_body: dict[str, Any],
+    check: Callable[[dict[str, Any]], None],
+) -> None:
+    check(analyze_business_rules(request_body["sql"]))
+
+
+# [함수 설명]
+# - 목적: rules-template 엔드포인트 배선(요청 검증/응답 직렬화)을 대표 케이스로 검증한다.
+# - 입력: 테스트 클라이언트와 결과 목록이 채워지는 ENDPOINT_CASE_ID 케이스를 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+def test_rules_template_endpoint(client: TestClient) -> None:
+    request_body, check = case_values(CASES, ENDPOINT_CASE_ID)
+    response = client.post(ENDPOINT, json=request_body)
 
     assert response.status_code == 200
-    payload = response.json()
-    assert payload["summary"]["rule_count"] == 1
-    kinds = {rule["kind"] for rule in payload["rules"]}
-    assert kinds == {"guard_clause"}
+    check(response.json())
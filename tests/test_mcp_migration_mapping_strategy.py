@@ -4,33 +4,29 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
+import asyncio
+import textwrap
+from collections.abc import Callable
+from typing import Any, Final
+
+import pytest
 from fastapi.testclient import TestClient
+from httpx import AsyncClient
+
+from app.services.tsql_mapping_strategy import recommend_mapping_strategy
+from tests.helpers import case_values
 
-from app.main import app
+ENDPOINT: Final[str] = "/mcp/migration/mapping-strategy"
 
 
 # [함수 설명]
-# - 목적: mapping strategy read only low complexity 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: 읽기 전용 저복잡도 SQL이 MyBatis SQL 재작성으로 추천되는지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
-# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mapping_strategy_read_only_low_complexity() -> None:
-    client = TestClient(app)
-
-    response = client.post(
-        "/mcp/migration/mapping-strategy",
-        json={
-            "name": "dbo.usp_ReadOnly",
-            "type": "procedure",
-            "sql": "CREATE PROCEDURE dbo.usp_ReadOnly AS SELECT * FROM dbo.Users;",
-        },
-    )
-
-    assert response.status_code == 200
-    payload = response.json()
-
+# - 보안: 스켈레톤에 원문 테이블명이 노출되지 않는지 확인한다.
+def _check_read_only_low_complexity(payload: dict[str, Any]) -> None:
     summary = payload["summary"]
     assert summary["approach"] == "rewrite_to_mybatis_sql"
     assert summary["difficulty"] == "low"
@@ -42,39 +38,13 @@ def test_mapping_strategy_read_only_low_complexity() -> None:
 
 
 # [함수 설명]
-# - 목적: mapping strategy dynamic cursor temp table 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: 동적 SQL/커서/임시 테이블 SQL이 SP 우선 호출로 추천되는지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mapping_strategy_dynamic_cursor_temp_table() -> None:
-    client = TestClient(app)
-
-    response = client.post(
-        "/mcp/migration/mapping-strategy",
-        json={
-            "name": "dbo.usp_DynamicCursor",
-            "type": "procedure",
-            "sql": """
-            CREATE PROCEDURE dbo.usp_DynamicCursor AS
-            BEGIN
-                DECLARE c CURSOR FOR SELECT id FROM dbo.Users;
-                OPEN c;
-                FETCH NEXT FROM c;
-                CREATE TABLE #tmp(id INT);
-                DECLARE @dyn NVARCHAR(100) = 'SELECT 1';
-                EXEC(@dyn + ' FROM dbo.Users');
-                CLOSE c;
-                DEALLOCATE c;
-            END
-            """,
-        },
-    )
-
-    assert response.status_code == 200
-    payload = response.json()
-
+def _check_dynamic_cursor_temp_table(payload: dict[str, Any]) -> None:
     summary = payload["summary"]
     assert summary["approach"] == "call_sp_first"
     assert summary["difficulty"] in {"high", "very_high"}
@@ -84,49 +54,121 @@ def test_mapping_strategy_dynamic_cursor_temp_table() -> None:
 
 
 # [함수 설명]
-# - 목적: mapping strategy writes with transaction 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: 트랜잭션 내 쓰기 SQL에 서비스 트랜잭션 권고가 포함되는지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mapping_strategy_writes_with_transaction() -> None:
-    client = TestClient(app)
+def _check_writes_with_transaction(payload: dict[str, Any]) -> None:
+    assert payload["summary"]["difficulty"] in {"medium", "high", "very_high"}
+    recommendation_ids = {item["id"] for item in payload["recommendations"]}
+    assert "REC_SERVICE_TXN_AWARE" in recommendation_ids
 
-    response = client.post(
-        "/mcp/migration/mapping-strategy",
-        json={
+
+DYNAMIC_CURSOR_TEMP_TABLE_SQL: Final[str] = textwrap.dedent(
+    """
+    CREATE PROCEDURE dbo.usp_DynamicCursor AS
+    BEGIN
+        DECLARE c CURSOR FOR SELECT id FROM dbo.Users;
+        OPEN c;
+        FETCH NEXT FROM c;
+        CREATE TABLE #tmp(id INT);
+        DECLARE @dyn NVARCHAR(100) = 'SELECT 1';
+        EXEC(@dyn + ' FROM dbo.Users');
+        CLOSE c;
+        DEALLOCATE c;
+    END
+    """
+).strip()
+
+
+WRITES_WITH_TRANSACTION_SQL: Final[str] = textwrap.dedent(
+    """
+    CREATE PROCEDURE dbo.usp_WriteTxn AS
+    BEGIN
+        BEGIN TRAN;
+        INSERT INTO dbo.AuditLog(id) VALUES (1);
+        COMMIT TRAN;
+    END
+    """
+).strip()
+
+
+CASES: Final[list[Any]] = [
+    pytest.param(
+        {
+            "name": "dbo.usp_ReadOnly",
+            "type": "procedure",
+            "sql": "CREATE PROCEDURE dbo.usp_ReadOnly AS SELECT * FROM dbo.Users;",
+        },
+        _check_read_only_low_complexity,
+        id="read_only_low_complexity",
+    ),
+    pytest.param(
+        {
+            "name": "dbo.usp_DynamicCursor",
+            "type": "procedure",
+            "sql": DYNAMIC_CURSOR_TEMP_TABLE_SQL,
+        },
+        _check_dynamic_cursor_temp_table,
+        id="dynamic_cursor_temp_table",
+    ),
+    pytest.param(
+        {
             "name": "dbo.usp_WriteTxn",
             "type": "procedure",
-            "sql": """
-            CREATE PROCEDURE dbo.usp_WriteTxn AS
-            BEGIN
-                BEGIN TRAN;
-                INSERT INTO dbo.AuditLog(id) VALUES (1);
-                COMMIT TRAN;
-            END
-            """,
+            "sql": WRITES_WITH_TRANSACTION_SQL,
         },
-    )
+        _check_writes_with_transaction,
+        id="writes_with_transaction",
+    ),
+]
 
-    assert response.status_code == 200
-    payload = response.json()
+# 엔드포인트 배선 테스트가 쓰는 대표 케이스(결과 목록이 비어 있지 않은 케이스)의 id다.
+ENDPOINT_CASE_ID: Final[str] = "dynamic_cursor_temp_table"
 
-    assert payload["summary"]["difficulty"] in {"medium", "high", "very_high"}
-    recommendation_ids = {item["id"] for item in payload["recommendations"]}
-    assert "REC_SERVICE_TXN_AWARE" in recommendation_ids
+
+# [함수 설명]
+# - 목적: mapping-strategy 케이스별 요약/전략/권고 필드를 서비스 직접 호출로 검증한다.
+# - 입력: 요청 본문과 검증 함수를 파라미터로 받는다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.parametrize("request_body, check", CASES)
+def test_mapping_strategy(
+    request_body: dict[str, Any],
+    check: Callable[[dict[str, Any]], None],
+) -> None:
+    check(recommend_mapping_strategy(request_body["sql"], request_body["type"]))
 
 
 # [함수 설명]
-# - 목적: mapping strategy determinism 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: mapping-strategy 엔드포인트 배선(요청 검증/응답 직렬화)을 대표 케이스로 검증한다.
+# - 입력: 테스트 클라이언트와 결과 목록이 채워지는 ENDPOINT_CASE_ID 케이스를 사용한다.
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mapping_strategy_determinism() -> None:
-    client = TestClient(app)
+def test_mapping_strategy_endpoint(client: TestClient) -> None:
+    request_body, check = case_values(CASES, ENDPOINT_CASE_ID)
+    response = client.post(ENDPOINT, json=request_body)
+
+    assert response.status_code == 200
+    check(response.json())
+
 
+# [함수 설명]
+# - 목적: mapping strategy determinism 동작을 검증한다.
+# - 입력: 분석 캐시를 끈 상태의 async 클라이언트와 고정 입력을 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 캐시를 꺼서 두 요청이 각각 실제로 계산한 결과를 비교한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.anyio
+@pytest.mark.usefixtures("analysis_cache_disabled")
+async def test_mapping_strategy_determinism(async_client: AsyncClient) -> None:
     request_payload = {
         "name": "dbo.usp_Same",
         "type": "procedure",
@@ -134,8 +176,10 @@ def test_mapping_strategy_determinism() -> None:
         "options": {"max_items": 10},
     }
 
-    response_first = client.post("/mcp/migration/mapping-strategy", json=request_payload)
-    response_second = client.post("/mcp/migration/mapping-strategy", json=request_payload)
+    response_first, response_second = await asyncio.gather(
+        async_client.post(ENDPOINT, json=request_payload),
+        async_client.post(ENDPOINT, json=request_payload),
+    )
 
     assert response_first.status_code == 200
     assert response_second.status_code == 200
@@ -4,33 +4,30 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
+import asyncio
+import textwrap
+from collections.abc import Callable
+from typing import Any, Final
+
+import pytest
 from fastapi.testclient import TestClient
+from httpx import AsyncClient
+
+from app.services.tsql_mybatis_difficulty import evaluate_mybatis_difficulty
+from tests.helpers import case_values, ids_of
 
-from app.main import app
+ENDPOINT: Final[str] = "/mcp/migration/mybatis-difficulty"
+DYNAMIC_CURSOR_FACTOR_IDS: Final[frozenset[str]] = frozenset({"FAC_DYN_SQL", "FAC_CURSOR"})
 
 
 # [함수 설명]
-# - 목적: mybatis difficulty simple select 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: 단순 SELECT가 낮은 난이도/재작성 권장으로 판정되는지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mybatis_difficulty_simple_select() -> None:
-    client = TestClient(app)
-
-    response = client.post(
-        "/mcp/migration/mybatis-difficulty",
-        json={
-            "name": "dbo.usp_ReadOnly",
-            "type": "procedure",
-            "sql": "CREATE PROCEDURE dbo.usp_ReadOnly AS SELECT * FROM dbo.Users;",
-        },
-    )
-
-    assert response.status_code == 200
-    payload = response.json()
-
+def _check_simple_select(payload: dict[str, Any]) -> None:
     summary = payload["summary"]
     assert summary["difficulty_level"] == "low"
     assert summary["is_rewrite_recommended"] is True
@@ -38,111 +35,162 @@ def test_mybatis_difficulty_simple_select() -> None:
 
 
 # [함수 설명]
-# - 목적: mybatis difficulty dynamic cursor temp txn complex 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: 동적 SQL/커서/임시 테이블/트랜잭션/복잡 분기가 높은 난이도로 판정되는지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mybatis_difficulty_dynamic_cursor_temp_txn_complex() -> None:
-    client = TestClient(app)
-
-    response = client.post(
-        "/mcp/migration/mybatis-difficulty",
-        json={
-            "name": "dbo.usp_DynamicCursor",
-            "type": "procedure",
-            "sql": """
-            CREATE PROCEDURE dbo.usp_DynamicCursor AS
-            BEGIN
-                BEGIN TRAN;
-                DECLARE c CURSOR FOR SELECT id FROM dbo.Users;
-                OPEN c;
-                FETCH NEXT FROM c;
-                CREATE TABLE #tmp(id INT);
-                DECLARE @dyn NVARCHAR(100) = 'SELECT 1';
-                EXEC(@dyn + ' FROM dbo.Users');
-                IF EXISTS (SELECT 1 FROM dbo.Users) BEGIN SELECT 1; END
-                IF EXISTS (SELECT 1 FROM dbo.Users) BEGIN SELECT 1; END
-                IF EXISTS (SELECT 1 FROM dbo.Users) BEGIN SELECT 1; END
-                IF EXISTS (SELECT 1 FROM dbo.Users) BEGIN SELECT 1; END
-                IF EXISTS (SELECT 1 FROM dbo.Users) BEGIN SELECT 1; END
-                IF EXISTS (SELECT 1 FROM dbo.Users) BEGIN SELECT 1; END
-                COMMIT TRAN;
-                CLOSE c;
-                DEALLOCATE c;
-            END
-            """,
-        },
-    )
-
-    assert response.status_code == 200
-    payload = response.json()
-
+def _check_dynamic_cursor_temp_txn_complex(payload: dict[str, Any]) -> None:
     summary = payload["summary"]
     assert summary["difficulty_level"] in {"high", "very_high"}
     assert summary["is_rewrite_recommended"] is False
 
-    factor_ids = {item["id"] for item in payload["factors"]}
-    assert "FAC_DYN_SQL" in factor_ids
-    assert "FAC_CURSOR" in factor_ids
+    factor_ids = ids_of(payload["factors"])
+    assert DYNAMIC_CURSOR_FACTOR_IDS <= factor_ids
 
-    recommendation_ids = {item["id"] for item in payload["recommendations"]}
+    recommendation_ids = ids_of(payload["recommendations"])
     assert "REC_CALL_SP_FIRST" in recommendation_ids
 
 
 # [함수 설명]
-# - 목적: mybatis difficulty moderate writes 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: 여러 DML 쓰기가 있는 SQL이 중간 난이도로 판정되는지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mybatis_difficulty_moderate_writes() -> None:
-    client = TestClient(app)
+def _check_moderate_writes(payload: dict[str, Any]) -> None:
+    summary = payload["summary"]
+    assert summary["difficulty_level"] == "medium"
+    assert summary["is_rewrite_recommended"] is True
+
 
-    response = client.post(
-        "/mcp/migration/mybatis-difficulty",
-        json={
+# 복잡 분기 임계값을 넘기기 위해 동일한 IF EXISTS 분기를 반복 횟수만큼 이어 붙인다.
+EXISTS_BRANCH: Final[str] = "    IF EXISTS (SELECT 1 FROM dbo.Users) BEGIN SELECT 1; END\n"
+EXISTS_BRANCH_REPEAT: Final[int] = 6
+DYNAMIC_CURSOR_TEMP_TXN_COMPLEX_SQL: Final[str] = (
+    textwrap.dedent(
+        """
+        CREATE PROCEDURE dbo.usp_DynamicCursor AS
+        BEGIN
+            BEGIN TRAN;
+            DECLARE c CURSOR FOR SELECT id FROM dbo.Users;
+            OPEN c;
+            FETCH NEXT FROM c;
+            CREATE TABLE #tmp(id INT);
+            DECLARE @dyn NVARCHAR(100) = 'SELECT 1';
+            EXEC(@dyn + ' FROM dbo.Users');
+        """
+    ).lstrip()
+    + EXISTS_BRANCH * EXISTS_BRANCH_REPEAT
+    + textwrap.dedent(
+        """
+            COMMIT TRAN;
+            CLOSE c;
+            DEALLOCATE c;
+        END
+        """
+    ).strip("\n")
+)
+
+
+MODERATE_WRITES_SQL: Final[str] = textwrap.dedent(
+    """
+    CREATE PROCEDURE dbo.usp_WriteModerate AS
+    BEGIN
+        INSERT INTO dbo.AuditLog(id) VALUES (1);
+        UPDATE dbo.Users SET name = 'x' WHERE id = 1;
+        DELETE FROM dbo.UserFlags WHERE user_id = 1;
+    END
+    """
+).strip()
+
+
+CASES: Final[list[Any]] = [
+    pytest.param(
+        {
+            "name": "dbo.usp_ReadOnly",
+            "type": "procedure",
+            "sql": "CREATE PROCEDURE dbo.usp_ReadOnly AS SELECT * FROM dbo.Users;",
+        },
+        _check_simple_select,
+        id="simple_select",
+    ),
+    pytest.param(
+        {
+            "name": "dbo.usp_DynamicCursor",
+            "type": "procedure",
+            "sql": DYNAMIC_CURSOR_TEMP_TXN_COMPLEX_SQL,
+        },
+        _check_dynamic_cursor_temp_txn_complex,
+        id="dynamic_cursor_temp_txn_complex",
+    ),
+    pytest.param(
+        {
             "name": "dbo.usp_WriteModerate",
             "type": "procedure",
-            "sql": """
-            CREATE PROCEDURE dbo.usp_WriteModerate AS
-            BEGIN
-                INSERT INTO dbo.AuditLog(id) VALUES (1);
-                UPDATE dbo.Users SET name = 'x' WHERE id = 1;
-                DELETE FROM dbo.UserFlags WHERE user_id = 1;
-            END
-            """,
+            "sql": MODERATE_WRITES_SQL,
         },
-    )
+        _check_moderate_writes,
+        id="moderate_writes",
+    ),
+]
 
-    assert response.status_code == 200
-    payload = response.json()
+# 엔드포인트 배선 테스트가 쓰는 대표 케이스(결과 목록이 비어 있지 않은 케이스)의 id다.
+ENDPOINT_CASE_ID: Final[str] = "dynamic_cursor_temp_txn_complex"
 
-    summary = payload["summary"]
-    assert summary["difficulty_level"] == "medium"
-    assert summary["is_rewrite_recommended"] is True
+
+# [함수 설명]
+# - 목적: mybatis-difficulty 케이스별 요약/요인/권고 필드를 서비스 직접 호출로 검증한다.
+# - 입력: 요청 본문과 검증 함수를 파라미터로 받는다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.parametrize("request_body, check", CASES)
+def test_mybatis_difficulty(
+    request_body: dict[str, Any],
+    check: Callable[[dict[str, Any]], None],
+) -> None:
+    check(evaluate_mybatis_difficulty(request_body["sql"], request_body["type"]))
 
 
 # [함수 설명]
-# - 목적: mybatis difficulty determinism 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: mybatis-difficulty 엔드포인트 배선(요청 검증/응답 직렬화)을 대표 케이스로 검증한다.
+# - 입력: 테스트 클라이언트와 결과 목록이 채워지는 ENDPOINT_CASE_ID 케이스를 사용한다.
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mybatis_difficulty_determinism() -> None:
-    client = TestClient(app)
+def test_mybatis_difficulty_endpoint(client: TestClient) -> None:
+    request_body, check = case_values(CASES, ENDPOINT_CASE_ID)
+    response = client.post(ENDPOINT, json=request_body)
+
+    assert response.status_code == 200
+    check(response.json())
+
 
+# [함수 설명]
+# - 목적: mybatis difficulty determinism 동작을 검증한다.
+# - 입력: 분석 캐시를 끈 상태의 async 클라이언트와 고정 입력을 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 캐시를 꺼서 두 요청이 각각 실제로 계산한 결과를 비교한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.anyio
+@pytest.mark.usefixtures("analysis_cache_disabled")
+async def test_mybatis_difficulty_determinism(async_client: AsyncClient) -> None:
     request_payload = {
         "name": "dbo.usp_Same",
         "type": "procedure",
         "sql": "CREATE PROCEDURE dbo.usp_Same AS SELECT 1;",
     }
 
-    response_first = client.post("/mcp/migration/mybatis-difficulty", json=request_payload)
-    response_second = client.post("/mcp/migration/mybatis-difficulty", json=request_payload)
+    response_first, response_second = await asyncio.gather(
+        async_client.post(ENDPOINT, json=request_payload),
+        async_client.post(ENDPOINT, json=request_payload),
+    )
 
     assert response_first.status_code == 200
     assert response_second.status_code == 200
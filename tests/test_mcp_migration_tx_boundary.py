@@ -4,9 +4,14 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
+import asyncio
+
+import pytest
 from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
-from app.main import app
+from app.services.tsql_tx_boundary import recommend_transaction_boundary
+from tests.helpers import ids_of
 
 
 # [함수 설명]
@@ -16,9 +21,7 @@ from app.main import app
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_tx_boundary_read_only() -> None:
-    client = TestClient(app)
-
+def test_tx_boundary_read_only(client: TestClient) -> None:
     response = client.post(
         "/mcp/migration/transaction-boundary",
         json={
@@ -46,9 +49,7 @@ def test_tx_boundary_read_only() -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_tx_boundary_writes_service_layer() -> None:
-    client = TestClient(app)
-
+def test_tx_boundary_writes_service_layer(client: TestClient) -> None:
     response = client.post(
         "/mcp/migration/transaction-boundary",
         json={
@@ -74,9 +75,7 @@ def test_tx_boundary_writes_service_layer() -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_tx_boundary_hybrid_with_transaction_signals() -> None:
-    client = TestClient(app)
-
+def test_tx_boundary_hybrid_with_transaction_signals(client: TestClient) -> None:
     response = client.post(
         "/mcp/migration/transaction-boundary",
         json={
@@ -108,21 +107,21 @@ def test_tx_boundary_hybrid_with_transaction_signals() -> None:
     assert summary["recommended_boundary"] == "hybrid"
     assert summary["isolation_level"]
 
-    suggestion_ids = {item["id"] for item in payload["suggestions"]}
+    suggestion_ids = ids_of(payload["suggestions"])
     assert "SUG_AVOID_DOUBLE_TX" in suggestion_ids
     assert "SUG_USE_NOT_SUPPORTED" in suggestion_ids
 
 
 # [함수 설명]
 # - 목적: tx boundary determinism 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 입력: 분석 캐시를 끈 상태의 async 클라이언트와 고정 입력을 사용한다.
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
-# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 결정론: 캐시를 꺼서 두 요청이 각각 실제로 계산한 결과를 비교한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_tx_boundary_determinism() -> None:
-    client = TestClient(app)
-
+@pytest.mark.anyio
+@pytest.mark.usefixtures("analysis_cache_disabled")
+async def test_tx_boundary_determinism(async_client: AsyncClient) -> None:
     request_payload = {
         "name": "dbo.usp_Same",
         "type": "procedure",
@@ -130,15 +129,32 @@ def test_tx_boundary_determinism() -> None:
         "options": {"max_items": 10},
     }
 
-    response_first = client.post(
-        "/mcp/migration/transaction-boundary",
-        json=request_payload,
-    )
-    response_second = client.post(
-        "/mcp/migration/transaction-boundary",
-        json=request_payload,
+    response_first, response_second = await asyncio.gather(
+        async_client.post("/mcp/migration/transaction-boundary", json=request_payload),
+        async_client.post("/mcp/migration/transaction-boundary", json=request_payload),
     )
 
     assert response_first.status_code == 200
     assert response_second.status_code == 200
     assert response_first.json() == response_second.json()
+
+
+# [함수 설명]
+# - 목적: 반환된 가이던스 dict를 변경해도 모듈 상수가 오염되지 않는지 검증한다.
+# - 입력: 분석 캐시를 끈 상태에서 서비스 함수를 직접 두 번 호출한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 첫 결과를 변경한 뒤에도 두 번째 결과가 원래 메시지를 유지해야 한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.usefixtures("analysis_cache_disabled")
+def test_tx_boundary_result_mutation_does_not_leak() -> None:
+    sql = "CREATE PROCEDURE dbo.usp_Read AS SELECT * FROM dbo.Items;"
+    first = recommend_transaction_boundary(sql, "procedure")
+    for item in first["suggestions"]:
+        item["message"] = "mutated"
+    first["suggestions"].clear()
+
+    second = recommend_transaction_boundary(sql, "procedure")
+
+    assert second["suggestions"]
+    assert all(item["message"] != "mutated" for item in second["suggestions"])
@@ -4,20 +4,24 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
+import asyncio
+
+import pytest
 from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
-from app.main import app
+from app.services.tsql_db_dependency import analyze_db_dependency
+from tests.helpers import ids_of
 
 
 # [함수 설명]
 # - 목적: _post 처리 로직을 수행한다.
-# - 입력: payload: dict
+# - 입력: client: TestClient, payload: dict
 # - 출력: 구조화된 dict 결과를 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _post(payload: dict) -> dict:
-    client = TestClient(app)
+def _post(client: TestClient, payload: dict) -> dict:
     response = client.post("/mcp/quality/db-dependency", json=payload)
     assert response.status_code == 200
     return response.json()
@@ -30,7 +34,7 @@ def _post(payload: dict) -> dict:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mcp_quality_db_dependency_low() -> None:
+def test_mcp_quality_db_dependency_low(client: TestClient) -> None:
     payload = {
         "name": "dbo.usp_ReadOnly",
         "type": "procedure",
@@ -43,7 +47,7 @@ def test_mcp_quality_db_dependency_low() -> None:
         """,
     }
 
-    data = _post(payload)
+    data = _post(client, payload)
 
     assert data["summary"]["dependency_level"] == "low"
     assert data["metrics"]["linked_server_count"] == 0
@@ -57,7 +61,7 @@ def test_mcp_quality_db_dependency_low() -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mcp_quality_db_dependency_cross_db_and_linked_server() -> None:
+def test_mcp_quality_db_dependency_cross_db_and_linked_server(client: TestClient) -> None:
     payload = {
         "name": "dbo.usp_Dep",
         "type": "procedure",
@@ -71,7 +75,7 @@ def test_mcp_quality_db_dependency_cross_db_and_linked_server() -> None:
         """,
     }
 
-    data = _post(payload)
+    data = _post(client, payload)
 
     assert data["summary"]["dependency_level"] in {"high", "critical"}
     assert data["metrics"]["linked_server_count"] == 1
@@ -92,7 +96,7 @@ def test_mcp_quality_db_dependency_cross_db_and_linked_server() -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mcp_quality_db_dependency_risky_system_and_clr() -> None:
+def test_mcp_quality_db_dependency_risky_system_and_clr(client: TestClient) -> None:
     payload = {
         "name": "dbo.usp_Risky",
         "type": "procedure",
@@ -105,10 +109,10 @@ def test_mcp_quality_db_dependency_risky_system_and_clr() -> None:
         """,
     }
 
-    data = _post(payload)
+    data = _post(client, payload)
 
     assert data["summary"]["dependency_level"] == "critical"
-    reason_ids = {reason["id"] for reason in data["reasons"]}
+    reason_ids = ids_of(data["reasons"])
     assert "RSN_XP_CMDSHELL" in reason_ids
     assert "RSN_CLR" in reason_ids
 
@@ -120,7 +124,7 @@ def test_mcp_quality_db_dependency_risky_system_and_clr() -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mcp_quality_db_dependency_ignores_comments_and_strings() -> None:
+def test_mcp_quality_db_dependency_ignores_comments_and_strings(client: TestClient) -> None:
     payload = {
         "name": "dbo.usp_Comments",
         "type": "procedure",
@@ -134,21 +138,41 @@ def test_mcp_quality_db_dependency_ignores_comments_and_strings() -> None:
         """,
     }
 
-    data = _post(payload)
+    data = _post(client, payload)
 
     assert data["metrics"]["linked_server_count"] == 0
     assert data["metrics"]["openquery_count"] == 0
     assert data["metrics"]["cross_database_count"] == 0
 
 
+# [함수 설명]
+# - 목적: 대괄호 식별자 속 작은따옴표가 문자열을 열어 뒤 SQL을 가리지 않는지 검증한다.
+# - 입력: 서비스 직접 호출에 고정 SQL을 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: safe_sql 토큰 규칙(식별자 우선, 소문자 n 접두사 포함)과 같은 경계를 확인한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+def test_db_dependency_quote_inside_bracket_identifier() -> None:
+    sql = (
+        "SELECT [it's] FROM LSRV1.OtherDb.dbo.TableX;\nSELECT * FROM OPENQUERY(LSRV2, n'SELECT 1');"
+    )
+
+    metrics = analyze_db_dependency(sql)["metrics"]
+
+    assert metrics["linked_server_count"] == 2
+    assert metrics["openquery_count"] == 1
+
+
 # [함수 설명]
 # - 목적: mcp quality db dependency determinism 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 입력: 분석 캐시를 끈 상태의 async 클라이언트와 고정 입력을 사용한다.
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
-# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 결정론: 캐시를 꺼서 두 요청이 각각 실제로 계산한 결과를 비교한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mcp_quality_db_dependency_determinism() -> None:
+@pytest.mark.anyio
+@pytest.mark.usefixtures("analysis_cache_disabled")
+async def test_mcp_quality_db_dependency_determinism(async_client: AsyncClient) -> None:
     payload = {
         "name": "dbo.usp_Deterministic",
         "type": "procedure",
@@ -162,7 +186,30 @@ def test_mcp_quality_db_dependency_determinism() -> None:
         """,
     }
 
-    data = _post(payload)
-    data_repeat = _post(payload)
+    response_first, response_second = await asyncio.gather(
+        async_client.post("/mcp/quality/db-dependency", json=payload),
+        async_client.post("/mcp/quality/db-dependency", json=payload),
+    )
+
+    assert response_first.status_code == 200
+    assert response_second.status_code == 200
+    assert response_first.json() == response_second.json()
+
+
+# [함수 설명]
+# - 목적: 캐시된 db-dependency 결과가 호출자 변경으로 오염되지 않는지 검증한다.
+# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+def test_db_dependency_cached_result_is_isolated() -> None:
+    sql = "SELECT * FROM OtherDb.dbo.Users;"
+    first = analyze_db_dependency(sql)
+    first["dependencies"]["cross_database"].clear()
+    first["metrics"]["cross_database_count"] = -1
+
+    second = analyze_db_dependency(sql)
 
-    assert data == data_repeat
+    assert second["metrics"]["cross_database_count"] == 1
+    assert [item["object"] for item in second["dependencies"]["cross_database"]] == ["users"]
@@ -4,20 +4,25 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
+import asyncio
+
+import pytest
 from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
-from app.main import app
+from app.services.safe_sql import ANALYSIS_CACHE_ENV, SCAN_CACHE_MAX_SQL_LEN
+from app.services.tsql_performance_risk import analyze_performance_risk
+from tests.helpers import ids_of
 
 
 # [함수 설명]
 # - 목적: _post 처리 로직을 수행한다.
-# - 입력: payload: dict
+# - 입력: client: TestClient, payload: dict
 # - 출력: 구조화된 dict 결과를 반환한다.
 # - 에러 처리: 예외 발생 시 errors/notes에 기록하거나 안전한 기본값을 사용한다.
 # - 결정론: 정렬/중복 제거/최대 개수 제한을 통해 결과 순서를 안정화한다.
 # - 보안: 원문 SQL 등 민감 정보는 로그에 직접 남기지 않도록 요약한다.
-def _post(payload: dict) -> dict:
-    client = TestClient(app)
+def _post(client: TestClient, payload: dict) -> dict:
     response = client.post("/mcp/quality/performance-risk", json=payload)
     assert response.status_code == 200
     return response.json()
@@ -30,7 +35,7 @@ def _post(payload: dict) -> dict:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mcp_quality_performance_risk_low() -> None:
+def test_mcp_quality_performance_risk_low(client: TestClient) -> None:
     payload = {
         "name": "dbo.usp_ReadOnly",
         "type": "procedure",
@@ -44,7 +49,7 @@ def test_mcp_quality_performance_risk_low() -> None:
         "options": {"dialect": "tsql"},
     }
 
-    data = _post(payload)
+    data = _post(client, payload)
 
     assert data["summary"]["risk_level"] == "low"
     assert data["summary"]["risk_score"] <= 24
@@ -60,7 +65,7 @@ def test_mcp_quality_performance_risk_low() -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mcp_quality_performance_risk_bad_patterns() -> None:
+def test_mcp_quality_performance_risk_bad_patterns(client: TestClient) -> None:
     payload = {
         "name": "dbo.usp_Bad",
         "type": "procedure",
@@ -73,9 +78,9 @@ def test_mcp_quality_performance_risk_bad_patterns() -> None:
         """,
     }
 
-    data = _post(payload)
+    data = _post(client, payload)
 
-    finding_ids = {finding["id"] for finding in data["findings"]}
+    finding_ids = ids_of(data["findings"])
     assert {
         "PRF_SELECT_STAR",
         "PRF_LEADING_WILDCARD_LIKE",
@@ -92,7 +97,7 @@ def test_mcp_quality_performance_risk_bad_patterns() -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mcp_quality_performance_risk_cursor_and_dynamic_sql() -> None:
+def test_mcp_quality_performance_risk_cursor_and_dynamic_sql(client: TestClient) -> None:
     payload = {
         "name": "dbo.usp_Cursor",
         "type": "procedure",
@@ -112,9 +117,9 @@ def test_mcp_quality_performance_risk_cursor_and_dynamic_sql() -> None:
         """,
     }
 
-    data = _post(payload)
+    data = _post(client, payload)
 
-    finding_ids = {finding["id"] for finding in data["findings"]}
+    finding_ids = ids_of(data["findings"])
     assert "PRF_CURSOR_RBAR" in finding_ids
     assert "PRF_DYNAMIC_SQL" in finding_ids
     assert "PRF_LOOP_RBAR" in finding_ids
@@ -128,7 +133,7 @@ def test_mcp_quality_performance_risk_cursor_and_dynamic_sql() -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mcp_quality_performance_risk_ignores_comments_and_strings() -> None:
+def test_mcp_quality_performance_risk_ignores_comments_and_strings(client: TestClient) -> None:
     payload = {
         "name": "dbo.usp_Comments",
         "type": "procedure",
@@ -142,21 +147,43 @@ def test_mcp_quality_performance_risk_ignores_comments_and_strings() -> None:
         """,
     }
 
-    data = _post(payload)
+    data = _post(client, payload)
 
-    finding_ids = {finding["id"] for finding in data["findings"]}
+    finding_ids = ids_of(data["findings"])
     assert "PRF_SELECT_STAR" not in finding_ids
     assert "PRF_NOLOCK" not in finding_ids
 
 
 # [함수 설명]
-# - 목적: mcp quality performance risk determinism 동작을 검증한다.
+# - 목적: 문자열 안의 주석 표식이 뒤따르는 코드를 삼키지 않는지 검증한다.
 # - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_mcp_quality_performance_risk_determinism() -> None:
+def test_mcp_quality_performance_risk_comment_marker_inside_string(client: TestClient) -> None:
+    payload = {
+        "name": "dbo.usp_Marker",
+        "type": "procedure",
+        "sql": "SELECT '--' AS marker, col1 FROM dbo.Visible WITH (NOLOCK);",
+    }
+
+    data = _post(client, payload)
+
+    finding_ids = ids_of(data["findings"])
+    assert "PRF_NOLOCK" in finding_ids
+
+
+# [함수 설명]
+# - 목적: mcp quality performance risk determinism 동작을 검증한다.
+# - 입력: 분석 캐시를 끈 상태의 async 클라이언트와 고정 입력을 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 캐시를 꺼서 두 요청이 각각 실제로 계산한 결과를 비교한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.anyio
+@pytest.mark.usefixtures("analysis_cache_disabled")
+async def test_mcp_quality_performance_risk_determinism(async_client: AsyncClient) -> None:
     payload = {
         "name": "dbo.usp_Deterministic",
         "type": "procedure",
@@ -169,7 +196,51 @@ def test_mcp_quality_performance_risk_determinism() -> None:
         """,
     }
 
-    first = _post(payload)
-    second = _post(payload)
+    response_first, response_second = await asyncio.gather(
+        async_client.post("/mcp/quality/performance-risk", json=payload),
+        async_client.post("/mcp/quality/performance-risk", json=payload),
+    )
+
+    assert response_first.status_code == 200
+    assert response_second.status_code == 200
+    assert response_first.json() == response_second.json()
+
+
+# [함수 설명]
+# - 목적: TSQL_ANALYSIS_CACHE=0 이면 캐시를 거치지 않고 매번 새로 계산하는지 검증한다.
+# - 입력: monkeypatch로 환경 변수를 설정하고 고정 SQL을 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 캐시 없이 두 번 계산한 결과가 같은지 확인한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+def test_performance_risk_cache_disabled_by_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(ANALYSIS_CACHE_ENV, "0")
+    sql = "SELECT * FROM dbo.Orders WITH (NOLOCK);"
+    cache_info_before = analyze_performance_risk.cache_info()
+
+    first = analyze_performance_risk(sql)
+    second = analyze_performance_risk(sql)
+
+    assert analyze_performance_risk.cache_info() == cache_info_before
+    assert first == second
+    assert first is not second
+
+
+# [함수 설명]
+# - 목적: 길이 제한을 넘는 SQL은 분석 캐시를 거치지 않고 매번 새로 계산하는지 검증한다.
+# - 입력: 길이 제한을 넘는 고정 SQL을 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 캐시를 건너뛰어도 두 번 계산한 결과가 같은지 확인한다.
+# - 보안: 큰 SQL 원문이 분석 캐시에 남지 않는지 확인한다.
+def test_performance_risk_skips_cache_for_long_sql() -> None:
+    long_sql = "SELECT * FROM dbo.Orders WITH (NOLOCK);\n" * (SCAN_CACHE_MAX_SQL_LEN // 40 + 1)
+    assert len(long_sql) > SCAN_CACHE_MAX_SQL_LEN
+    cache_info_before = analyze_performance_risk.cache_info()
+
+    first = analyze_performance_risk(long_sql)
+    second = analyze_performance_risk(long_sql)
 
+    assert analyze_performance_risk.cache_info() == cache_info_before
     assert first == second
+    assert "PRF_NOLOCK" in ids_of(first["findings"])
@@ -4,88 +4,57 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
+import re
+import textwrap
+from collections.abc import Callable
+from itertools import pairwise
+from typing import Any, Final
+
+import pytest
 from fastapi.testclient import TestClient
 
-from app.main import app
+from app.services.tsql_standardization_spec import Options, build_standardization_spec
+from tests.helpers import case_values
+
+ENDPOINT: Final[str] = "/mcp/standardize/spec"
+# one_liner에 원문 SQL 조각이 섞였는지 대소문자 구분 없이 한 번에 확인한다.
+ONE_LINER_SQL_LEAK_PATTERN: Final[re.Pattern[str]] = re.compile(r"FROM DBO\.|SELECT", re.IGNORECASE)
 
 
 # [함수 설명]
-# - 목적: standardize spec minimal read only 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: 읽기 전용 SQL이 read_only/no_txn 태그와 테이블 의존성을 갖는지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
-# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_standardize_spec_minimal_read_only() -> None:
-    client = TestClient(app)
-
-    response = client.post(
-        "/mcp/standardize/spec",
-        json={
-            "object": {"name": "dbo.usp_ReadOnly", "type": "procedure"},
-            "sql": "CREATE PROCEDURE dbo.usp_ReadOnly AS SELECT id FROM dbo.Users;",
-        },
-    )
-
-    assert response.status_code == 200
-    payload = response.json()
-
+# - 보안: one_liner에 원문 SQL 조각이 노출되지 않는지 확인한다.
+def _check_minimal_read_only(payload: dict[str, Any]) -> None:
     tags = payload["spec"]["tags"]
     assert "read_only" in tags
     assert "no_txn" in tags
 
     dependencies = payload["spec"]["dependencies"]
-    table_names = {item.lower() for item in dependencies["tables"]}
-    assert "dbo.users" in table_names
+    assert any(item.lower() == "dbo.users" for item in dependencies["tables"])
 
-    one_liner = payload["spec"]["summary"]["one_liner"].upper()
-    assert "FROM DBO." not in one_liner
-    assert "SELECT" not in one_liner
+    assert not ONE_LINER_SQL_LEAK_PATTERN.search(payload["spec"]["summary"]["one_liner"])
 
 
 # [함수 설명]
-# - 목적: standardize spec complex signals 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: 동적 SQL/트랜잭션/커서 SQL의 태그와 목록 정렬이 안정적인지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
-# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 결정론: 태그는 중복 없는 오름차순, 권고/템플릿은 정렬 순서를 확인한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_standardize_spec_complex_signals() -> None:
-    client = TestClient(app)
-
-    response = client.post(
-        "/mcp/standardize/spec",
-        json={
-            "object": {"name": "dbo.usp_Complex", "type": "procedure"},
-            "sql": """
-            CREATE PROCEDURE dbo.usp_Complex AS
-            BEGIN
-                BEGIN TRAN;
-                DECLARE c CURSOR FOR SELECT id FROM dbo.Users;
-                OPEN c;
-                FETCH NEXT FROM c;
-                DECLARE @dyn NVARCHAR(100) = 'SELECT 1';
-                EXEC(@dyn + ' FROM dbo.Users');
-                COMMIT TRAN;
-                CLOSE c;
-                DEALLOCATE c;
-            END
-            """,
-        },
-    )
-
-    assert response.status_code == 200
-    payload = response.json()
-
+def _check_complex_signals(payload: dict[str, Any]) -> None:
     tags = payload["spec"]["tags"]
     assert "dynamic_sql" in tags
     assert "uses_transaction" in tags
     assert "difficulty_high" in tags
-    assert tags == sorted(tags)
+    assert all(left < right for left, right in pairwise(tags))
 
-    recommendations = payload["spec"]["recommendations"]
-    recommendation_ids = [item["id"] for item in recommendations]
-    assert recommendation_ids == sorted(recommendation_ids)
+    recommendation_ids = [item["id"] for item in payload["spec"]["recommendations"]]
+    assert all(left <= right for left, right in pairwise(recommendation_ids))
 
     templates = payload["spec"]["templates"]
     if templates:
@@ -94,55 +63,139 @@ def test_standardize_spec_complex_signals() -> None:
 
 
 # [함수 설명]
-# - 목적: standardize spec ignores comments and strings 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: 주석/문자열 안의 SELECT * 가 권고로 이어지지 않는지 검증한다.
+# - 입력: payload: 응답 JSON
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_standardize_spec_ignores_comments_and_strings() -> None:
-    client = TestClient(app)
-
-    response = client.post(
-        "/mcp/standardize/spec",
-        json={
+def _check_ignores_comments_and_strings(payload: dict[str, Any]) -> None:
+    recommendations = payload["spec"]["recommendations"]
+    assert all(item["id"] != "REC_AVOID_SELECT_STAR" for item in recommendations)
+
+
+COMPLEX_SIGNALS_SQL: Final[str] = textwrap.dedent(
+    """
+    CREATE PROCEDURE dbo.usp_Complex AS
+    BEGIN
+        BEGIN TRAN;
+        DECLARE c CURSOR FOR SELECT id FROM dbo.Users;
+        OPEN c;
+        FETCH NEXT FROM c;
+        DECLARE @dyn NVARCHAR(100) = 'SELECT 1';
+        EXEC(@dyn + ' FROM dbo.Users');
+        COMMIT TRAN;
+        CLOSE c;
+        DEALLOCATE c;
+    END
+    """
+).strip()
+
+
+IGNORES_COMMENTS_AND_STRINGS_SQL: Final[str] = textwrap.dedent(
+    """
+    CREATE PROCEDURE dbo.usp_Commented AS
+    BEGIN
+        -- SELECT * FROM dbo.Users;
+        DECLARE @note NVARCHAR(100) = 'SELECT * FROM dbo.Users';
+        SELECT id FROM dbo.Users;
+    END
+    """
+).strip()
+
+
+CASES: Final[list[Any]] = [
+    pytest.param(
+        {
+            "object": {"name": "dbo.usp_ReadOnly", "type": "procedure"},
+            "sql": "CREATE PROCEDURE dbo.usp_ReadOnly AS SELECT id FROM dbo.Users;",
+        },
+        _check_minimal_read_only,
+        id="minimal_read_only",
+    ),
+    pytest.param(
+        {
+            "object": {"name": "dbo.usp_Complex", "type": "procedure"},
+            "sql": COMPLEX_SIGNALS_SQL,
+        },
+        _check_complex_signals,
+        id="complex_signals",
+    ),
+    pytest.param(
+        {
             "object": {"name": "dbo.usp_Commented", "type": "procedure"},
-            "sql": """
-            CREATE PROCEDURE dbo.usp_Commented AS
-            BEGIN
-                -- SELECT * FROM dbo.Users;
-                DECLARE @note NVARCHAR(100) = 'SELECT * FROM dbo.Users';
-                SELECT id FROM dbo.Users;
-            END
-            """,
+            "sql": IGNORES_COMMENTS_AND_STRINGS_SQL,
         },
-    )
+        _check_ignores_comments_and_strings,
+        id="ignores_comments_and_strings",
+    ),
+]
+
+# 엔드포인트 배선 테스트가 쓰는 대표 케이스(결과 목록이 비어 있지 않은 케이스)의 id다.
+ENDPOINT_CASE_ID: Final[str] = "complex_signals"
 
-    assert response.status_code == 200
-    payload = response.json()
 
-    recommendation_ids = {item["id"] for item in payload["spec"]["recommendations"]}
-    assert "REC_AVOID_SELECT_STAR" not in recommendation_ids
+# [함수 설명]
+# - 목적: standardize spec 케이스별 태그/의존성/권고 필드를 서비스 직접 호출로 검증한다.
+# - 입력: 요청 본문과 검증 함수를 파라미터로 받는다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.parametrize("request_body, check", CASES)
+def test_standardize_spec(
+    request_body: dict[str, Any],
+    check: Callable[[dict[str, Any]], None],
+) -> None:
+    check(
+        build_standardization_spec(
+            request_body["object"]["name"],
+            request_body["object"]["type"],
+            request_body["sql"],
+            None,
+            Options(),
+        )
+    )
 
 
 # [함수 설명]
-# - 목적: standardize spec determinism 동작을 검증한다.
-# - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
+# - 목적: standardize spec 엔드포인트 배선(요청 검증/응답 직렬화)을 대표 케이스로 검증한다.
+# - 입력: 테스트 클라이언트와 태그/권고/템플릿이 채워지는 ENDPOINT_CASE_ID 케이스를 사용한다.
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_standardize_spec_determinism() -> None:
-    client = TestClient(app)
+def test_standardize_spec_endpoint(client: TestClient) -> None:
+    request_body, check = case_values(CASES, ENDPOINT_CASE_ID)
+    response = client.post(ENDPOINT, json=request_body)
 
+    assert response.status_code == 200
+    check(response.json())
+
+
+# [함수 설명]
+# - 목적: standardize spec determinism 동작을 검증한다.
+# - 입력: 서비스 직접 호출 두 번과 엔드포인트 호출 한 번으로 결과를 비교한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 캐시를 꺼서 각 호출이 실제로 계산한 결과를 비교한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.usefixtures("analysis_cache_disabled")
+def test_standardize_spec_determinism(client: TestClient) -> None:
     request_payload = {
         "object": {"name": "dbo.usp_Same", "type": "procedure"},
         "sql": "CREATE PROCEDURE dbo.usp_Same AS SELECT 1;",
     }
 
-    response_first = client.post("/mcp/standardize/spec", json=request_payload)
-    response_second = client.post("/mcp/standardize/spec", json=request_payload)
+    first = build_standardization_spec(
+        "dbo.usp_Same", "procedure", request_payload["sql"], None, Options()
+    )
+    second = build_standardization_spec(
+        "dbo.usp_Same", "procedure", request_payload["sql"], None, Options()
+    )
+    assert first == second
+
+    response = client.post(ENDPOINT, json=request_payload)
 
-    assert response_first.status_code == 200
-    assert response_second.status_code == 200
-    assert response_first.json() == response_second.json()
+    assert response.status_code == 200
+    assert response.json() == first
@@ -4,9 +4,17 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
+from pathlib import Path
+from typing import Final
+
+import orjson
+import pytest
 from fastapi.testclient import TestClient
 
-from app.main import app
+from app.services.rag_lexical import load_index
+
+ENDPOINT: Final[str] = "/mcp/standardize/spec-with-evidence"
+JSON_HEADERS: Final[dict[str, str]] = {"content-type": "application/json"}
 
 
 # [함수 설명]
@@ -16,24 +24,11 @@ from app.main import app
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_standardize_spec_with_evidence_retrieval(tmp_path) -> None:
-    docs_dir = tmp_path / "docs"
-    docs_dir.mkdir()
-    (docs_dir / "mybatis_dynamic_sql.md").write_text(
-        "# MyBatis Dynamic SQL Standard\n\n"
-        "Prefer dynamic_sql handling with <if>/<choose>/<foreach> tags to avoid concatenation.\n"
-        "Use mybatis tags to keep SQL readable.\n",
-        encoding="utf-8",
-    )
-    (docs_dir / "transactions.md").write_text(
-        "# Transaction Boundaries\n\n"
-        "Define @Transactional at the service layer and keep boundaries consistent.\n",
-        encoding="utf-8",
-    )
-
-    client = TestClient(app)
+def test_standardize_spec_with_evidence_retrieval(
+    client: TestClient, evidence_docs_dir: Path
+) -> None:
     response = client.post(
-        "/mcp/standardize/spec-with-evidence",
+        ENDPOINT,
         json={
             "object": {"name": "dbo.usp_Sample", "type": "procedure"},
             "sql": """
@@ -46,7 +41,7 @@ def test_standardize_spec_with_evidence_retrieval(tmp_path) -> None:
             END
             """,
             "options": {
-                "docs_dir": str(docs_dir),
+                "docs_dir": str(evidence_docs_dir),
                 "top_k": 5,
                 "max_snippet_chars": 120,
             },
@@ -63,7 +58,7 @@ def test_standardize_spec_with_evidence_retrieval(tmp_path) -> None:
     assert "PAT_MYBATIS_DYNAMIC_TAGS" in {
         item["id"] for item in payload["evidence"]["pattern_recommendations"]
     }
-    assert "SENTINEL" not in str(payload)
+    assert b"SENTINEL" not in response.content
 
 
 # [함수 설명]
@@ -73,12 +68,11 @@ def test_standardize_spec_with_evidence_retrieval(tmp_path) -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_standardize_spec_with_evidence_missing_docs_dir(tmp_path) -> None:
+def test_standardize_spec_with_evidence_missing_docs_dir(client: TestClient, tmp_path) -> None:
     missing_dir = tmp_path / "missing"
-    client = TestClient(app)
 
     response = client.post(
-        "/mcp/standardize/spec-with-evidence",
+        ENDPOINT,
         json={
             "object": {"name": "dbo.usp_Sample", "type": "procedure"},
             "sql": "CREATE PROCEDURE dbo.usp_Sample AS EXEC('SELECT 1');",
@@ -100,30 +94,22 @@ def test_standardize_spec_with_evidence_missing_docs_dir(tmp_path) -> None:
 # - 입력: 테스트 픽스처/클라이언트 등 고정 입력을 사용한다.
 # - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
-# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 결정론: 캐시를 꺼서 각 호출이 실제로 계산한 결과를 비교한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_standardize_spec_with_evidence_determinism(tmp_path) -> None:
-    docs_dir = tmp_path / "docs"
-    docs_dir.mkdir()
-    (docs_dir / "mybatis_dynamic_sql.md").write_text(
-        "# MyBatis Dynamic SQL Standard\n\n"
-        "Prefer dynamic_sql handling with <if>/<choose>/<foreach> tags.\n",
-        encoding="utf-8",
-    )
-    (docs_dir / "transactions.md").write_text(
-        "# Transaction Boundaries\n\nDefine @Transactional at the service layer.\n",
-        encoding="utf-8",
-    )
-
-    client = TestClient(app)
+@pytest.mark.usefixtures("analysis_cache_disabled")
+def test_standardize_spec_with_evidence_determinism(
+    client: TestClient, evidence_docs_dir: Path
+) -> None:
     request_payload = {
         "object": {"name": "dbo.usp_Sample", "type": "procedure"},
         "sql": "CREATE PROCEDURE dbo.usp_Sample AS EXEC('SELECT 1');",
-        "options": {"docs_dir": str(docs_dir), "top_k": 3},
+        "options": {"docs_dir": str(evidence_docs_dir), "top_k": 3},
     }
 
-    response_first = client.post("/mcp/standardize/spec-with-evidence", json=request_payload)
-    response_second = client.post("/mcp/standardize/spec-with-evidence", json=request_payload)
+    # 같은 요청을 두 번 보내므로 본문은 한 번만 직렬화해 재사용한다.
+    request_body = orjson.dumps(request_payload)
+    response_first = client.post(ENDPOINT, content=request_body, headers=JSON_HEADERS)
+    response_second = client.post(ENDPOINT, content=request_body, headers=JSON_HEADERS)
 
     assert response_first.status_code == 200
     assert response_second.status_code == 200
@@ -134,3 +120,53 @@ def test_standardize_spec_with_evidence_determinism(tmp_path) -> None:
         first_payload["evidence"]["pattern_recommendations"]
         == second_payload["evidence"]["pattern_recommendations"]
     )
+
+
+# [함수 설명]
+# - 목적: 문서 인덱스가 재사용되고 문서 내용이 바뀌면 다시 만들어지는지 검증한다.
+# - 입력: tmp_path에 작성한 임시 문서 디렉터리를 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 파일 크기를 바꿔 mtime 해상도와 무관하게 지문이 달라지도록 한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+def test_load_index_reuses_until_docs_change(tmp_path) -> None:
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    doc_path = docs_dir / "transactions.md"
+    doc_path.write_text("# Transaction Boundaries\n\nUse service transactions.\n", encoding="utf-8")
+
+    first = load_index(str(docs_dir))
+    second = load_index(str(docs_dir))
+    assert second is first
+
+    doc_path.write_text(
+        "# Transaction Boundaries\n\nDefine @Transactional at the service layer.\n",
+        encoding="utf-8",
+    )
+    rebuilt = load_index(str(docs_dir))
+
+    assert rebuilt is not first
+    assert any("@Transactional" in chunk.text for chunk in rebuilt.chunks)
+    assert load_index(str(tmp_path / "missing")).chunks == []
+
+
+# [함수 설명]
+# - 목적: TSQL_ANALYSIS_CACHE=0 이면 문서 인덱스를 캐시하지 않고 매번 새로 만드는지 검증한다.
+# - 입력: tmp_path에 작성한 임시 문서 디렉터리를 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 캐시를 건너뛰어도 같은 문서로 만든 인덱스 내용은 같다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.usefixtures("analysis_cache_disabled")
+def test_load_index_skips_cache_when_disabled(tmp_path) -> None:
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    (docs_dir / "transactions.md").write_text(
+        "# Tx\n\nUse service transactions.\n", encoding="utf-8"
+    )
+
+    first = load_index(str(docs_dir))
+    second = load_index(str(docs_dir))
+
+    assert second is not first
+    assert second.chunks == first.chunks
@@ -4,12 +4,15 @@
 # - 입력/출력: JSON-RPC 메시지를 사용한다.
 # - 주의 사항: 원문 SQL/비밀 값은 로그에 포함하지 않는다.
 # - 연관 모듈: app.main 및 app.mcp_streamable_http와 연동된다.
+import asyncio
 import re
 
+import pytest
 from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
-from app.main import app
-from app.mcp_streamable_http import ALIASES, normalize_tool_name
+from app.mcp_streamable_http import ALIASES, list_tools, normalize_tool_name
+from tests.helpers import json_of
 
 
 # [함수 설명]
@@ -19,9 +22,7 @@ from app.mcp_streamable_http import ALIASES, normalize_tool_name
 # - 에러 처리: 실패 시 pytest assertion으로 보고한다.
 # - 결정론: 동일 입력에 대해 동일 결과를 검증한다.
 # - 보안: SQL 원문/비밀 값은 사용하지 않는다.
-def test_mcp_initialize_handshake() -> None:
-    client = TestClient(app)
-
+def test_mcp_initialize_handshake(client: TestClient) -> None:
     payload = {
         "jsonrpc": "2.0",
         "id": "init-1",
@@ -38,7 +39,7 @@ def test_mcp_initialize_handshake() -> None:
     )
 
     assert response.status_code == 200
-    body = response.json()
+    body = json_of(response)
     assert body["jsonrpc"] == "2.0"
     assert body["id"] == "init-1"
     result = body["result"]
@@ -54,9 +55,7 @@ def test_mcp_initialize_handshake() -> None:
 # - 에러 처리: 실패 시 pytest assertion으로 보고한다.
 # - 결정론: 동일 입력에 대해 동일 결과를 검증한다.
 # - 보안: 민감 정보는 포함하지 않는다.
-def test_mcp_initialized_notification_returns_202() -> None:
-    client = TestClient(app)
-
+def test_mcp_initialized_notification_returns_202(client: TestClient) -> None:
     payload = {"jsonrpc": "2.0", "method": "notifications/initialized", "params": {}}
     response = client.post("/mcp", json=payload)
 
@@ -64,25 +63,14 @@ def test_mcp_initialized_notification_returns_202() -> None:
 
 
 # [함수 설명]
-# - 목적: tools/list 요청이 도구 목록을 반환하는지 확인한다.
-# - 입력: JSON-RPC tools/list 메시지
-# - 출력: 도구 목록 길이 검증
+# - 목적: tools/list로 노출되는 정적 도구 레지스트리의 이름 규칙을 확인한다.
+# - 입력: list_tools() 결과(HTTP 왕복 없이 직접 조회)
+# - 출력: 도구 이름 집합 검증
 # - 에러 처리: 실패 시 pytest assertion으로 보고한다.
-# - 결정론: 동일 입력에 대해 동일 결과를 검증한다.
+# - 결정론: 정적 레지스트리이므로 항상 같은 결과를 검증한다.
 # - 보안: 민감 정보는 포함하지 않는다.
 def test_mcp_tools_list_returns_tools() -> None:
-    client = TestClient(app)
-
-    payload = {"jsonrpc": "2.0", "id": "list-1", "method": "tools/list", "params": {}}
-    response = client.post(
-        "/mcp",
-        json=payload,
-        headers={"MCP-Protocol-Version": "2025-11-25"},
-    )
-
-    assert response.status_code == 200
-    body = response.json()
-    tools = body["result"]["tools"]
+    tools = list_tools()
     assert isinstance(tools, list)
     tool_names = {tool["name"] for tool in tools}
     assert "analyze_sql" in tool_names
@@ -93,85 +81,41 @@ def test_mcp_tools_list_returns_tools() -> None:
 
 
 # [함수 설명]
-# - 목적: tools/call 요청이 분석 결과를 반환하는지 확인한다.
-# - 입력: JSON-RPC tools/call 메시지
+# - 목적: 기본 이름/신규 이름/점 표기 별칭으로 호출한 analyze 도구가 모두 결과를 반환하는지 확인한다.
+# - 입력: 도구 이름만 다른 JSON-RPC tools/call 메시지(동시 전송)
 # - 출력: content 및 structuredContent 확인
 # - 에러 처리: 실패 시 pytest assertion으로 보고한다.
-# - 결정론: 동일 입력에 대해 동일 결과를 검증한다.
+# - 결정론: 요청 간 상태 공유가 없으므로 동시 전송해도 결과가 같다.
 # - 보안: SQL 원문은 테스트 내부에서만 사용한다.
-def test_mcp_tools_call_returns_result() -> None:
-    client = TestClient(app)
-
-    payload = {
-        "jsonrpc": "2.0",
-        "id": "call-1",
-        "method": "tools/call",
-        "params": {
-            "name": "analyze_sql",
-            "arguments": {"sql": "SELECT 1", "dialect": "tsql"},
-        },
-    }
-    response = client.post(
-        "/mcp",
-        json=payload,
-        headers={"MCP-Protocol-Version": "2025-11-25"},
+@pytest.mark.anyio
+async def test_mcp_tools_call_analyze_names_return_result(async_client: AsyncClient) -> None:
+    tool_names = ("analyze_sql", "tsql_analyze", "tsql.analyze")
+    responses = await asyncio.gather(
+        *(
+            async_client.post(
+                "/mcp",
+                json={
+                    "jsonrpc": "2.0",
+                    "id": f"call-{tool_name}",
+                    "method": "tools/call",
+                    "params": {
+                        "name": tool_name,
+                        "arguments": {"sql": "SELECT 1", "dialect": "tsql"},
+                    },
+                },
+                headers={"MCP-Protocol-Version": "2025-11-25"},
+            )
+            for tool_name in tool_names
+        )
     )
 
-    assert response.status_code == 200
-    body = response.json()
-    result = body["result"]
-    assert result["content"]
-    assert "structuredContent" in result
-
-
-def test_mcp_tools_call_accepts_tsql_analyze() -> None:
-    client = TestClient(app)
-
-    payload = {
-        "jsonrpc": "2.0",
-        "id": "call-1a",
-        "method": "tools/call",
-        "params": {
-            "name": "tsql_analyze",
-            "arguments": {"sql": "SELECT 1", "dialect": "tsql"},
-        },
-    }
-    response = client.post(
-        "/mcp",
-        json=payload,
-        headers={"MCP-Protocol-Version": "2025-11-25"},
-    )
-
-    assert response.status_code == 200
-    body = response.json()
-    result = body["result"]
-    assert result["content"]
-    assert "structuredContent" in result
-
-
-def test_mcp_tools_call_accepts_tsql_analyze_alias() -> None:
-    client = TestClient(app)
-
-    payload = {
-        "jsonrpc": "2.0",
-        "id": "call-1b",
-        "method": "tools/call",
-        "params": {
-            "name": "tsql.analyze",
-            "arguments": {"sql": "SELECT 1", "dialect": "tsql"},
-        },
-    }
-    response = client.post(
-        "/mcp",
-        json=payload,
-        headers={"MCP-Protocol-Version": "2025-11-25"},
-    )
-
-    assert response.status_code == 200
-    body = response.json()
-    result = body["result"]
-    assert result["content"]
-    assert "structuredContent" in result
+    for tool_name, response in zip(tool_names, responses, strict=True):
+        assert response.status_code == 200, tool_name
+        body = json_of(response)
+        assert body["id"] == f"call-{tool_name}"
+        result = body["result"]
+        assert result["content"]
+        assert "structuredContent" in result
 
 
 def test_normalize_tool_name_uses_aliases() -> None:
@@ -186,9 +130,7 @@ def test_normalize_tool_name_uses_aliases() -> None:
 # - 에러 처리: 실패 시 pytest assertion으로 보고한다.
 # - 결정론: 동일 입력에 대해 동일 결과를 검증한다.
 # - 보안: 민감 정보는 포함하지 않는다.
-def test_mcp_tools_call_health_returns_ok() -> None:
-    client = TestClient(app)
-
+def test_mcp_tools_call_health_returns_ok(client: TestClient) -> None:
     payload = {
         "jsonrpc": "2.0",
         "id": "call-2",
@@ -202,7 +144,7 @@ def test_mcp_tools_call_health_returns_ok() -> None:
     )
 
     assert response.status_code == 200
-    body = response.json()
+    body = json_of(response)
     result = body["result"]
     assert result["structuredContent"]["status"] == "ok"
 
@@ -214,9 +156,7 @@ def test_mcp_tools_call_health_returns_ok() -> None:
 # - 에러 처리: 실패 시 pytest assertion으로 보고한다.
 # - 결정론: 동일 입력에 대해 동일 결과를 검증한다.
 # - 보안: 민감 정보는 포함하지 않는다.
-def test_mcp_get_returns_405() -> None:
-    client = TestClient(app)
-
+def test_mcp_get_returns_405(client: TestClient) -> None:
     response = client.get("/mcp")
 
     assert response.status_code == 405
@@ -229,9 +169,7 @@ def test_mcp_get_returns_405() -> None:
 # - 에러 처리: 실패 시 pytest assertion으로 보고한다.
 # - 결정론: 동일 입력에 대해 동일 결과를 검증한다.
 # - 보안: 민감 정보는 포함하지 않는다.
-def test_mcp_invalid_protocol_version_returns_400() -> None:
-    client = TestClient(app)
-
+def test_mcp_invalid_protocol_version_returns_400(client: TestClient) -> None:
     payload = {"jsonrpc": "2.0", "id": "init-2", "method": "initialize", "params": {}}
     response = client.post(
         "/mcp",
@@ -249,17 +187,15 @@ def test_mcp_invalid_protocol_version_returns_400() -> None:
 # - 에러 처리: 실패 시 pytest assertion으로 보고한다.
 # - 결정론: 동일 입력에 대해 동일 결과를 검증한다.
 # - 보안: 원문 SQL/비밀 값은 응답에 노출하지 않는다.
-def test_mcp_tools_call_does_not_echo_sql() -> None:
-    client = TestClient(app)
-
-    sentinel = "__SQL_SENTINEL__FROM_DBO__"
+def test_mcp_tools_call_does_not_echo_sql(client: TestClient) -> None:
+    sentinel = b"__SQL_SENTINEL__FROM_DBO__"
     payload = {
         "jsonrpc": "2.0",
         "id": "call-3",
         "method": "tools/call",
         "params": {
             "name": "analyze_sql",
-            "arguments": {"sql": f"SELECT * FROM dbo.Users WHERE note = '{sentinel}';"},
+            "arguments": {"sql": f"SELECT * FROM dbo.Users WHERE note = '{sentinel.decode()}';"},
         },
     }
     response = client.post(
@@ -269,4 +205,4 @@ def test_mcp_tools_call_does_not_echo_sql() -> None:
     )
 
     assert response.status_code == 200
-    assert sentinel not in response.text
+    assert sentinel not in response.content
@@ -4,11 +4,13 @@
 # - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
 # - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
 # - 연관 모듈: app.main/app.api.mcp 및 서비스 레이어와 연동된다.
-from fastapi.testclient import TestClient
+from pathlib import Path
 
-from app.main import app
+from fastapi.testclient import TestClient
 
-SENTINEL = "SQL_SENTINEL__FROM_DBO"
+# 응답 본문은 디코딩 없이 바이트로 검사하고, 요청 SQL에는 문자열 형태를 넣는다.
+SENTINEL = b"SQL_SENTINEL__FROM_DBO"
+SENTINEL_TEXT = SENTINEL.decode()
 
 
 # [함수 설명]
@@ -18,19 +20,17 @@ SENTINEL = "SQL_SENTINEL__FROM_DBO"
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_no_sql_echo_analyze() -> None:
-    client = TestClient(app)
-
+def test_no_sql_echo_analyze(client: TestClient) -> None:
     response = client.post(
         "/mcp/analyze",
         json={
-            "sql": f"SELECT * FROM dbo.Users WHERE note = '{SENTINEL}';",
+            "sql": f"SELECT * FROM dbo.Users WHERE note = '{SENTINEL_TEXT}';",
             "dialect": "tsql",
         },
     )
 
     assert response.status_code == 200
-    assert SENTINEL not in response.text
+    assert SENTINEL not in response.content
 
 
 # [함수 설명]
@@ -40,19 +40,17 @@ def test_no_sql_echo_analyze() -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_no_sql_echo_standardize_spec() -> None:
-    client = TestClient(app)
-
+def test_no_sql_echo_standardize_spec(client: TestClient) -> None:
     response = client.post(
         "/mcp/standardize/spec",
         json={
             "object": {"name": "dbo.usp_NoEcho", "type": "procedure"},
-            "sql": f"CREATE PROCEDURE dbo.usp_NoEcho AS SELECT '{SENTINEL}';",
+            "sql": f"CREATE PROCEDURE dbo.usp_NoEcho AS SELECT '{SENTINEL_TEXT}';",
         },
     )
 
     assert response.status_code == 200
-    assert SENTINEL not in response.text
+    assert SENTINEL not in response.content
 
 
 # [함수 설명]
@@ -62,23 +60,17 @@ def test_no_sql_echo_standardize_spec() -> None:
 # - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
 # - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
 # - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
-def test_no_sql_echo_standardize_spec_with_evidence(tmp_path) -> None:
-    docs_dir = tmp_path / "docs"
-    docs_dir.mkdir()
-    (docs_dir / "placeholder.md").write_text(
-        "# Placeholder Doc\n\nUse documented patterns for migrations.",
-        encoding="utf-8",
-    )
-
-    client = TestClient(app)
+def test_no_sql_echo_standardize_spec_with_evidence(
+    client: TestClient, evidence_docs_dir: Path
+) -> None:
     response = client.post(
         "/mcp/standardize/spec-with-evidence",
         json={
             "object": {"name": "dbo.usp_NoEchoEvidence", "type": "procedure"},
-            "sql": f"CREATE PROCEDURE dbo.usp_NoEchoEvidence AS SELECT '{SENTINEL}';",
-            "options": {"docs_dir": str(docs_dir), "top_k": 3},
+            "sql": f"CREATE PROCEDURE dbo.usp_NoEchoEvidence AS SELECT '{SENTINEL_TEXT}';",
+            "options": {"docs_dir": str(evidence_docs_dir), "top_k": 3},
         },
     )
 
     assert response.status_code == 200
-    assert SENTINEL not in response.text
+    assert SENTINEL not in response.content
@@ -0,0 +1,57 @@
+# [파일 설명]
+# - 목적: safe_sql 토크나이저와 스캔 캐시의 기대 동작을 자동으로 검증한다.
+# - 제공 기능: 주석/문자열 제거 결과와 스캔 캐시 적용 범위에 대한 단언을 포함한다.
+# - 입력/출력: 고정 입력을 사용하며 테스트 통과 여부로 결과를 확인한다.
+# - 주의 사항: 원문 SQL이나 비밀 값은 로그/출력에 포함하지 않는다.
+# - 연관 모듈: app.services.safe_sql과 연동된다.
+import pytest
+
+from app.services.safe_sql import (
+    ANALYSIS_CACHE_ENV,
+    SCAN_CACHE_MAX_SQL_LEN,
+    strip_comments_and_strings,
+)
+
+
+# [함수 설명]
+# - 목적: 길이 제한을 넘는 SQL이나 캐시 비활성화 설정에서는 스캔 캐시가 원문을 보관하지 않는지 검증한다.
+# - 입력: monkeypatch와 길이 제한을 넘는 고정 SQL을 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 캐시를 건너뛰어도 스캔 결과는 같다.
+# - 보안: 큰 SQL 원문이 캐시에 남지 않는지 확인한다.
+def test_scan_cache_skips_long_sql_and_disabled_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    long_sql = "SELECT 'x' -- note\n" * (SCAN_CACHE_MAX_SQL_LEN // 10)
+    assert len(long_sql) > SCAN_CACHE_MAX_SQL_LEN
+    short_sql = "SELECT 'y' /* skip */ FROM dbo.T"
+    cache_info_before = strip_comments_and_strings.cache_info()
+
+    assert strip_comments_and_strings(long_sql).startswith("SELECT ''  \nSELECT ''")
+    monkeypatch.setenv(ANALYSIS_CACHE_ENV, "0")
+    assert strip_comments_and_strings(short_sql) == "SELECT ''   FROM dbo.T"
+
+    assert strip_comments_and_strings.cache_info() == cache_info_before
+
+
+# [함수 설명]
+# - 목적: 닫히지 않은 주석/문자열은 제거하지 않고 그 뒤의 SQL을 탐지 대상으로 남기는지 검증한다.
+# - 입력: 닫히지 않은 "/*" 또는 "'" 뒤에 NOLOCK 힌트가 오는 고정 SQL을 사용한다.
+# - 출력: 예외 없이 단언을 통과하면 성공으로 간주한다.
+# - 에러 처리: 실패 시 pytest가 assertion 결과를 보고한다.
+# - 결정론: 동일 입력으로 항상 재현 가능한 검증을 수행한다.
+# - 보안: 테스트 로그에 원문 SQL/민감 정보를 남기지 않는다.
+@pytest.mark.parametrize(
+    "sql",
+    [
+        pytest.param(
+            "/* unterminated\nSELECT * FROM dbo.Orders WITH (NOLOCK);",
+            id="unterminated_comment",
+        ),
+        pytest.param(
+            "SELECT 'unterminated FROM dbo.Orders WITH (NOLOCK);",
+            id="unterminated_string",
+        ),
+    ],
+)
+def test_strip_leaves_unterminated_token_in_place(sql: str) -> None:
+    assert strip_comments_and_strings(sql) == sql